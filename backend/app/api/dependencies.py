@@ -1,24 +1,34 @@
 """
 API Dependencies
 """
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import get_db, decode_token
 from app.models import User
+from app.services.user_cache import user_cache
+from app.services.rate_limiter import set_caller
+from app.services.refresh_tokens import refresh_store
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+@dataclass
+class TokenUser:
+    """Identity carried in the access token, available without a database read"""
+    id: int
+    profile_version: int
+
+
+async def get_token_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenUser:
     """
-    Get current authenticated user
+    Get the current user's identity from the access token alone
     """
     token = credentials.credentials
-    payload = decode_token(token)
+    payload = decode_token(token, token_type="access")
     
     if not payload:
         raise HTTPException(
@@ -28,13 +38,40 @@ async def get_current_user(
         )
     
     user_id = payload.get("sub")
-    if not user_id:
+    if not user_id or not str(user_id).isdigit():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Logged out or revoked for refresh token reuse; checked in memory
+    if payload.get("sid") in refresh_store.revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # OpenAI calls made for this request wait in this user's queue
+    set_caller(user_id)
+    return TokenUser(id=int(user_id), profile_version=payload.get("ver", 0))
+
+
+async def get_current_user_id(token_user: TokenUser = Depends(get_token_user)) -> int:
+    """
+    Get current user id from the access token without loading the user
+    """
+    return token_user.id
+
+
+async def get_current_user(
+    token_user: TokenUser = Depends(get_token_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Get current authenticated user, no older than the profile in their token
+    """
+    user = await user_cache.get_user(db, token_user.id, min_version=token_user.profile_version)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,4 +79,3 @@ async def get_current_user(
         )
     
     return user
-
@@ -0,0 +1,77 @@
+"""
+Cursor Pagination
+
+List endpoints return rows newest first and page with a keyset on
+(created_at, id), so a deep page costs the same as the first one.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+class PageParams:
+    """Query parameters shared by paginated list endpoints"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+async def paginate(db: AsyncSession, query, model, params: PageParams) -> dict:
+    """
+    Run a select of model columns one page at a time, newest first
+    """
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor)
+        # Compare against the stored timestamp so precision lost in the
+        # cursor cannot skip or repeat rows; fall back if it was deleted
+        anchor = func.coalesce(
+            select(model.created_at).where(model.id == row_id).scalar_subquery(),
+            created_at
+        )
+        query = query.where(or_(
+            model.created_at < anchor,
+            and_(model.created_at == anchor, model.id < row_id)
+        ))
+
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {
+        "items": [dict(row._mapping) for row in rows],
+        "next_cursor": next_cursor
+    }
@@ -2,31 +2,47 @@
 Authentication Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core import get_db, verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import get_db, get_password_hash_async, verify_and_update_password, create_access_token, decode_token
 from app.models import User
 from app.schemas import UserCreate, UserResponse, Token
+from app.services.user_cache import user_cache
+from app.services.refresh_tokens import refresh_store, RefreshTokenError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _token_claims(user: User) -> dict:
+    """
+    Identity embedded in tokens so most requests never load the user
+    """
+    return {"sub": str(user.id), "ver": user.profile_version}
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(
+        select(User).where(User.email == user_data.email)
+    )).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # End the read transaction so no connection is held while hashing
+    await db.commit()
+    password_hash = await get_password_hash_async(user_data.password)
+    
     # Create new user
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
         age=user_data.age,
         gender=user_data.gender,
@@ -35,28 +51,47 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
 
 @router.post("/login", response_model=Token)
-async def login(email: str, password: str, db: Session = Depends(get_db)):
+async def login(email: str, password: str, db: AsyncSession = Depends(get_db)):
     """
     Login and get access token
     """
     # Find user
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = (await db.execute(
+        select(User).where(User.email == email)
+    )).scalars().first()
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
     
-    # Create tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    claims = _token_claims(user)
+    password_hash = user.password_hash
+    
+    # End the read transaction so no connection is held while verifying
+    await db.commit()
+    valid, new_hash = await verify_and_update_password(password, password_hash)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    
+    # Rehash with the current cost factor
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
+    # Open a refresh session; its id rides in the access token for revocation
+    session_id, refresh_token = await refresh_store.issue(db, int(claims["sub"]))
+    access_token = create_access_token(data={**claims, "sid": session_id})
     
     return {
         "access_token": access_token,
@@ -66,20 +101,20 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
     """
     Refresh access token using refresh token
     """
-    payload = decode_token(refresh_token)
+    payload = decode_token(refresh_token, token_type="refresh")
     
-    if not payload or payload.get("type") != "refresh":
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await user_cache.get_user(db, int(user_id)) if user_id else None
     
     if not user:
         raise HTTPException(
@@ -87,9 +122,16 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
             detail="User not found",
         )
     
-    # Create new tokens
-    new_access_token = create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    # Rotate; a reused refresh token revokes its whole session
+    claims = _token_claims(user)
+    try:
+        new_refresh_token = await refresh_store.rotate(db, payload)
+    except RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+        )
+    new_access_token = create_access_token(data={**claims, "sid": payload["sid"]})
     
     return {
         "access_token": new_access_token,
@@ -97,3 +139,19 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         "token_type": "bearer"
     }
 
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_token: str, db: AsyncSession = Depends(get_db)):
+    """
+    End the session of a refresh token, including its outstanding access tokens
+    """
+    payload = decode_token(refresh_token, token_type="refresh")
+    
+    if not payload or not payload.get("sid"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+    
+    await refresh_store.revoke(db, payload["sid"])
+
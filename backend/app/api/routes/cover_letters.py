@@ -1,33 +1,111 @@
 """
 Cover Letter Routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core import get_db
-from app.api.dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core import get_db, UnitOfWork, get_unit_of_work
+from app.api.dependencies import get_current_user, get_current_user_id
+from app.api.pagination import PageParams, paginate
 from app.models import User, CoverLetter, JobPosting
-from app.schemas import CoverLetterCreate, CoverLetterUpdate, CoverLetterResponse
+from app.schemas import CoverLetterCreate, CoverLetterUpdate, CoverLetterResponse, CoverLetterSummary, Page
 from app.services import OpenAIService
+from app.services.feedback_stream import start_feedback_stream, get_feedback_stream, sse_event
 
 router = APIRouter(prefix="/cover-letters", tags=["Cover Letters"])
 
+PREVIEW_LENGTH = 200
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _build_user_spec(user: User) -> str:
+    return f"""
+        이름: {user.name}
+        나이: {user.age}
+        성별: {user.gender}
+        경력: {user.career_summary}
+        자격증: {user.certifications}
+        """
+
 
 @router.post("", response_model=CoverLetterResponse, status_code=status.HTTP_201_CREATED)
 async def create_cover_letter(
     cover_letter_data: CoverLetterCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Create cover letter and generate AI feedback
     """
-    # Validate job posting if provided
+    async with uow.transaction() as db:
+        # Validate job posting if provided
+        job_posting = None
+        if cover_letter_data.job_posting_id:
+            job_posting = (await db.execute(
+                select(JobPosting).where(
+                    JobPosting.id == cover_letter_data.job_posting_id,
+                    JobPosting.user_id == current_user.id
+                )
+            )).scalars().first()
+            
+            if not job_posting:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Job posting not found"
+                )
+        
+        # Create cover letter
+        cover_letter = CoverLetter(
+            user_id=current_user.id,
+            job_posting_id=cover_letter_data.job_posting_id,
+            content=cover_letter_data.content
+        )
+        db.add(cover_letter)
+    
+    await uow.db.refresh(cover_letter)
+    
+    if not job_posting:
+        return cover_letter
+    
+    # Generate AI feedback with no connection held
+    feedback = await uow.outside(OpenAIService.generate_cover_letter_feedback(
+        user_spec=_build_user_spec(current_user),
+        job_analysis=job_posting.ai_analysis,
+        cover_letter=cover_letter_data.content
+    ))
+    
+    # Version check rejects the write if the letter was edited meanwhile
+    async with uow.transaction():
+        cover_letter.ai_feedback = feedback
+    
+    await uow.db.refresh(cover_letter)
+    
+    return cover_letter
+
+
+@router.post("/stream", status_code=status.HTTP_201_CREATED)
+async def create_cover_letter_stream(
+    cover_letter_data: CoverLetterCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create cover letter and stream AI feedback as server-sent events
+    """
+    job_posting = None
     if cover_letter_data.job_posting_id:
-        job_posting = db.query(JobPosting).filter(
-            JobPosting.id == cover_letter_data.job_posting_id,
-            JobPosting.user_id == current_user.id
-        ).first()
+        job_posting = (await db.execute(
+            select(JobPosting).where(
+                JobPosting.id == cover_letter_data.job_posting_id,
+                JobPosting.user_id == current_user.id
+            )
+        )).scalars().first()
         
         if not job_posting:
             raise HTTPException(
@@ -35,7 +113,6 @@ async def create_cover_letter(
                 detail="Job posting not found"
             )
     
-    # Create cover letter
     cover_letter = CoverLetter(
         user_id=current_user.id,
         job_posting_id=cover_letter_data.job_posting_id,
@@ -43,60 +120,127 @@ async def create_cover_letter(
     )
     
     db.add(cover_letter)
-    db.commit()
-    db.refresh(cover_letter)
+    await db.commit()
+    await db.refresh(cover_letter)
     
-    # Generate AI feedback
-    if cover_letter_data.job_posting_id:
-        user_spec = f"""
-        이름: {current_user.name}
-        나이: {current_user.age}
-        성별: {current_user.gender}
-        경력: {current_user.career_summary}
-        자격증: {current_user.certifications}
-        """
-        
-        feedback = await OpenAIService.generate_cover_letter_feedback(
-            user_spec=user_spec,
-            job_analysis=job_posting.ai_analysis,
-            cover_letter=cover_letter_data.content
+    created = CoverLetterResponse.model_validate(cover_letter).model_dump(mode="json")
+    stream = None
+    if job_posting:
+        stream = start_feedback_stream(
+            letter_id=cover_letter.id,
+            user_spec=_build_user_spec(current_user),
+            job_analysis=job_posting.ai_analysis or {},
+            content=cover_letter.content
+        )
+    
+    # Release the connection before streaming
+    await db.close()
+    
+    async def events():
+        yield sse_event("created", created)
+        if stream:
+            async for event in stream.events():
+                yield event
+        else:
+            yield sse_event("done", {"cover_letter_id": created["id"]}, event_id=0)
+    
+    # Returned responses ignore the route's status_code
+    return StreamingResponse(
+        events(), status_code=status.HTTP_201_CREATED, media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+@router.get("/{letter_id}/feedback/stream")
+async def stream_cover_letter_feedback(
+    letter_id: int,
+    offset: int = 0,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Resume a cover letter feedback stream from the Last-Event-ID offset
+    """
+    cover_letter = (await db.execute(
+        select(CoverLetter).where(
+            CoverLetter.id == letter_id,
+            CoverLetter.user_id == current_user.id
+        )
+    )).scalars().first()
+    
+    if not cover_letter:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cover letter not found"
         )
+    
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+    
+    stream = get_feedback_stream(letter_id)
+    if not stream and cover_letter.ai_feedback is None and cover_letter.job_posting_id:
+        # Nothing running on this worker and nothing persisted, so start over
+        job_posting = await db.get(JobPosting, cover_letter.job_posting_id)
+        stream = start_feedback_stream(
+            letter_id=cover_letter.id,
+            user_spec=_build_user_spec(current_user),
+            job_analysis=(job_posting.ai_analysis if job_posting else None) or {},
+            content=cover_letter.content
+        )
+    
+    feedback = cover_letter.ai_feedback or ""
+    await db.close()
+    
+    async def events():
+        if stream:
+            async for event in stream.events(offset):
+                yield event
+            return
         
-        cover_letter.ai_feedback = feedback
-        db.commit()
-        db.refresh(cover_letter)
+        if len(feedback) > offset:
+            yield sse_event("token", {"delta": feedback[offset:]}, event_id=len(feedback))
+        yield sse_event("done", {"cover_letter_id": letter_id}, event_id=len(feedback))
     
-    return cover_letter
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
-@router.get("", response_model=List[CoverLetterResponse])
+@router.get("", response_model=Page[CoverLetterSummary])
 async def list_cover_letters(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    List all cover letters for current user
+    List cover letters for current user, newest first, with a short preview
     """
-    cover_letters = db.query(CoverLetter).filter(
-        CoverLetter.user_id == current_user.id
-    ).order_by(CoverLetter.created_at.desc()).all()
+    query = select(
+        CoverLetter.id,
+        CoverLetter.user_id,
+        CoverLetter.job_posting_id,
+        func.substr(CoverLetter.content, 1, PREVIEW_LENGTH).label("preview"),
+        CoverLetter.ai_feedback.isnot(None).label("has_feedback"),
+        CoverLetter.created_at,
+        CoverLetter.updated_at
+    ).where(CoverLetter.user_id == current_user_id)
     
-    return cover_letters
+    return await paginate(db, query, CoverLetter, page)
 
 
 @router.get("/{letter_id}", response_model=CoverLetterResponse)
 async def get_cover_letter(
     letter_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get cover letter by ID
     """
-    cover_letter = db.query(CoverLetter).filter(
-        CoverLetter.id == letter_id,
-        CoverLetter.user_id == current_user.id
-    ).first()
+    cover_letter = (await db.execute(
+        select(CoverLetter).where(
+            CoverLetter.id == letter_id,
+            CoverLetter.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not cover_letter:
         raise HTTPException(
@@ -111,29 +255,32 @@ async def get_cover_letter(
 async def update_cover_letter(
     letter_id: int,
     update_data: CoverLetterUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Update cover letter
     """
-    cover_letter = db.query(CoverLetter).filter(
-        CoverLetter.id == letter_id,
-        CoverLetter.user_id == current_user.id
-    ).first()
-    
-    if not cover_letter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cover letter not found"
-        )
-    
-    # Update fields
-    for field, value in update_data.model_dump(exclude_unset=True).items():
-        setattr(cover_letter, field, value)
+    # Version check turns a concurrent edit or feedback write into a 409
+    async with uow.transaction() as db:
+        cover_letter = (await db.execute(
+            select(CoverLetter).where(
+                CoverLetter.id == letter_id,
+                CoverLetter.user_id == current_user_id
+            )
+        )).scalars().first()
+        
+        if not cover_letter:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover letter not found"
+            )
+        
+        # Update fields
+        for field, value in update_data.model_dump(exclude_unset=True).items():
+            setattr(cover_letter, field, value)
     
-    db.commit()
-    db.refresh(cover_letter)
+    await uow.db.refresh(cover_letter)
     
     return cover_letter
 
@@ -141,16 +288,18 @@ async def update_cover_letter(
 @router.delete("/{letter_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_cover_letter(
     letter_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete cover letter
     """
-    cover_letter = db.query(CoverLetter).filter(
-        CoverLetter.id == letter_id,
-        CoverLetter.user_id == current_user.id
-    ).first()
+    cover_letter = (await db.execute(
+        select(CoverLetter).where(
+            CoverLetter.id == letter_id,
+            CoverLetter.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not cover_letter:
         raise HTTPException(
@@ -158,6 +307,6 @@ async def delete_cover_letter(
             detail="Cover letter not found"
         )
     
-    db.delete(cover_letter)
-    db.commit()
+    await db.delete(cover_letter)
+    await db.commit()
 
@@ -1,279 +1,667 @@
 """
 Interview Routes
 """
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Form, Header, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from datetime import datetime
-from app.core import get_db
-from app.api.dependencies import get_current_user
-from app.models import User, InterviewSession, InterviewTurn, CoverLetter, JobPosting
+from app.core import get_db, settings, UnitOfWork, get_unit_of_work
+from app.api.dependencies import get_current_user_id
+from app.api.pagination import PageParams, paginate
+from app.models import InterviewSession, InterviewTurn, CoverLetter, JobPosting, AnswerUpload
 from app.schemas import (
     InterviewSessionCreate,
-    InterviewSessionResponse,
-    InterviewResultResponse
+    InterviewSessionSummary,
+    InterviewResultResponse,
+    InterviewTurnResponse,
+    AnswerUploadCreate,
+    AnswerUploadResponse,
+    DirectAnswerUploadCreate,
+    DirectAnswerUploadResponse,
+    Page
 )
-from app.services import OpenAIService, s3_service
+from app.services import OpenAIService, storage_service
+from app.services.answer_ingest import ingest_answer, transcribe_stored_answer, discard_replaced_recording
+from app.services.answer_uploads import (
+    UploadOffsetError,
+    UploadSizeError,
+    UploadMissingError,
+    UploadPolicyError,
+    start_upload,
+    start_direct_upload,
+    append_chunk,
+    store_upload,
+    abort_upload,
+)
+from app.services.interview_context import InterviewContext
+from app.services.question_audio import start_render, schedule_render, get_render, lookup_question_audio
+from app.services.job_queue import enqueue, wake_workers
+from app.services.interview_feedback import INTERVIEW_FEEDBACK_JOB, INTERVIEW_FEEDBACK_PRIORITY, TURN_FEEDBACK_JOB
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
 
 
+def _interviewer_context(job_posting: JobPosting) -> str:
+    keywords = job_posting.ai_analysis.get('keywords', []) if job_posting and job_posting.ai_analysis else []
+    return f"{keywords[0] if keywords else '해당 분야'} 전문가이자 면접관"
+
+
 @router.post("/start", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def start_interview(
     session_data: InterviewSessionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Start new interview session
     """
-    # Validate cover letter
-    cover_letter = db.query(CoverLetter).filter(
-        CoverLetter.id == session_data.cover_letter_id,
-        CoverLetter.user_id == current_user.id
-    ).first()
-    
-    if not cover_letter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cover letter not found"
-        )
-    
-    # Create session
-    session = InterviewSession(
-        user_id=current_user.id,
-        cover_letter_id=cover_letter.id,
-        status="in_progress"
-    )
-    
-    db.add(session)
-    db.commit()
-    db.refresh(session)
-    
-    # Generate first question
-    job_posting = cover_letter.job_posting
-    context = f"{job_posting.ai_analysis.get('keywords', [])[0] if job_posting and job_posting.ai_analysis else '해당 분야'} 전문가이자 면접관"
-    
-    question_text = await OpenAIService.generate_interview_question(
-        context=context,
+    async with uow.transaction() as db:
+        # Validate cover letter, with its job posting in the same query
+        cover_letter = (await db.execute(
+            select(CoverLetter).options(
+                joinedload(CoverLetter.job_posting)
+            ).where(
+                CoverLetter.id == session_data.cover_letter_id,
+                CoverLetter.user_id == current_user_id
+            )
+        )).scalars().first()
+        
+        if not cover_letter:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover letter not found"
+            )
+    
+    # Generate first question with no connection held
+    question_text = await uow.outside(OpenAIService.generate_interview_question(
+        context=_interviewer_context(cover_letter.job_posting),
         turn_number=1
-    )
-    
-    # Generate TTS
-    audio_content = await OpenAIService.generate_tts(question_text)
-    
-    # Upload to S3
-    file_key = s3_service.generate_file_key(
-        prefix=f"interviews/{session.id}/questions",
-        filename=f"question_1.mp3"
-    )
-    question_audio_url = s3_service.upload_file(
-        file_content=audio_content,
-        file_key=file_key,
-        content_type="audio/mpeg"
-    )
-    
-    # Create first turn
-    turn = InterviewTurn(
-        session_id=session.id,
-        turn_number=1,
-        question_text=question_text,
-        question_audio_url=question_audio_url
-    )
+    ))
+    question_audio_url = await lookup_question_audio(question_text)
+    
+    async with uow.transaction() as db:
+        # The cover letter may have been deleted while the question was generated
+        if not await uow.reload(cover_letter):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover letter not found"
+            )
+        
+        # Create session and first turn; audio is reused or rendered in the background
+        session = InterviewSession(
+            user_id=current_user_id,
+            cover_letter_id=cover_letter.id,
+            status="in_progress",
+            max_turns=settings.INTERVIEW_MAX_TURNS
+        )
+        db.add(session)
+        await db.flush()
+        
+        turn = InterviewTurn(
+            session_id=session.id,
+            turn_number=1,
+            question_text=question_text,
+            question_audio_url=question_audio_url
+        )
+        db.add(turn)
+        if not question_audio_url:
+            schedule_render(db, session.id, turn.turn_number)
     
-    db.add(turn)
-    db.commit()
-    db.refresh(turn)
+    if not turn.question_audio_url:
+        start_render(turn_id=turn.id, text=question_text)
     
     return {
         "session_id": session.id,
         "status": session.status,
+        "max_turns": session.max_turns,
         "current_turn": {
             "turn_number": turn.turn_number,
             "question_text": turn.question_text,
-            "question_audio_url": turn.question_audio_url
+            "question_audio_url": turn.question_audio_url,
+            "question_audio_status": "ready" if turn.question_audio_url else "pending"
         }
     }
 
 
+def _ensure_answerable(session: InterviewSession, turn: InterviewTurn):
+    if session.status != "in_progress":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Interview session is not in progress"
+        )
+    
+    if turn.answer_audio_url:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Interview turn already answered"
+        )
+
+
 @router.post("/{session_id}/answer", response_model=dict)
 async def submit_answer(
     session_id: int,
+    response: Response,
     turn_number: int = Form(...),
     audio: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Submit answer for current turn and get next question
     """
-    # Validate session
-    session = db.query(InterviewSession).filter(
-        InterviewSession.id == session_id,
-        InterviewSession.user_id == current_user.id
-    ).first()
-    
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview session not found"
+    def ingest_recording(on_transcript):
+        # Upload and transcribe concurrently from the spooled upload
+        answer_file_key = storage_service.generate_file_key(
+            prefix=f"interviews/{session_id}/answers",
+            filename=f"answer_{turn_number}.{audio.filename.split('.')[-1]}"
         )
-    
-    # Get current turn
-    turn = db.query(InterviewTurn).filter(
-        InterviewTurn.session_id == session_id,
-        InterviewTurn.turn_number == turn_number
-    ).first()
-    
-    if not turn:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview turn not found"
+        return ingest_answer(
+            fileobj=audio.file,
+            filename=audio.filename,
+            content_type=audio.content_type,
+            file_key=answer_file_key,
+            on_transcript=on_transcript
         )
     
-    # Upload answer audio to S3
-    audio_content = await audio.read()
-    answer_file_key = s3_service.generate_file_key(
-        prefix=f"interviews/{session_id}/answers",
-        filename=f"answer_{turn_number}.{audio.filename.split('.')[-1]}"
-    )
-    answer_audio_url = s3_service.upload_file(
-        file_content=audio_content,
-        file_key=answer_file_key,
-        content_type=audio.content_type
-    )
-    
-    # Transcribe with Whisper
-    audio.file.seek(0)  # Reset file pointer
-    answer_stt_text = await OpenAIService.transcribe_audio(audio.file)
-    
-    # Update turn
-    turn.answer_audio_url = answer_audio_url
-    turn.answer_stt_text = answer_stt_text
-    db.commit()
-    
-    # Check if interview is complete (5 turns)
-    if turn_number >= 5:
-        session.status = "completed"
-        session.completed_at = datetime.utcnow()
-        db.commit()
+    return await _answer_turn(session_id, turn_number, current_user_id, uow, response, ingest_recording)
+
+
+async def _answer_turn(
+    session_id: int,
+    turn_number: int,
+    current_user_id: int,
+    uow: UnitOfWork,
+    response: Response,
+    ingest_recording
+) -> dict:
+    """
+    Record the answer to a turn and create the next one
+
+    ingest_recording(on_transcript) stores and transcribes the recording,
+    calling on_transcript as soon as the transcript is ready.
+    """
+    async with uow.transaction() as db:
+        # Validate session, with its job posting joined
+        session = (await db.execute(
+            select(InterviewSession).options(
+                joinedload(InterviewSession.cover_letter).joinedload(CoverLetter.job_posting)
+            ).where(
+                InterviewSession.id == session_id,
+                InterviewSession.user_id == current_user_id
+            )
+        )).scalars().first()
+        
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview session not found"
+            )
+        
+        # Current turn and the earlier turns not yet in the running summary
+        turns = (await db.execute(
+            select(InterviewTurn).where(
+                InterviewTurn.session_id == session_id,
+                InterviewTurn.turn_number > min(session.context_summary_turns, turn_number - 1),
+                InterviewTurn.turn_number <= turn_number
+            ).order_by(InterviewTurn.turn_number)
+        )).scalars().all()
+        turn = next((t for t in turns if t.turn_number == turn_number), None)
+        
+        if not turn:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview turn not found"
+            )
+        
+        _ensure_answerable(session, turn)
+        is_last_turn = turn_number >= session.max_turns
+        
+        # Prefetch the next question as soon as the transcript is ready
+        conversation = None
+        generate_next_question = None
+        if not is_last_turn:
+            conversation = InterviewContext(
+                session.context_summary, session.context_summary_turns, turns, turn_number
+            )
+            context = _interviewer_context(session.cover_letter.job_posting)
+            question_text = turn.question_text
+            max_turns = session.max_turns
+            
+            async def generate_next_question(answer_stt_text: str) -> str:
+                summary, recent_qa = await conversation.for_next_question(
+                    turn_number, question_text, answer_stt_text
+                )
+                return await OpenAIService.generate_interview_question(
+                    context=context,
+                    turn_number=turn_number + 1,
+                    previous_qa=recent_qa,
+                    summary=summary,
+                    max_turns=max_turns
+                )
+    
+    # Fold turns leaving the verbatim window into the summary while the answer is transcribed
+    if conversation:
+        conversation.start()
+    
+    # Store and transcribe the recording with no connection held
+    ingest = await uow.outside(ingest_recording(generate_next_question))
+    answer_audio_url = ingest.answer_audio_url
+    answer_stt_text = ingest.answer_stt_text
+    response.headers["Server-Timing"] = ingest.server_timing()
+    
+    next_question_audio_url = None
+    if not is_last_turn:
+        next_question_audio_url = await lookup_question_audio(ingest.followup)
+    
+    async with uow.transaction() as db:
+        # Another request may have answered this turn in the meantime; the
+        # version check on commit catches a race that slips past this
+        turn = await uow.reload(turn, joinedload(InterviewTurn.session))
+        session = turn.session if turn else None
+        if not session or not turn:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview session not found"
+            )
+        
+        _ensure_answerable(session, turn)
         
-        # Generate feedback asynchronously (in real app, use background tasks)
-        await generate_feedback_for_session(session_id, db)
+        # Update turn
+        turn.answer_audio_url = answer_audio_url
+        turn.answer_stt_text = answer_stt_text
+        
+        if conversation and conversation.changed:
+            session.context_summary = conversation.summary
+            session.context_summary_turns = conversation.summary_turns
+        
+        # Check if interview is complete
+        if is_last_turn:
+            session.status = "completed"
+            session.completed_at = datetime.utcnow()
+            session.feedback_status = "feedback_pending"
+            enqueue(
+                db, INTERVIEW_FEEDBACK_JOB, {"session_id": session_id, "user_id": session.user_id},
+                priority=INTERVIEW_FEEDBACK_PRIORITY
+            )
+        else:
+            # Grade this answer in the background, batched with other sessions' answers
+            enqueue(
+                db, TURN_FEEDBACK_JOB, {"turn_id": turn.id, "session_id": session_id},
+                delay=settings.TURN_FEEDBACK_BATCH_DELAY
+            )
+            
+            # Create next turn; audio is reused or rendered in the background
+            next_turn = InterviewTurn(
+                session_id=session_id,
+                turn_number=turn_number + 1,
+                question_text=ingest.followup,
+                question_audio_url=next_question_audio_url
+            )
+            db.add(next_turn)
+            if not next_question_audio_url:
+                schedule_render(db, session_id, next_turn.turn_number)
+    
+    # Only now that the answer points at the normalized copy is the original unneeded
+    await discard_replaced_recording(ingest)
+    
+    if is_last_turn:
+        wake_workers()
         
         return {
             "turn_number": turn_number,
             "answer_audio_url": answer_audio_url,
             "answer_stt_text": answer_stt_text,
             "interview_completed": True,
+            "feedback_status": session.feedback_status,
             "message": "면접이 종료되었습니다. 피드백을 생성 중입니다."
         }
     
-    # Generate next question
-    previous_turns = db.query(InterviewTurn).filter(
-        InterviewTurn.session_id == session_id
-    ).order_by(InterviewTurn.turn_number).all()
+    if not next_turn.question_audio_url:
+        start_render(turn_id=next_turn.id, text=next_turn.question_text)
     
-    previous_qa = [
-        {
-            "question": t.question_text,
-            "answer": t.answer_stt_text
+    return {
+        "turn_number": turn_number,
+        "answer_audio_url": answer_audio_url,
+        "answer_stt_text": answer_stt_text,
+        "next_turn": {
+            "turn_number": next_turn.turn_number,
+            "question_text": next_turn.question_text,
+            "question_audio_url": next_turn.question_audio_url,
+            "question_audio_status": "ready" if next_turn.question_audio_url else "pending"
         }
-        for t in previous_turns if t.answer_stt_text
-    ]
+    }
+
+
+def _upload_response(upload: AnswerUpload, response: Response = None) -> AnswerUploadResponse:
+    if response is not None:
+        response.headers["Upload-Offset"] = str(upload.offset)
+    return AnswerUploadResponse(
+        upload_id=upload.id,
+        turn_number=upload.turn_number,
+        size=upload.size,
+        offset=upload.offset,
+        chunk_size=settings.ANSWER_UPLOAD_CHUNK_SIZE,
+        status=upload.status
+    )
+
+
+def _offset_conflict(e: UploadOffsetError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Upload is at offset {e.offset}; resume from there",
+        headers={"Upload-Offset": str(e.offset)}
+    )
+
+
+async def _get_owned_upload(db: AsyncSession, session_id: int, upload_id: str, user_id: int) -> AnswerUpload:
+    upload = (await db.execute(
+        select(AnswerUpload).where(
+            AnswerUpload.id == upload_id,
+            AnswerUpload.session_id == session_id,
+            AnswerUpload.user_id == user_id
+        )
+    )).scalars().first()
     
-    cover_letter = session.cover_letter
-    job_posting = cover_letter.job_posting
-    context = f"{job_posting.ai_analysis.get('keywords', [])[0] if job_posting and job_posting.ai_analysis else '해당 분야'} 전문가이자 면접관"
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Answer upload not found"
+        )
     
-    next_question_text = await OpenAIService.generate_interview_question(
-        context=context,
-        turn_number=turn_number + 1,
-        previous_qa=previous_qa
-    )
+    return upload
+
+
+async def _ensure_upload_allowed(uow: UnitOfWork, session_id: int, upload_data: AnswerUploadCreate, user_id: int):
+    if upload_data.size > settings.ANSWER_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Answer recordings are limited to {settings.ANSWER_UPLOAD_MAX_BYTES} bytes"
+        )
     
-    # Generate TTS for next question
-    next_audio_content = await OpenAIService.generate_tts(next_question_text)
+    async with uow.transaction() as db:
+        turn = await _get_owned_turn(db, session_id, upload_data.turn_number, user_id)
+        session = await db.get(InterviewSession, session_id)
+        _ensure_answerable(session, turn)
+
+
+@router.post("/{session_id}/answer/uploads", response_model=AnswerUploadResponse, status_code=status.HTTP_201_CREATED)
+async def start_answer_upload(
+    session_id: int,
+    upload_data: AnswerUploadCreate,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Start a resumable answer upload; send chunks with PUT, then commit
+    """
+    await _ensure_upload_allowed(uow, session_id, upload_data, current_user_id)
     
-    next_file_key = s3_service.generate_file_key(
-        prefix=f"interviews/{session_id}/questions",
-        filename=f"question_{turn_number + 1}.mp3"
-    )
-    next_question_audio_url = s3_service.upload_file(
-        file_content=next_audio_content,
-        file_key=next_file_key,
-        content_type="audio/mpeg"
+    upload = await start_upload(
+        uow,
+        user_id=current_user_id,
+        session_id=session_id,
+        turn_number=upload_data.turn_number,
+        size=upload_data.size,
+        filename=upload_data.filename,
+        content_type=upload_data.content_type
     )
     
-    # Create next turn
-    next_turn = InterviewTurn(
+    return _upload_response(upload, response)
+
+
+@router.post(
+    "/{session_id}/answer/uploads/direct",
+    response_model=DirectAnswerUploadResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def start_direct_answer_upload(
+    session_id: int,
+    upload_data: DirectAnswerUploadCreate,
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Presign a request that uploads the recording straight to storage; send it, then commit
+    """
+    if not storage_service.DIRECT_UPLOADS:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads are not supported by this storage backend; use resumable uploads"
+        )
+    
+    if upload_data.content_type not in settings.ANSWER_UPLOAD_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Answer recordings must be one of {', '.join(settings.ANSWER_UPLOAD_CONTENT_TYPES)}"
+        )
+    
+    await _ensure_upload_allowed(uow, session_id, upload_data, current_user_id)
+    
+    upload, request = await start_direct_upload(
+        uow,
+        user_id=current_user_id,
         session_id=session_id,
-        turn_number=turn_number + 1,
-        question_text=next_question_text,
-        question_audio_url=next_question_audio_url
+        turn_number=upload_data.turn_number,
+        size=upload_data.size,
+        filename=upload_data.filename,
+        content_type=upload_data.content_type,
+        method=upload_data.method
     )
     
-    db.add(next_turn)
-    db.commit()
-    db.refresh(next_turn)
+    return DirectAnswerUploadResponse(
+        upload_id=upload.id,
+        turn_number=upload.turn_number,
+        size=upload.size,
+        status=upload.status,
+        expires_in=settings.ANSWER_UPLOAD_PRESIGN_EXPIRY,
+        **request
+    )
+
+
+@router.get("/{session_id}/answer/uploads/{upload_id}", response_model=AnswerUploadResponse)
+async def get_answer_upload(
+    session_id: int,
+    upload_id: str,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Offset to resume an interrupted upload from
+    """
+    upload = await _get_owned_upload(db, session_id, upload_id, current_user_id)
+    return _upload_response(upload, response)
+
+
+@router.put("/{session_id}/answer/uploads/{upload_id}", response_model=AnswerUploadResponse)
+async def upload_answer_chunk(
+    session_id: int,
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(...),
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Append the raw request body at Upload-Offset, which must match the stored offset
+    """
+    async with uow.transaction() as db:
+        upload = await _get_owned_upload(db, session_id, upload_id, current_user_id)
+    
+    try:
+        upload = await append_chunk(uow, upload, upload_offset, request.stream())
+    except UploadOffsetError as e:
+        raise _offset_conflict(e)
+    except UploadSizeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    
+    return _upload_response(upload, response)
+
+
+@router.delete("/{session_id}/answer/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_answer_upload(
+    session_id: int,
+    upload_id: str,
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Abandon an unfinished upload
+    """
+    async with uow.transaction() as db:
+        upload = await _get_owned_upload(db, session_id, upload_id, current_user_id)
+    
+    await abort_upload(uow, upload)
+
+
+@router.post("/{session_id}/answer/uploads/{upload_id}/commit", response_model=dict)
+async def commit_answer_upload(
+    session_id: int,
+    upload_id: str,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Submit a fully uploaded recording as the turn's answer; same response as /answer
+
+    Also the completion callback for direct uploads, once storage has accepted the recording.
+    """
+    async with uow.transaction() as db:
+        upload = await _get_owned_upload(db, session_id, upload_id, current_user_id)
+    
+    if upload.status not in ("uploading", "presigned", "stored"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Answer upload is {upload.status}"
+        )
+    
+    try:
+        await store_upload(uow, upload)
+    except UploadOffsetError as e:
+        raise _offset_conflict(e)
+    except UploadMissingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except UploadPolicyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    def ingest_recording(on_transcript):
+        return transcribe_stored_answer(
+            file_key=upload.file_key,
+            filename=upload.filename,
+            content_type=upload.content_type,
+            on_transcript=on_transcript
+        )
+    
+    result = await _answer_turn(session_id, upload.turn_number, current_user_id, uow, response, ingest_recording)
+    
+    async with uow.transaction():
+        upload.status = "committed"
+    
+    return result
+
+
+async def _get_owned_turn(db: AsyncSession, session_id: int, turn_number: int, user_id: int) -> InterviewTurn:
+    turn = (await db.execute(
+        select(InterviewTurn).join(InterviewSession).where(
+            InterviewSession.id == session_id,
+            InterviewSession.user_id == user_id,
+            InterviewTurn.turn_number == turn_number
+        )
+    )).scalars().first()
+    
+    if not turn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview turn not found"
+        )
+    
+    return turn
+
+
+@router.get("/{session_id}/turns/{turn_number}/audio", response_model=dict)
+async def get_question_audio(
+    session_id: int,
+    turn_number: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Poll question audio rendering status
+    """
+    turn = await _get_owned_turn(db, session_id, turn_number, current_user_id)
+    render = get_render(turn.id)
+    
+    if turn.question_audio_url:
+        audio_status = "ready"
+    elif turn.question_audio_status == "failed" or (render and render.failed):
+        audio_status = "failed"
+    else:
+        # Rendering here, on another worker, or waiting on the turn's render job
+        audio_status = "pending"
     
     return {
-        "turn_number": turn_number,
-        "answer_audio_url": answer_audio_url,
-        "answer_stt_text": answer_stt_text,
-        "next_turn": {
-            "turn_number": next_turn.turn_number,
-            "question_text": next_turn.question_text,
-            "question_audio_url": next_turn.question_audio_url
-        }
+        "turn_number": turn.turn_number,
+        "question_audio_url": turn.question_audio_url,
+        "question_audio_status": audio_status
     }
 
 
-async def generate_feedback_for_session(session_id: int, db: Session):
+@router.get("/{session_id}/turns/{turn_number}/audio/stream")
+async def stream_question_audio(
+    session_id: int,
+    turn_number: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Generate feedback for completed interview session
+    Stream question audio while it is still being synthesized
     """
-    turns = db.query(InterviewTurn).filter(
-        InterviewTurn.session_id == session_id
-    ).order_by(InterviewTurn.turn_number).all()
-    
-    turns_data = [
-        {
-            "turn_number": t.turn_number,
-            "question": t.question_text,
-            "answer": t.answer_stt_text
-        }
-        for t in turns
-    ]
-    
-    feedback_result = await OpenAIService.generate_interview_feedback(turns_data)
+    turn = await _get_owned_turn(db, session_id, turn_number, current_user_id)
     
-    # Update session with total feedback
-    session = db.query(InterviewSession).get(session_id)
-    session.total_feedback = feedback_result.get("total_feedback")
+    if turn.question_audio_url:
+        return RedirectResponse(turn.question_audio_url)
     
-    # Update each turn with individual feedback
-    turn_feedbacks = feedback_result.get("turn_feedbacks", [])
-    for i, turn in enumerate(turns):
-        if i < len(turn_feedbacks):
-            turn.turn_feedback = turn_feedbacks[i]
+    # Rendering on another worker, lost or failed; render here and store the result
+    render = get_render(turn.id)
+    if not render or render.failed:
+        render = start_render(turn_id=turn.id, text=turn.question_text)
     
-    db.commit()
+    return StreamingResponse(render.stream(), media_type="audio/mpeg")
 
 
 @router.get("/{session_id}/result", response_model=InterviewResultResponse)
 async def get_interview_result(
     session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get interview result with feedback
     """
-    session = db.query(InterviewSession).filter(
-        InterviewSession.id == session_id,
-        InterviewSession.user_id == current_user.id
-    ).first()
+    # Session and turns in a single joined query
+    session = (await db.execute(
+        select(InterviewSession).options(
+            joinedload(InterviewSession.turns)
+        ).where(
+            InterviewSession.id == session_id,
+            InterviewSession.user_id == current_user_id
+        )
+    )).unique().scalars().first()
     
     if not session:
         raise HTTPException(
@@ -281,28 +669,43 @@ async def get_interview_result(
             detail="Interview session not found"
         )
     
-    # Get all turns
-    turns = db.query(InterviewTurn).filter(
-        InterviewTurn.session_id == session_id
-    ).order_by(InterviewTurn.turn_number).all()
-    
-    return {
-        **session.__dict__,
-        "turns": turns
-    }
+    # Feedback still being generated
+    if session.feedback_status == "feedback_pending":
+        response.status_code = status.HTTP_202_ACCEPTED
+    
+    return InterviewResultResponse(
+        id=session.id,
+        user_id=session.user_id,
+        cover_letter_id=session.cover_letter_id,
+        status=session.status,
+        feedback_status=session.feedback_status,
+        max_turns=session.max_turns,
+        total_feedback=session.total_feedback,
+        created_at=session.created_at,
+        completed_at=session.completed_at,
+        turns=[InterviewTurnResponse.model_validate(turn) for turn in session.turns]
+    )
 
 
-@router.get("/history", response_model=List[InterviewSessionResponse])
+@router.get("/history", response_model=Page[InterviewSessionSummary])
 async def get_interview_history(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Get interview history for current user
+    Get interview history for current user, newest first, without feedback text
     """
-    sessions = db.query(InterviewSession).filter(
-        InterviewSession.user_id == current_user.id
-    ).order_by(InterviewSession.created_at.desc()).all()
-    
-    return sessions
+    query = select(
+        InterviewSession.id,
+        InterviewSession.user_id,
+        InterviewSession.cover_letter_id,
+        InterviewSession.status,
+        InterviewSession.feedback_status,
+        InterviewSession.max_turns,
+        InterviewSession.created_at,
+        InterviewSession.completed_at
+    ).where(InterviewSession.user_id == current_user_id)
+    
+    return await paginate(db, query, InterviewSession, page)
 
@@ -2,15 +2,15 @@
 Job Posting Routes
 """
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core import get_db
-from app.api.dependencies import get_current_user
-from app.models import User, JobPosting
-from app.schemas import JobPostingResponse
-from app.services import OpenAIService
-import PyPDF2
-import io
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import get_db, UnitOfWork, get_unit_of_work
+from app.api.dependencies import get_current_user_id
+from app.api.pagination import PageParams, paginate
+from app.models import JobPosting
+from app.schemas import JobPostingResponse, JobPostingSummary, Page
+from app.services.analysis_cache import analysis_cache
+from app.services.pdf_service import extract_pdf_text, PDFExtractionError
 
 router = APIRouter(prefix="/job-postings", tags=["Job Postings"])
 
@@ -18,8 +18,8 @@ router = APIRouter(prefix="/job-postings", tags=["Job Postings"])
 @router.post("", response_model=JobPostingResponse, status_code=status.HTTP_201_CREATED)
 async def create_job_posting(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Upload and analyze job posting PDF
@@ -31,74 +31,79 @@ async def create_job_posting(
             detail="Only PDF files are allowed"
         )
     
-    # Extract text from PDF
+    # Nothing below needs the database until the insert
+    await uow.release()
+    
+    # Extract text from PDF in the process pool
+    pdf_content = await file.read()
     try:
-        pdf_content = await file.read()
-        pdf_file = io.BytesIO(pdf_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        if not text.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract text from PDF"
-            )
+        text = await extract_pdf_text(pdf_content)
     
-    except Exception as e:
+    except PDFExtractionError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to process PDF: {str(e)}"
         )
     
-    # Analyze with AI
-    ai_analysis = await OpenAIService.analyze_job_posting(text)
+    if not text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not extract text from PDF"
+        )
+    
+    # Analyze with AI, reusing results for postings seen before
+    ai_analysis = await analysis_cache.get_or_analyze(text)
     
     # Create job posting
-    job_posting = JobPosting(
-        user_id=current_user.id,
-        title=file.filename.replace('.pdf', ''),
-        original_text=text,
-        ai_analysis=ai_analysis
-    )
+    async with uow.transaction() as db:
+        job_posting = JobPosting(
+            user_id=current_user_id,
+            title=file.filename.replace('.pdf', ''),
+            original_text=text,
+            ai_analysis=ai_analysis
+        )
+        db.add(job_posting)
     
-    db.add(job_posting)
-    db.commit()
-    db.refresh(job_posting)
+    await uow.db.refresh(job_posting)
     
     return job_posting
 
 
-@router.get("", response_model=List[JobPostingResponse])
+@router.get("", response_model=Page[JobPostingSummary])
 async def list_job_postings(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    List all job postings for current user
+    List job postings for current user, newest first, without the posting text
     """
-    job_postings = db.query(JobPosting).filter(
-        JobPosting.user_id == current_user.id
-    ).order_by(JobPosting.created_at.desc()).all()
+    query = select(
+        JobPosting.id,
+        JobPosting.user_id,
+        JobPosting.title,
+        JobPosting.ai_analysis,
+        JobPosting.created_at
+    ).where(JobPosting.user_id == current_user_id)
     
-    return job_postings
+    return await paginate(db, query, JobPosting, page)
 
 
 @router.get("/{posting_id}", response_model=JobPostingResponse)
 async def get_job_posting(
     posting_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get job posting by ID
     """
-    job_posting = db.query(JobPosting).filter(
-        JobPosting.id == posting_id,
-        JobPosting.user_id == current_user.id
-    ).first()
+    job_posting = (await db.execute(
+        select(JobPosting).where(
+            JobPosting.id == posting_id,
+            JobPosting.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not job_posting:
         raise HTTPException(
@@ -112,16 +117,18 @@ async def get_job_posting(
 @router.delete("/{posting_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_job_posting(
     posting_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete job posting
     """
-    job_posting = db.query(JobPosting).filter(
-        JobPosting.id == posting_id,
-        JobPosting.user_id == current_user.id
-    ).first()
+    job_posting = (await db.execute(
+        select(JobPosting).where(
+            JobPosting.id == posting_id,
+            JobPosting.user_id == current_user_id
+        )
+    )).scalars().first()
     
     if not job_posting:
         raise HTTPException(
@@ -129,6 +136,6 @@ async def delete_job_posting(
             detail="Job posting not found"
         )
     
-    db.delete(job_posting)
-    db.commit()
+    await db.delete(job_posting)
+    await db.commit()
 
@@ -2,11 +2,12 @@
 User Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import get_db
 from app.api.dependencies import get_current_user
 from app.models import User
 from app.schemas import UserResponse, UserUpdate
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -23,7 +24,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update current user information
@@ -31,9 +32,11 @@ async def update_current_user(
     # Update fields
     for field, value in user_update.model_dump(exclude_unset=True).items():
         setattr(current_user, field, value)
+    current_user.profile_version = User.profile_version + 1
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await user_cache.invalidate(current_user.id)
+    await db.refresh(current_user)
     
     return current_user
 
@@ -2,10 +2,13 @@
 Core modules
 """
 from .config import settings
-from .database import Base, engine, get_db
+from .database import Base, engine, get_db, pool_metrics
+from .unit_of_work import UnitOfWork, ConcurrentUpdateError, get_unit_of_work
 from .security import (
     verify_password,
     get_password_hash,
+    get_password_hash_async,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -16,8 +19,14 @@ __all__ = [
     "Base",
     "engine",
     "get_db",
+    "pool_metrics",
+    "UnitOfWork",
+    "ConcurrentUpdateError",
+    "get_unit_of_work",
     "verify_password",
     "get_password_hash",
+    "get_password_hash_async",
+    "verify_and_update_password",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -0,0 +1,12 @@
+"""
+Retry Backoff
+"""
+import random
+
+
+def retry_delay(attempts: int, base_delay: float, max_delay: float) -> float:
+    """
+    Exponential backoff with full jitter for the given attempt, starting at 1
+    """
+    ceiling = min(max_delay, base_delay * (2 ** (attempts - 1)))
+    return random.uniform(ceiling / 2, ceiling)
@@ -2,7 +2,7 @@
 Application Configuration
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -18,18 +18,124 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256/HS384/HS512 with SECRET_KEY, or RS256/EdDSA with the keys below
+    JWT_PRIVATE_KEY: Optional[str] = None  # PEM or path; only token-issuing workers need it
+    JWT_PUBLIC_KEY: Optional[str] = None  # PEM or path; derived from the private key when unset
+    JWT_ISSUER: Optional[str] = None
+    JWT_LEEWAY_SECONDS: float = 0
+    REFRESH_REUSE_GRACE_SECONDS: float = 10  # a just-rotated token is rejected without revoking its session
+    REFRESH_REVOCATION_SYNC_INTERVAL: float = 5.0  # how soon other workers see a revocation
+    REFRESH_COMPACTION_INTERVAL: int = 3600
+    REFRESH_COMPACTION_BATCH_SIZE: int = 10000
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_CONCURRENCY: int = 4
     
     # OpenAI
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # Override for local fake servers
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_CHAT_TIMEOUT: float = 60.0
+    OPENAI_TTS_TIMEOUT: float = 30.0
+    OPENAI_STT_TIMEOUT: float = 60.0
+    OPENAI_CHAT_CONCURRENCY: int = 16
+    OPENAI_TTS_CONCURRENCY: int = 8
+    OPENAI_STT_CONCURRENCY: int = 8
+    OPENAI_RATE_LIMIT_BACKEND: str = "memory"  # memory, database (one budget across workers)
+    OPENAI_RATE_LIMITS: dict = {
+        "gpt-4o": {"rpm": 500, "tpm": 30000},
+        "tts-1-hd": {"rpm": 50},
+        "whisper-1": {"rpm": 50},
+    }
+    OPENAI_COMPLETION_TOKEN_ESTIMATE: int = 800  # charged up front, corrected from response usage
+    OPENAI_MAX_RETRIES: int = 4
+    OPENAI_RETRY_BASE_DELAY: float = 1.0
+    OPENAI_RETRY_MAX_DELAY: float = 30.0
     
     # AWS S3
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_S3_BUCKET: str
     AWS_REGION: str = "ap-northeast-2"
+    AWS_S3_ENDPOINT_URL: Optional[str] = None  # MinIO or other S3-compatible endpoint
+    AWS_S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    AWS_S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    AWS_S3_MULTIPART_CONCURRENCY: int = 4
+    
+    # Storage
+    STORAGE_BACKEND: str = "s3"  # s3, local
+    ANSWER_UPLOAD_MAX_BYTES: int = 25 * 1024 * 1024  # Whisper's file size limit
+    ANSWER_UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # most bytes per resumable upload chunk
+    ANSWER_UPLOAD_TTL: int = 3600  # unfinished resumable uploads are aborted after this
+    ANSWER_UPLOAD_PRESIGN_EXPIRY: int = 900  # lifetime of presigned direct-upload requests
+    ANSWER_UPLOAD_CONTENT_TYPES: List[str] = [
+        "audio/webm", "audio/ogg", "audio/mpeg", "audio/mp4", "audio/m4a", "audio/wav", "audio/x-wav"
+    ]  # allowed for direct uploads, enforced by the presigned request
+    STORAGE_MAX_WORKERS: int = 16
+    LOCAL_STORAGE_PATH: str = "./storage"
+    LOCAL_STORAGE_URL: str = "http://localhost:8000/storage"
+    
+    # PDF extraction
+    PDF_EXTRACTOR: str = "pypdf2"  # pypdf2, pdfplumber
+    PDF_MAX_WORKERS: int = 2
+    PDF_MAX_PAGES: int = 30
+    PDF_EXTRACT_TIMEOUT: float = 20.0
+    
+    # Job posting analysis cache
+    ANALYSIS_CACHE_BACKENDS: str = "memory,database"  # comma separated, checked in order
+    ANALYSIS_CACHE_TTL: int = 7 * 24 * 3600
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    ANALYSIS_CACHE_PURGE_BATCH_SIZE: int = 100  # expired database rows deleted per database miss
+    
+    # Answer audio normalization (needs ffmpeg with libopus)
+    AUDIO_NORMALIZE: bool = False  # mono, trimmed, Opus before storage and Whisper
+    AUDIO_FFMPEG_PATH: str = "ffmpeg"
+    AUDIO_SAMPLE_RATE: int = 16000  # what Whisper resamples to anyway
+    AUDIO_OPUS_BITRATE: int = 24000  # bits per second
+    AUDIO_OPUS_COMPLEXITY: int = 3  # 0-10; libopus' default of 10 costs about 3x the CPU for speech at this bitrate
+    AUDIO_SILENCE_THRESHOLD_DB: float = -45.0  # quieter lead-in and tail is trimmed
+    AUDIO_NORMALIZE_CONTENT_TYPES: List[str] = [
+        "audio/wav", "audio/x-wav", "audio/wave", "audio/flac", "audio/x-flac", "audio/aiff", "audio/x-aiff"
+    ]  # uncompressed; re-encoding WebM/Ogg/MP3 saves less than it costs unless the uplink is slow
+    AUDIO_NORMALIZE_WORKERS: int = 2
+    AUDIO_NORMALIZE_TIMEOUT: float = 30.0
+    
+    # TTS audio cache
+    TTS_CACHE_DIR: str = "./tts_cache"
+    TTS_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 0 disables the disk tier
+    TTS_CACHE_MAX_ENTRIES: int = 4096
+    TTS_URL_MISS_TTL: float = 30.0  # questions not in storage skip the HEAD request this long
+    QUESTION_AUDIO_JOB_DELAY: float = 15.0  # the durable render only runs if the live one has not stored audio by then
+    QUESTION_AUDIO_FAILED_TTL: float = 60.0  # failed live renders stay registered for pollers this long
+    
+    # Authenticated user cache
+    USER_CACHE_BACKENDS: str = "memory"  # comma separated; add "redis" to share across workers
+    USER_CACHE_TTL: int = 60  # memory tier; bounds staleness on other workers without redis
+    USER_CACHE_SHARED_TTL: int = 3600
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    REDIS_URL: Optional[str] = None
+    
+    # Interviews
+    INTERVIEW_MAX_TURNS: int = 5
+    INTERVIEW_CONTEXT_RECENT_TURNS: int = 3  # latest turns sent verbatim; older ones are summarized
+    INTERVIEW_CONTEXT_TOKEN_BUDGET: int = 1500  # cap on summary plus recent turns in a question prompt
+    INTERVIEW_SUMMARY_MAX_TOKENS: int = 300
+    INTERVIEW_FEEDBACK_MAX_TOKENS: int = 600
+    TURN_FEEDBACK_MAX_TOKENS: int = 400  # per turn in a batched feedback call
+    TURN_FEEDBACK_BATCH_SIZE: int = 8  # answers from any sessions graded in one call
+    TURN_FEEDBACK_BATCH_DELAY: float = 2.0  # how long an answer waits for others to join its batch
+    
+    # Background jobs
+    JOB_WORKER_IN_PROCESS: bool = True
+    JOB_WORKER_CONCURRENCY: int = 8  # jobs mostly wait on OpenAI, which rate_limiter already governs
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: float = 2.0
+    JOB_RETRY_MAX_DELAY: float = 300.0
+    JOB_LOCK_TIMEOUT: int = 600
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
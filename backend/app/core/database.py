@@ -1,33 +1,111 @@
 """
 Database Configuration
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import registry, Gauge, instrument_engine
+
+ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def get_async_url(url: str) -> str:
+    """
+    Rewrite a plain DATABASE_URL to use an async driver
+    """
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+DATABASE_URL = get_async_url(settings.DATABASE_URL)
 
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+engine_options = {"pool_pre_ping": True}
+if not DATABASE_URL.startswith("sqlite"):
+    engine_options.update(pool_size=10, max_overflow=20)
+
+engine = create_async_engine(DATABASE_URL, **engine_options)
+
+
+class PoolMetrics:
+    """Connection pool occupancy, fed by pool checkout/checkin events"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._hold_times = deque(maxlen=window)
+        self.in_use = 0
+        self.peak = 0
+        self.checkouts = 0
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.peak = max(self.peak, self.in_use)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        with self._lock:
+            self.in_use -= 1
+            self._hold_times.append((time.perf_counter() - started) * 1000)
+
+    def reset(self):
+        with self._lock:
+            self._hold_times.clear()
+            self.peak = self.in_use
+            self.checkouts = 0
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            hold_times = sorted(self._hold_times)
+            stats = {"in_use": self.in_use, "peak": self.peak, "checkouts": self.checkouts}
+
+        def pick(p):
+            return round(hold_times[min(len(hold_times) - 1, int(p * len(hold_times)))], 1) if hold_times else 0
+
+        stats.update(hold_ms_p50=pick(0.50), hold_ms_p95=pick(0.95), hold_ms_max=pick(1.0))
+        return stats
+
+
+# Track how long requests keep connections checked out
+pool_metrics = PoolMetrics()
+event.listen(engine.sync_engine, "checkout", pool_metrics.on_checkout)
+event.listen(engine.sync_engine, "checkin", pool_metrics.on_checkin)
+registry.register(Gauge(
+    "db_pool_connections_in_use", "Pooled connections checked out", (), lambda: {(): pool_metrics.in_use}
+))
+
+# Time every statement for /metrics and the Server-Timing header
+instrument_engine(engine)
+
+# Session factory; objects stay usable after commit without a lazy refresh
+SessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
     Database dependency for FastAPI
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
@@ -0,0 +1,351 @@
+"""
+Latency Metrics
+
+Spans time routes, external calls (OpenAI, S3) and database queries. Every
+span feeds a Prometheus histogram served at /metrics, and while a request
+is in flight its spans are also summed into that request's Server-Timing
+header. External call spans are logged as key=value lines, with token
+counts for LLM calls so cost can be read next to latency.
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """Prometheus histogram with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labels + ("le",), key + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labels + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    """Prometheus counter"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labels, key)} {value}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Gauge:
+    """Prometheus gauge read from a callback when scraped"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple, collect):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.collect = collect  # returns {label values tuple: value}
+
+    def samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {value}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Registry:
+    """Metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Time until response headers, by route template",
+    ("method", "route", "status")
+))
+EXTERNAL_CALL_DURATION = registry.register(Histogram(
+    "external_call_duration_seconds", "OpenAI and storage call latency",
+    ("service", "operation", "outcome")
+))
+DB_QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency by statement type",
+    ("statement",)
+))
+LLM_TOKENS = registry.register(Counter(
+    "openai_tokens_total", "Tokens reported by OpenAI responses",
+    ("model", "operation", "type")
+))
+
+
+class RequestTimings:
+    """Span durations summed by name for one request's Server-Timing header"""
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name: str, ms: float):
+        self.durations[name] = self.durations.get(name, 0.0) + ms
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'{name};dur={ms:.1f};desc="{self.counts[name]}x"' if self.counts[name] > 1 else f"{name};dur={ms:.1f}"
+            for name, ms in self.durations.items()
+        )
+
+
+class Span:
+    """One timed external call; annotate() attaches attributes for its log line"""
+
+    def __init__(self, service: str, operation: str):
+        self.service = service
+        self.operation = operation
+        self.attrs = {}
+
+
+# Mutable per-request collector, shared by tasks spawned while handling it
+request_timings = contextvars.ContextVar("request_timings", default=None)
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _finish_span(span: Span, elapsed: float, outcome: str):
+    EXTERNAL_CALL_DURATION.observe(elapsed, service=span.service, operation=span.operation, outcome=outcome)
+
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(f"{span.service}.{span.operation}", elapsed * 1000)
+
+    attrs = " ".join(f"{key}={value}" for key, value in span.attrs.items())
+    logger.info(
+        "span service=%s operation=%s outcome=%s duration_ms=%.1f %s",
+        span.service, span.operation, outcome, elapsed * 1000, attrs
+    )
+
+
+@contextmanager
+def span(service: str, operation: str):
+    """
+    Time the enclosed block as an external call
+    """
+    current = Span(service, operation)
+    token = current_span.set(current)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield current
+        outcome = "ok"
+    finally:
+        current_span.reset(token)
+        _finish_span(current, time.perf_counter() - start, outcome)
+
+
+def annotate(**attrs):
+    """
+    Attach attributes to the external call span in progress, if any
+    """
+    current = current_span.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def record_tokens(model: str, prompt_tokens: int, completion_tokens: int):
+    """
+    Count an LLM call's tokens against the span in progress
+    """
+    current = current_span.get()
+    operation = current.operation if current is not None else "unknown"
+    LLM_TOKENS.inc(prompt_tokens, model=model, operation=operation, type="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, operation=operation, type="completion")
+    annotate(model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+def instrumented(service: str, operation: str = None):
+    """
+    Decorate an async function or async generator to run inside a span
+
+    Generators are timed until they are exhausted or closed.
+    """
+    def decorator(func):
+        name = operation or func.__name__
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def generator_wrapper(*args, **kwargs):
+                # Consumers may resume the generator from another context, so
+                # the span is not bound to current_span here
+                current = Span(service, name)
+                start = time.perf_counter()
+                outcome = "error"
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    outcome = "ok"
+                finally:
+                    _finish_span(current, time.perf_counter() - start, outcome)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(service, name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERY_DURATION.observe(elapsed, statement=statement.lstrip().split(None, 1)[0].upper() if statement else "")
+
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add("db", elapsed * 1000)
+
+
+def instrument_engine(engine):
+    """
+    Time every statement an engine executes
+    """
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request, to keep label cardinality bounded
+    """
+    app = scope.get("app")
+    for route in getattr(app, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+class TimingMiddleware:
+    """ASGI middleware recording route latency and the Server-Timing header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+        elapsed = None
+
+        async def send_with_timing(message):
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Streaming responses keep going; their latency is time to first byte
+                elapsed = time.perf_counter() - start
+                timings.add("total", elapsed * 1000)
+                headers = MutableHeaders(scope=message)
+                existing = headers.get("server-timing")
+                value = timings.server_timing()
+                headers["server-timing"] = f"{existing}, {value}" if existing else value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            HTTP_REQUEST_DURATION.observe(
+                elapsed if elapsed is not None else time.perf_counter() - start,
+                method=scope["method"],
+                route=route_template(scope),
+                status=str(status)
+            )
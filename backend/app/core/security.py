@@ -1,14 +1,33 @@
 """
 Security utilities for authentication
 """
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional, Tuple
 from passlib.context import CryptContext
 from .config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; hashes at any other cost are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a small thread pool keeps it off the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash"
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -21,43 +40,191 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the password hashing pool
+    Returns: (valid, new hash if the stored one uses an outdated cost)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+class HMACSigner:
+    """Shared-secret signatures; the keyed hash state is built once and copied per token"""
+
+    DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, algorithm: str, secret: str):
+        self._mac = hmac.new(secret.encode(), digestmod=self.DIGESTS[algorithm])
+
+    def sign(self, message: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(message)
+        return mac.digest()
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(message), signature)
+
+
+class AsymmetricSigner:
+    """
+    RS256 and EdDSA (Ed25519) signatures with keys loaded once
+
+    A process given only the public key can verify tokens but not issue them.
+    """
+
+    def __init__(self, algorithm: str, private_pem: Optional[bytes], public_pem: Optional[bytes]):
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        self._invalid = InvalidSignature
+        if algorithm == "RS256":
+            self._args = (padding.PKCS1v15(), hashes.SHA256())
+        else:
+            self._args = ()
+
+        self._private_key = serialization.load_pem_private_key(private_pem, password=None) if private_pem else None
+        if public_pem:
+            self._public_key = serialization.load_pem_public_key(public_pem)
+        elif self._private_key is not None:
+            self._public_key = self._private_key.public_key()
+        else:
+            raise Exception(f"JWT_PUBLIC_KEY or JWT_PRIVATE_KEY is required for {algorithm}")
+
+    def sign(self, message: bytes) -> bytes:
+        if self._private_key is None:
+            raise Exception("JWT_PRIVATE_KEY is required to issue tokens")
+        return self._private_key.sign(message, *self._args)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            self._public_key.verify(signature, message, *self._args)
+            return True
+        except self._invalid:
+            return False
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _json_segment(value: dict) -> str:
+    return _b64encode(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+
+class TokenCodec:
+    """
+    JWT encoding and verification with the header and key material prepared once
+
+    Only the configured algorithm is accepted. Tokens must carry exp; nbf,
+    iss and the token type are checked when present or expected.
+    """
+
+    def __init__(self, algorithm: str, signer, issuer: Optional[str] = None, leeway: float = 0):
+        self.algorithm = algorithm
+        self.signer = signer
+        self.issuer = issuer
+        self.leeway = leeway
+        self._header = _json_segment({"alg": algorithm, "typ": "JWT"})
+
+    def encode(self, claims: dict) -> str:
+        if self.issuer:
+            claims = {**claims, "iss": self.issuer}
+        signing_input = f"{self._header}.{_json_segment(claims)}"
+        return f"{signing_input}.{_b64encode(self.signer.sign(signing_input.encode('ascii')))}"
+
+    def decode(self, token: str, token_type: Optional[str] = None) -> Optional[dict]:
+        try:
+            signing_input, signature = token.rsplit(".", 1)
+            header, payload = signing_input.split(".")
+            # Tokens this codec issued share its header byte for byte
+            if header != self._header and json.loads(_b64decode(header)).get("alg") != self.algorithm:
+                return None
+            if not self.signer.verify(signing_input.encode("ascii"), _b64decode(signature)):
+                return None
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, TypeError, AttributeError, binascii.Error):
+            return None
+
+        if not isinstance(claims, dict):
+            return None
+        now = time.time()
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or now > exp + self.leeway:
+            return None
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or now < nbf - self.leeway):
+            return None
+        if self.issuer and claims.get("iss") != self.issuer:
+            return None
+        if token_type and claims.get("type") != token_type:
+            return None
+        return claims
+
+
+def _read_key(value: Optional[str]) -> Optional[bytes]:
+    """
+    PEM text (newlines may be escaped as \\n) or a path to a PEM file
+    """
+    if not value:
+        return None
+    if "-----BEGIN" in value:
+        return value.replace("\\n", "\n").encode()
+    with open(value, "rb") as f:
+        return f.read()
+
+
+def get_token_codec() -> TokenCodec:
+    """
+    Build the codec for ALGORITHM: HS* sign with SECRET_KEY, RS256 and EdDSA with JWT_PRIVATE_KEY
+    """
+    algorithm = settings.ALGORITHM
+    if algorithm in HMACSigner.DIGESTS:
+        signer = HMACSigner(algorithm, settings.SECRET_KEY)
+    elif algorithm in ("RS256", "EdDSA"):
+        signer = AsymmetricSigner(algorithm, _read_key(settings.JWT_PRIVATE_KEY), _read_key(settings.JWT_PUBLIC_KEY))
+    else:
+        raise Exception(f"Unsupported JWT algorithm: {algorithm}")
+    return TokenCodec(algorithm, signer, issuer=settings.JWT_ISSUER, leeway=settings.JWT_LEEWAY_SECONDS)
+
+
+token_codec = get_token_codec()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    return encoded_jwt
+    return token_codec.encode({**data, "exp": int(time.time() + expires_delta.total_seconds()), "type": "access"})
 
 
 def create_refresh_token(data: dict) -> str:
     """
     Create JWT refresh token
     """
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    
-    return encoded_jwt
+    return token_codec.encode({**data, "exp": int(time.time() + expires_delta.total_seconds()), "type": "refresh"})
 
 
-def decode_token(token: str) -> Optional[dict]:
+def decode_token(token: str, token_type: Optional[str] = None) -> Optional[dict]:
     """
-    Decode and verify JWT token
+    Decode and verify JWT token, optionally requiring its type claim
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
-        return None
-
+    return token_codec.decode(token, token_type)
@@ -0,0 +1,76 @@
+"""
+Unit of Work
+
+Request handlers that wait on OpenAI, TTS or storage split their database
+work into short transactions around those calls, so no pooled connection
+is held while waiting. Rows read in an earlier transaction may have changed
+by the time the next one starts; handlers re-validate them with reload(),
+and version columns turn lost updates into ConcurrentUpdateError.
+"""
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from .database import get_db
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a row changed between a handler's transactions"""
+
+
+class UnitOfWork:
+    """Short transactions on a request's session"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def release(self):
+        """
+        End the open transaction so its connection returns to the pool
+        """
+        if self.db.in_transaction():
+            # Commit rather than roll back: rollback would expire loaded objects
+            await self.db.commit()
+
+    async def outside(self, awaitable):
+        """
+        Await a slow external call without holding a connection
+        """
+        await self.release()
+        return await awaitable
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run a block as one transaction, committing on exit
+        """
+        await self.release()
+        try:
+            yield self.db
+            await self.db.commit()
+
+        except StaleDataError as e:
+            await self.db.rollback()
+            raise ConcurrentUpdateError(str(e))
+
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def reload(self, instance, *options) -> Optional[object]:
+        """
+        Re-read an instance loaded by an earlier transaction; None if it was deleted
+
+        Loader options refresh related instances in the same query.
+        """
+        mapper = instance.__mapper__
+        identity = mapper.primary_key_from_instance(instance)
+        return await self.db.get(type(instance), identity, options=options, populate_existing=True)
+
+
+async def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    """
+    Unit of work dependency sharing the request's session
+    """
+    return UnitOfWork(db)
@@ -1,10 +1,24 @@
 """
 FastAPI Main Application
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.staticfiles import StaticFiles
+from openai import RateLimitError
 from app.core.config import settings
+from app.core.database import engine, pool_metrics
+from app.core.metrics import TimingMiddleware, registry
+from app.core.unit_of_work import ConcurrentUpdateError
 from app.api.routes import auth, users, job_postings, cover_letters, interviews
+from app.services import storage_service, LocalStorageService
+from app.services.openai_service import close_client as close_openai_client
+from app.services.job_queue import JobWorker
+from app.services.user_cache import user_cache
+from app.services.refresh_tokens import refresh_store
+from app.services.rate_limiter import rate_limiter, retry_after_seconds
+from app.services import pdf_service, audio_normalize
+from app.services import interview_feedback, answer_uploads, question_audio  # noqa: F401  registers job handlers
 
 # Create FastAPI app
 app = FastAPI(
@@ -24,6 +38,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Route latency histogram and Server-Timing header
+app.add_middleware(TimingMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_PREFIX)
 app.include_router(users.router, prefix=settings.API_PREFIX)
@@ -31,6 +48,56 @@ app.include_router(job_postings.router, prefix=settings.API_PREFIX)
 app.include_router(cover_letters.router, prefix=settings.API_PREFIX)
 app.include_router(interviews.router, prefix=settings.API_PREFIX)
 
+# Serve files written by the local storage backend
+if isinstance(storage_service, LocalStorageService):
+    app.mount("/storage", StaticFiles(directory=storage_service.root), name="storage")
+
+
+job_worker = JobWorker()
+
+
+@app.exception_handler(ConcurrentUpdateError)
+async def concurrent_update_handler(request: Request, exc: ConcurrentUpdateError):
+    """The row changed between the request's transactions; the client should retry"""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Resource was modified concurrently, please retry"}
+    )
+
+
+@app.exception_handler(RateLimitError)
+async def openai_rate_limit_handler(request: Request, exc: RateLimitError):
+    """OpenAI stayed over its limit through every retry; the client should back off"""
+    retry_after = retry_after_seconds(exc) or settings.OPENAI_RETRY_MAX_DELAY
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "AI service is busy, please retry shortly"},
+        headers={"Retry-After": str(int(retry_after))}
+    )
+
+
+@app.on_event("startup")
+async def startup():
+    """Start the in-process background job worker, cache invalidation and revocation listeners"""
+    await user_cache.start()
+    await refresh_store.start()
+    if settings.JOB_WORKER_IN_PROCESS:
+        await job_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background work and release shared client connection pools"""
+    if settings.JOB_WORKER_IN_PROCESS:
+        await job_worker.stop()
+    await close_openai_client()
+    await user_cache.stop()
+    await refresh_store.stop()
+    storage_service.shutdown()
+    pdf_service.shutdown()
+    audio_normalize.shutdown()
+    await engine.dispose()
+
 
 @app.get("/")
 async def root():
@@ -45,7 +112,13 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "db_pool": pool_metrics.as_dict(), "openai": rate_limiter.as_dict()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
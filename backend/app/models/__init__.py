@@ -5,6 +5,11 @@ from .user import User
 from .job_posting import JobPosting
 from .cover_letter import CoverLetter
 from .interview import InterviewSession, InterviewTurn
+from .job import Job
+from .analysis_cache import AnalysisCacheEntry
+from .rate_limit import RateLimitBucket
+from .refresh_session import RefreshSession
+from .answer_upload import AnswerUpload
 
 __all__ = [
     "User",
@@ -12,5 +17,10 @@ __all__ = [
     "CoverLetter",
     "InterviewSession",
     "InterviewTurn",
+    "Job",
+    "AnalysisCacheEntry",
+    "RateLimitBucket",
+    "RefreshSession",
+    "AnswerUpload",
 ]
 
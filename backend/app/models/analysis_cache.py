@@ -0,0 +1,16 @@
+"""
+Job Posting Analysis Cache Model
+"""
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+    
+    cache_key = Column(String(64), primary_key=True)  # sha256 of prompt version + normalized text
+    prompt_version = Column(String(20), nullable=False)
+    result = Column(JSON, nullable=False)  # {"keywords": [...], "requirements": [...]}
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
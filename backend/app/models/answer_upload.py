@@ -0,0 +1,27 @@
+"""
+Answer Upload Model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AnswerUpload(Base):
+    """Upload of one answer recording, sent in chunks or straight to storage"""
+
+    __tablename__ = "answer_uploads"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    turn_number = Column(Integer, nullable=False)
+    file_key = Column(String(500), nullable=False)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False)  # declared up front by the client; an upper bound for presigned POSTs
+    offset = Column(Integer, nullable=False, default=0)  # bytes received and stored
+    storage_upload_id = Column(String(1024), nullable=True)  # multipart upload in the storage backend; None for direct uploads
+    parts = Column(JSON, nullable=False, default=list)  # [[part number, ETag], ...]
+    tail_size = Column(Integer, nullable=False, default=0)  # bytes held in the tail object, short of a part
+    status = Column(String(20), nullable=False, default="uploading")  # uploading or presigned, stored, committed, aborted
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,7 @@
 """
 Cover Letter Model
 """
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -11,15 +11,24 @@ class CoverLetter(Base):
     __tablename__ = "cover_letters"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     job_posting_id = Column(Integer, ForeignKey("job_postings.id", ondelete="SET NULL"))
     content = Column(Text, nullable=False)
     ai_feedback = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, server_default="1")
     
     # Relationships
     user = relationship("User", back_populates="cover_letters")
     job_posting = relationship("JobPosting", back_populates="cover_letters")
     interview_sessions = relationship("InterviewSession", back_populates="cover_letter")
+    
+    # Backs per-user lists paged newest first
+    __table_args__ = (
+        Index("ix_cover_letters_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    # Optimistic concurrency: updates fail if the row changed since it was read
+    __mapper_args__ = {"version_id_col": version}
 
@@ -1,7 +1,7 @@
 """
 Interview Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -11,17 +11,35 @@ class InterviewSession(Base):
     __tablename__ = "interview_sessions"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     cover_letter_id = Column(Integer, ForeignKey("cover_letters.id", ondelete="CASCADE"), nullable=False)
     total_feedback = Column(Text)
     status = Column(String(20), default="in_progress")  # in_progress, completed
+    feedback_status = Column(String(20))  # feedback_pending, feedback_ready, feedback_failed
+    max_turns = Column(Integer, nullable=False, server_default="5")
+    context_summary = Column(Text)  # running summary of turns older than the verbatim window
+    context_summary_turns = Column(Integer, nullable=False, server_default="0")  # turns folded into it
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
+    version = Column(Integer, nullable=False, server_default="1")
     
     # Relationships
     user = relationship("User", back_populates="interview_sessions")
     cover_letter = relationship("CoverLetter", back_populates="interview_sessions")
-    turns = relationship("InterviewTurn", back_populates="session", cascade="all, delete-orphan")
+    turns = relationship(
+        "InterviewTurn",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="InterviewTurn.turn_number"
+    )
+    
+    # Backs per-user history paged newest first
+    __table_args__ = (
+        Index("ix_interview_sessions_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    # Optimistic concurrency: updates fail if the row changed since it was read
+    __mapper_args__ = {"version_id_col": version}
 
 
 class InterviewTurn(Base):
@@ -32,11 +50,14 @@ class InterviewTurn(Base):
     turn_number = Column(Integer, nullable=False)
     question_text = Column(Text, nullable=False)
     question_audio_url = Column(String(512))
+    question_audio_status = Column(String(20))  # failed once the durable render has used up its retries
     answer_audio_url = Column(String(512))
     answer_stt_text = Column(Text)
     turn_feedback = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    version = Column(Integer, nullable=False, server_default="1")
     
     # Relationships
     session = relationship("InterviewSession", back_populates="turns")
-
+    
+    __mapper_args__ = {"version_id_col": version}
@@ -1,7 +1,7 @@
 """
 Job Posting Model
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -11,7 +11,7 @@ class JobPosting(Base):
     __tablename__ = "job_postings"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255))
     original_text = Column(Text, nullable=False)
     ai_analysis = Column(JSON)  # {"keywords": [...], "requirements": [...]}
@@ -20,4 +20,8 @@ class JobPosting(Base):
     # Relationships
     user = relationship("User", back_populates="job_postings")
     cover_letters = relationship("CoverLetter", back_populates="job_posting")
-
+    
+    # Backs per-user lists paged newest first
+    __table_args__ = (
+        Index("ix_job_postings_user_id_created_at", "user_id", "created_at"),
+    )
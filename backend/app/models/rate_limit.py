@@ -0,0 +1,13 @@
+"""
+Rate Limit Bucket Model
+"""
+from sqlalchemy import Column, String, Float
+from app.core.database import Base
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    name = Column(String(100), primary_key=True)  # "<model>:requests" or "<model>:tokens"
+    level = Column(Float, nullable=False)  # budget left as of updated_at
+    updated_at = Column(Float, nullable=False)  # unix time; ahead of now while throttled after a 429
@@ -0,0 +1,21 @@
+"""
+Refresh Session Model
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class RefreshSession(Base):
+    """One login; each refresh rotates current_jti in place instead of adding a row"""
+
+    __tablename__ = "refresh_sessions"
+
+    id = Column(String(32), primary_key=True)  # "sid" claim of every token in the rotation chain
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    current_jti = Column(String(32), nullable=False)  # the only refresh token that may rotate
+    previous_jti = Column(String(32))  # replaced by the last rotation; resent briefly by retrying clients
+    rotated_at = Column(Float)  # unix time
+    expires_at = Column(Float, nullable=False, index=True)  # unix time; compacted after this
+    revoked_at = Column(Float, index=True)  # unix time; set on logout or refresh token reuse
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -18,6 +18,8 @@ class User(Base):
     gender = Column(String(10))
     career_summary = Column(Text)
     certifications = Column(Text)
+    # Bumped on profile edits; access tokens carry the version they were issued at
+    profile_version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -13,6 +13,7 @@ from .job_posting import (
     JobPostingBase,
     JobPostingCreate,
     JobPostingResponse,
+    JobPostingSummary,
     AIAnalysis,
 )
 from .cover_letter import (
@@ -20,14 +21,21 @@ from .cover_letter import (
     CoverLetterCreate,
     CoverLetterUpdate,
     CoverLetterResponse,
+    CoverLetterSummary,
 )
 from .interview import (
     InterviewSessionCreate,
     InterviewSessionResponse,
+    InterviewSessionSummary,
     InterviewTurnCreate,
     InterviewTurnResponse,
     InterviewResultResponse,
+    AnswerUploadCreate,
+    AnswerUploadResponse,
+    DirectAnswerUploadCreate,
+    DirectAnswerUploadResponse,
 )
+from .pagination import Page
 
 __all__ = [
     # User
@@ -41,17 +49,26 @@ __all__ = [
     "JobPostingBase",
     "JobPostingCreate",
     "JobPostingResponse",
+    "JobPostingSummary",
     "AIAnalysis",
     # Cover Letter
     "CoverLetterBase",
     "CoverLetterCreate",
     "CoverLetterUpdate",
     "CoverLetterResponse",
+    "CoverLetterSummary",
     # Interview
     "InterviewSessionCreate",
     "InterviewSessionResponse",
+    "InterviewSessionSummary",
     "InterviewTurnCreate",
     "InterviewTurnResponse",
     "InterviewResultResponse",
+    "AnswerUploadCreate",
+    "AnswerUploadResponse",
+    "DirectAnswerUploadCreate",
+    "DirectAnswerUploadResponse",
+    # Pagination
+    "Page",
 ]
 
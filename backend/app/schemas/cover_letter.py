@@ -21,6 +21,17 @@ class CoverLetterUpdate(BaseModel):
     content: Optional[str] = None
 
 
+class CoverLetterSummary(BaseModel):
+    """Cover letter list item with a short preview instead of the full text"""
+    id: int
+    user_id: int
+    job_posting_id: Optional[int] = None
+    preview: str
+    has_feedback: bool
+    created_at: datetime
+    updated_at: datetime
+
+
 class CoverLetterResponse(CoverLetterBase):
     """Cover letter response schema"""
     id: int
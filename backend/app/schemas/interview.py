@@ -1,8 +1,8 @@
 """
 Interview Schemas
 """
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Literal
 from datetime import datetime
 
 
@@ -31,6 +31,42 @@ class InterviewTurnResponse(InterviewTurnBase):
         from_attributes = True
 
 
+class AnswerUploadCreate(BaseModel):
+    """Resumable answer upload creation schema"""
+    turn_number: int
+    size: int = Field(..., gt=0)  # total bytes of the recording
+    filename: str
+    content_type: str = "application/octet-stream"
+
+
+class AnswerUploadResponse(BaseModel):
+    """Resumable answer upload state; the next chunk starts at offset"""
+    upload_id: str
+    turn_number: int
+    size: int
+    offset: int
+    chunk_size: int  # most bytes accepted per chunk
+    status: str
+
+
+class DirectAnswerUploadCreate(AnswerUploadCreate):
+    """Direct-to-storage answer upload creation schema"""
+    method: Literal["post", "put"] = "post"  # a POST may send up to size bytes, a PUT exactly size
+
+
+class DirectAnswerUploadResponse(BaseModel):
+    """Presigned request to send the recording with, then commit the upload"""
+    upload_id: str
+    turn_number: int
+    size: int
+    status: str
+    method: str  # POST: multipart/form-data with fields, file last; PUT: raw body with headers
+    url: str
+    fields: Dict[str, str] = {}
+    headers: Dict[str, str] = {}
+    expires_in: int
+
+
 class InterviewSessionCreate(BaseModel):
     """Interview session creation schema"""
     cover_letter_id: int
@@ -42,6 +78,8 @@ class InterviewSessionResponse(BaseModel):
     user_id: int
     cover_letter_id: int
     status: str
+    feedback_status: Optional[str] = None
+    max_turns: int
     total_feedback: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
@@ -50,6 +88,18 @@ class InterviewSessionResponse(BaseModel):
         from_attributes = True
 
 
+class InterviewSessionSummary(BaseModel):
+    """Interview history item without the feedback text"""
+    id: int
+    user_id: int
+    cover_letter_id: int
+    status: str
+    feedback_status: Optional[str] = None
+    max_turns: int
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
 class InterviewResultResponse(InterviewSessionResponse):
     """Interview result with turns"""
     turns: List[InterviewTurnResponse]
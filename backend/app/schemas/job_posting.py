@@ -22,6 +22,14 @@ class JobPostingCreate(JobPostingBase):
     original_text: str
 
 
+class JobPostingSummary(JobPostingBase):
+    """Job posting list item without the posting text"""
+    id: int
+    user_id: int
+    ai_analysis: Optional[AIAnalysis] = None
+    created_at: datetime
+
+
 class JobPostingResponse(JobPostingBase):
     """Job posting response schema"""
     id: int
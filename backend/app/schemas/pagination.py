@@ -0,0 +1,13 @@
+"""
+Pagination Schemas
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a cursor paginated list"""
+    items: List[T]
+    next_cursor: Optional[str] = None
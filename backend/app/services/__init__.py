@@ -2,7 +2,13 @@
 Business Logic Services
 """
 from .openai_service import OpenAIService
+from .storage_service import StorageService, LocalStorageService, storage_service
 from .s3_service import S3Service
 
-__all__ = ["OpenAIService", "S3Service"]
-
+__all__ = [
+    "OpenAIService",
+    "StorageService",
+    "LocalStorageService",
+    "S3Service",
+    "storage_service",
+]
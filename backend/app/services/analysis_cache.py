@@ -0,0 +1,169 @@
+"""
+Job Posting Analysis Cache
+
+Results are keyed by a hash of the normalized posting text and the prompt
+version, so re-uploads of the same posting skip the LLM entirely. Tiers
+are checked in order and earlier tiers are backfilled on a hit. Hits per
+tier and misses are exported to /metrics.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import AnalysisCacheEntry
+from .cache import TTLCache, CacheStats
+from .openai_service import OpenAIService, ANALYZE_JOB_POSTING_PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize extracted PDF text so trivial differences hash the same
+    """
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def analysis_cache_key(text: str, prompt_version: str = ANALYZE_JOB_POSTING_PROMPT_VERSION) -> str:
+    """
+    Content address for an analysis result
+    """
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode())
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode())
+    return digest.hexdigest()
+
+
+class MemoryAnalysisBackend:
+    """Per-process LRU tier"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            ttl=settings.ANALYSIS_CACHE_TTL
+        )
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict):
+        self._cache.set(key, value)
+
+
+class DatabaseAnalysisBackend:
+    """Tier shared by every worker through the analysis_cache table"""
+
+    name = "database"
+
+    async def get(self, key: str) -> Optional[dict]:
+        async with SessionLocal() as db:
+            now = datetime.utcnow()
+            entry = (await db.execute(
+                select(AnalysisCacheEntry).where(
+                    AnalysisCacheEntry.cache_key == key,
+                    AnalysisCacheEntry.expires_at > now
+                )
+            )).scalars().first()
+            if entry:
+                return entry.result
+
+            # Misses pay for clearing out a batch of expired rows, so the table stays bounded
+            expired = select(AnalysisCacheEntry.cache_key).where(
+                AnalysisCacheEntry.expires_at <= now
+            ).order_by(AnalysisCacheEntry.expires_at).limit(settings.ANALYSIS_CACHE_PURGE_BATCH_SIZE)
+            await db.execute(delete(AnalysisCacheEntry).where(AnalysisCacheEntry.cache_key.in_(expired)))
+            await db.commit()
+            return None
+
+    async def set(self, key: str, value: dict):
+        async with SessionLocal() as db:
+            try:
+                await db.merge(AnalysisCacheEntry(
+                    cache_key=key,
+                    prompt_version=ANALYZE_JOB_POSTING_PROMPT_VERSION,
+                    result=value,
+                    expires_at=datetime.utcnow() + timedelta(seconds=settings.ANALYSIS_CACHE_TTL)
+                ))
+                await db.commit()
+            except IntegrityError:
+                # Another worker stored the same result first
+                await db.rollback()
+
+
+BACKENDS = {
+    MemoryAnalysisBackend.name: MemoryAnalysisBackend,
+    DatabaseAnalysisBackend.name: DatabaseAnalysisBackend,
+}
+
+
+class AnalysisCache:
+    """Tiered cache in front of OpenAIService.analyze_job_posting"""
+
+    def __init__(self, backends: list):
+        self.backends = backends
+        self.stats = CacheStats("analysis")
+        self._inflight = {}
+
+    async def _lookup(self, key: str) -> Optional[dict]:
+        for i, backend in enumerate(self.backends):
+            result = await backend.get(key)
+            if result is not None:
+                self.stats.hit(backend.name)
+                for earlier in self.backends[:i]:
+                    await earlier.set(key, result)
+                return result
+        return None
+
+    async def _analyze(self, key: str, text: str) -> dict:
+        result = await OpenAIService.analyze_job_posting(text)
+        for backend in self.backends:
+            await backend.set(key, result)
+        return result
+
+    async def get_or_analyze(self, text: str) -> dict:
+        """
+        Return the cached analysis for text, calling the LLM only on a miss
+        """
+        key = analysis_cache_key(text)
+
+        result = await self._lookup(key)
+        if result is not None:
+            return result
+
+        # Concurrent uploads of the same posting share one LLM call
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.miss()
+            task = asyncio.ensure_future(self._analyze(key, text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.hit("inflight")
+
+        result = await asyncio.shield(task)
+        logger.debug("Analysis cache stats: %s", self.stats.as_dict())
+        return result
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Build the cache tiers listed in ANALYSIS_CACHE_BACKENDS
+    """
+    names = [name.strip() for name in settings.ANALYSIS_CACHE_BACKENDS.split(",") if name.strip()]
+    return AnalysisCache([BACKENDS[name]() for name in names])
+
+
+# Singleton instance
+analysis_cache = get_analysis_cache()
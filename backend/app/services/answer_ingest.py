@@ -0,0 +1,255 @@
+"""
+Answer Ingest Pipeline
+
+Fans an uploaded answer recording out to storage and Whisper at the same
+time, reading both legs from the one spooled upload buffer. Recordings that
+arrived through a resumable upload are already stored and only transcribed.
+With AUDIO_NORMALIZE on, both legs read the smaller Opus encoding instead,
+and a stored recording is replaced by it once the answer is saved.
+"""
+import asyncio
+import io
+import logging
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from .audio_normalize import NORMALIZED_EXTENSION, normalized_audio
+from .openai_service import OpenAIService
+from .storage_service import storage_service
+
+logger = logging.getLogger(__name__)
+
+# Stored recordings above this are spooled to disk for Whisper, not held in memory
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+class SharedBufferReader(io.RawIOBase):
+    """
+    Independent read cursor over a shared file object
+
+    Several readers can consume the same spooled buffer concurrently,
+    each keeping its own position, without copying the payload.
+    """
+
+    def __init__(self, source, lock: threading.Lock, name: str = None):
+        self._source = source
+        self._lock = lock
+        self._pos = 0
+        self.name = name
+        with lock:
+            source.seek(0, io.SEEK_END)
+            self._size = source.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = self._size + offset
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            self._source.seek(self._pos)
+            data = self._source.read(len(buffer))
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+@dataclass
+class AnswerIngestResult:
+    """Outcome of the storage and transcription legs"""
+    answer_audio_url: str
+    answer_stt_text: str
+    followup: object = None
+    timings: dict = field(default_factory=dict)
+    # Stored recording superseded by its normalized copy; delete once the answer is committed
+    replaced_key: Optional[str] = None
+
+    def server_timing(self) -> str:
+        """
+        Timings formatted for the Server-Timing response header
+        """
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items())
+
+
+async def _timed(coro, timings: dict, name: str):
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
+
+async def _transcribe_then(audio_file, on_transcript, timings: dict):
+    answer_stt_text = await _timed(OpenAIService.transcribe_audio(audio_file), timings, "stt")
+    followup = None
+    if on_transcript:
+        followup = await _timed(on_transcript(answer_stt_text), timings, "followup")
+    return answer_stt_text, followup
+
+
+def _with_extension(file_key: str, extension: str) -> str:
+    stem = file_key.rsplit(".", 1)[0] if "." in file_key.rsplit("/", 1)[-1] else file_key
+    return f"{stem}.{extension}"
+
+
+def _log_normalized(file_key: str, normalized, timings: dict):
+    timings["normalize"] = normalized.duration_ms
+    logger.info(
+        "Normalized answer %s: %d -> %d bytes (%.0f%% smaller) in %.1fms",
+        file_key, normalized.original_bytes, normalized.normalized_bytes,
+        100 * (1 - normalized.normalized_bytes / normalized.original_bytes), normalized.duration_ms
+    )
+
+
+async def _store_and_transcribe(
+    fileobj,
+    filename: str,
+    content_type: str,
+    file_key: str,
+    on_transcript,
+    timings: dict
+):
+    lock = threading.Lock()
+    storage_leg = _timed(
+        storage_service.upload_fileobj(
+            fileobj=SharedBufferReader(fileobj, lock),
+            file_key=file_key,
+            content_type=content_type
+        ),
+        timings,
+        "storage"
+    )
+    stt_leg = _transcribe_then(
+        (filename, SharedBufferReader(fileobj, lock, name=filename), content_type),
+        on_transcript,
+        timings
+    )
+
+    answer_audio_url, (answer_stt_text, followup) = await asyncio.gather(storage_leg, stt_leg)
+    return answer_audio_url, answer_stt_text, followup
+
+
+async def ingest_answer(
+    fileobj,
+    filename: str,
+    content_type: str,
+    file_key: str,
+    on_transcript=None
+) -> AnswerIngestResult:
+    """
+    Upload and transcribe an answer recording concurrently
+
+    on_transcript, if given, is awaited with the transcript as soon as it is
+    ready, overlapping with the rest of the upload. A normalized recording
+    is stored under file_key with the Opus extension.
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    async with normalized_audio(fileobj, filename, content_type) as normalized:
+        if normalized:
+            file_key = _with_extension(file_key, NORMALIZED_EXTENSION)
+            _log_normalized(file_key, normalized, timings)
+            fileobj, filename, content_type = normalized.file, normalized.filename, normalized.content_type
+
+        answer_audio_url, answer_stt_text, followup = await _store_and_transcribe(
+            fileobj, filename, content_type, file_key, on_transcript, timings
+        )
+
+    timings["ingest"] = (time.perf_counter() - start) * 1000
+
+    logger.info(
+        "Answer ingest %s: storage=%.1fms stt=%.1fms wall=%.1fms",
+        file_key, timings["storage"], timings["stt"], timings["ingest"]
+    )
+
+    return AnswerIngestResult(
+        answer_audio_url=answer_audio_url,
+        answer_stt_text=answer_stt_text,
+        followup=followup,
+        timings=timings
+    )
+
+
+async def transcribe_stored_answer(
+    file_key: str,
+    filename: str,
+    content_type: str,
+    on_transcript=None
+) -> AnswerIngestResult:
+    """
+    Transcribe an answer recording already in storage
+
+    The recording is streamed from storage into a spooled temp file, which
+    is what Whisper reads from, so it is never held whole in memory. A
+    normalized recording is uploaded next to the original while Whisper
+    reads it. The original stays in place, named by replaced_key, so the
+    answer can be retried until it is committed; then call
+    discard_replaced_recording.
+    """
+    timings = {}
+    start = time.perf_counter()
+    answer_audio_url = storage_service.get_url(file_key)
+    replaced_key = None
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+        await _timed(storage_service.download_fileobj(file_key, spool), timings, "download")
+        spool.seek(0)
+
+        async with normalized_audio(spool, filename, content_type) as normalized:
+            if normalized:
+                normalized_key = _with_extension(file_key, NORMALIZED_EXTENSION)
+                _log_normalized(normalized_key, normalized, timings)
+                answer_audio_url, answer_stt_text, followup = await _store_and_transcribe(
+                    normalized.file, normalized.filename, normalized.content_type,
+                    normalized_key, on_transcript, timings
+                )
+                if normalized_key != file_key:
+                    replaced_key = file_key
+            else:
+                answer_stt_text, followup = await _transcribe_then(
+                    (filename, spool, content_type), on_transcript, timings
+                )
+
+    timings["ingest"] = (time.perf_counter() - start) * 1000
+
+    logger.info(
+        "Stored answer %s: download=%.1fms stt=%.1fms wall=%.1fms",
+        file_key, timings["download"], timings["stt"], timings["ingest"]
+    )
+
+    return AnswerIngestResult(
+        answer_audio_url=answer_audio_url,
+        answer_stt_text=answer_stt_text,
+        followup=followup,
+        timings=timings,
+        replaced_key=replaced_key
+    )
+
+
+async def discard_replaced_recording(result: AnswerIngestResult):
+    """
+    Delete the original of a normalized recording after its answer was committed
+    """
+    if not result.replaced_key:
+        return
+    try:
+        await storage_service.delete_file(result.replaced_key)
+    except Exception as e:
+        # The answer is saved; an orphaned original only costs storage
+        logger.warning("Failed to delete replaced recording %s: %s", result.replaced_key, e)
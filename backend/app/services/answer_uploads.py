@@ -0,0 +1,297 @@
+"""
+Resumable Answer Uploads
+
+Answer recordings can be sent as a series of chunk PUTs, each starting at
+the byte offset the server reports, so a dropped connection only costs the
+chunk in flight. Chunks go straight into a storage multipart upload. S3
+parts other than the last must be at least 5 MiB, so bytes short of a part
+wait in a tail object and are prepended to the next chunk, the way tus
+servers do it on S3. Offsets and part ETags live in the database, so
+consecutive chunks may reach different workers. Committing joins the parts
+inside storage; the recording is never reassembled in worker memory.
+
+Where storage allows it, the client can instead upload straight to storage
+with a presigned POST or PUT, so no recording bytes pass through a worker.
+The signed request pins the key, content type and size, and storage
+rejects anything else. Committing checks what actually landed before the
+recording is transcribed from storage.
+"""
+import logging
+import tempfile
+import uuid
+from typing import Tuple
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.models import AnswerUpload
+from .storage_service import storage_service
+from .job_queue import enqueue, job_handler
+
+logger = logging.getLogger(__name__)
+
+ANSWER_UPLOAD_EXPIRY_JOB = "answer_upload_expiry"
+
+# Chunks and tails above this spill from memory to a temp file
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+class UploadOffsetError(Exception):
+    """A chunk or commit does not match the bytes the server has stored"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadSizeError(Exception):
+    """A chunk is larger than the chunk size or the declared upload size allows"""
+
+
+class UploadMissingError(Exception):
+    """A direct upload was committed before its recording reached storage"""
+
+
+class UploadPolicyError(Exception):
+    """A directly uploaded recording breaks the size or content type it was signed for"""
+
+
+def _tail_key(upload: AnswerUpload, offset: int) -> str:
+    # Named by the offset it ends at, so a chunk that loses a race never overwrites the live tail
+    return f"{upload.file_key}.tail-{offset}"
+
+
+async def start_upload(
+    uow: UnitOfWork,
+    user_id: int,
+    session_id: int,
+    turn_number: int,
+    size: int,
+    filename: str,
+    content_type: str
+) -> AnswerUpload:
+    """
+    Open a storage multipart upload and record it; unfinished uploads expire after ANSWER_UPLOAD_TTL
+    """
+    file_key = storage_service.generate_file_key(
+        prefix=f"interviews/{session_id}/answers",
+        filename=f"answer_{turn_number}.{filename.split('.')[-1]}"
+    )
+    storage_upload_id = await uow.outside(storage_service.create_multipart_upload(file_key, content_type))
+
+    async with uow.transaction() as db:
+        upload = AnswerUpload(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            session_id=session_id,
+            turn_number=turn_number,
+            file_key=file_key,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            offset=0,
+            storage_upload_id=storage_upload_id,
+            parts=[],
+            tail_size=0,
+            status="uploading"
+        )
+        db.add(upload)
+        enqueue(db, ANSWER_UPLOAD_EXPIRY_JOB, {"upload_id": upload.id}, delay=settings.ANSWER_UPLOAD_TTL)
+
+    return upload
+
+
+async def start_direct_upload(
+    uow: UnitOfWork,
+    user_id: int,
+    session_id: int,
+    turn_number: int,
+    size: int,
+    filename: str,
+    content_type: str,
+    method: str
+) -> Tuple[AnswerUpload, dict]:
+    """
+    Record an upload the client sends straight to storage and sign its request
+
+    A POST may carry up to size bytes; a PUT must carry exactly size bytes.
+    Returns: (upload, {"method", "url", "fields", "headers"}) describing the request to send
+    """
+    file_key = storage_service.generate_file_key(
+        prefix=f"interviews/{session_id}/answers",
+        filename=f"answer_{turn_number}.{filename.split('.')[-1]}"
+    )
+    expiration = settings.ANSWER_UPLOAD_PRESIGN_EXPIRY
+    if method == "put":
+        url = await storage_service.generate_presigned_put(file_key, content_type, size, expiration)
+        request = {
+            "method": "PUT",
+            "url": url,
+            "fields": {},
+            "headers": {"Content-Type": content_type, "Content-Length": str(size)}
+        }
+    else:
+        post = await storage_service.generate_presigned_post(file_key, content_type, size, expiration)
+        request = {"method": "POST", "url": post["url"], "fields": post["fields"], "headers": {}}
+
+    async with uow.transaction() as db:
+        upload = AnswerUpload(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            session_id=session_id,
+            turn_number=turn_number,
+            file_key=file_key,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            offset=0,
+            storage_upload_id=None,
+            parts=[],
+            tail_size=0,
+            status="presigned"
+        )
+        db.add(upload)
+        # Outlive the signed request, so an object stored just before it expires is still cleaned up
+        enqueue(
+            db, ANSWER_UPLOAD_EXPIRY_JOB, {"upload_id": upload.id},
+            delay=max(settings.ANSWER_UPLOAD_TTL, expiration + 60)
+        )
+
+    return upload, request
+
+
+async def append_chunk(uow: UnitOfWork, upload: AnswerUpload, offset: int, chunks) -> AnswerUpload:
+    """
+    Store the bytes of an async iterable as the next chunk, starting at offset
+
+    The chunk is spooled, then stored as a part once a part's worth of
+    bytes is pending or the upload is complete, else as the new tail.
+    """
+    if upload.status != "uploading" or offset != upload.offset:
+        raise UploadOffsetError(upload.offset)
+
+    limit = min(settings.ANSWER_UPLOAD_CHUNK_SIZE, upload.size - offset)
+    await uow.release()
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+        if upload.tail_size:
+            await storage_service.download_fileobj(_tail_key(upload, offset), spool)
+
+        received = 0
+        async for data in chunks:
+            received += len(data)
+            if received > limit:
+                raise UploadSizeError(f"Chunk exceeds {limit} bytes")
+            spool.write(data)
+
+        if not received:
+            return upload
+
+        new_offset = offset + received
+        pending = upload.tail_size + received
+        parts = list(upload.parts)
+        spool.seek(0)
+
+        # Racing chunks for the same offset write the same part number; only
+        # one is recorded, and both carry the same bytes from an honest client
+        if pending >= storage_service.MIN_PART_SIZE or new_offset == upload.size:
+            part_number = len(parts) + 1
+            etag = await storage_service.upload_part(upload.file_key, upload.storage_upload_id, part_number, spool)
+            parts.append([part_number, etag])
+            tail_size = 0
+        else:
+            await storage_service.upload_fileobj(spool, _tail_key(upload, new_offset))
+            tail_size = pending
+
+    previous_tail = _tail_key(upload, offset) if upload.tail_size else None
+    async with uow.transaction() as db:
+        result = await db.execute(
+            update(AnswerUpload).where(
+                AnswerUpload.id == upload.id,
+                AnswerUpload.offset == offset,
+                AnswerUpload.status == "uploading"
+            ).values(offset=new_offset, parts=parts, tail_size=tail_size).execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            current = await uow.reload(upload)
+            raise UploadOffsetError(current.offset if current else offset)
+        upload = await uow.reload(upload)
+
+    if previous_tail:
+        await storage_service.delete_file(previous_tail)
+
+    return upload
+
+
+async def store_upload(uow: UnitOfWork, upload: AnswerUpload) -> str:
+    """
+    Join the parts into the answer file once every byte has arrived, or
+    check a direct upload landed within the limits it was signed for
+    Returns: URL of the answer file
+    """
+    if upload.status == "presigned":
+        stored = await uow.outside(storage_service.stat(upload.file_key))
+        if stored is None:
+            raise UploadMissingError("Recording has not been uploaded yet")
+
+        # Storage enforces the signed policy; this guards backends that do not
+        content_type = stored.content_type.split(";")[0].strip()
+        if stored.size > upload.size or content_type != upload.content_type:
+            await abort_upload(uow, upload)
+            raise UploadPolicyError(
+                f"Stored recording is {stored.size} bytes of {content_type}; "
+                f"signed for up to {upload.size} bytes of {upload.content_type}"
+            )
+
+        async with uow.transaction():
+            upload.offset = upload.size = stored.size
+            upload.status = "stored"
+
+    elif upload.status == "uploading":
+        if upload.offset != upload.size:
+            raise UploadOffsetError(upload.offset)
+
+        await uow.outside(storage_service.complete_multipart_upload(
+            upload.file_key, upload.storage_upload_id, upload.parts
+        ))
+        async with uow.transaction():
+            upload.status = "stored"
+
+    return storage_service.get_url(upload.file_key)
+
+
+async def _discard(upload: AnswerUpload):
+    if upload.storage_upload_id is None:
+        await storage_service.delete_file(upload.file_key)
+        return
+
+    await storage_service.abort_multipart_upload(upload.file_key, upload.storage_upload_id)
+    if upload.tail_size:
+        await storage_service.delete_file(_tail_key(upload, upload.offset))
+
+
+async def abort_upload(uow: UnitOfWork, upload: AnswerUpload):
+    """
+    Give up on an unfinished upload and delete what was stored of it
+    """
+    if upload.status not in ("uploading", "presigned"):
+        return
+
+    async with uow.transaction():
+        upload.status = "aborted"
+    await uow.outside(_discard(upload))
+
+
+@job_handler(ANSWER_UPLOAD_EXPIRY_JOB)
+async def expire_answer_upload(payload: dict, db: AsyncSession):
+    """
+    Abort an upload still unfinished ANSWER_UPLOAD_TTL after it started
+    """
+    upload = await db.get(AnswerUpload, payload["upload_id"])
+    if not upload or upload.status not in ("uploading", "presigned"):
+        return
+
+    upload.status = "aborted"
+    await db.commit()
+    await _discard(upload)
+    logger.info("Expired answer upload %s at %d of %d bytes", upload.id, upload.offset, upload.size)
@@ -0,0 +1,194 @@
+"""
+Answer Audio Normalization
+
+Browsers record answers as stereo 44.1/48 kHz WAV or WebM, far more than
+speech recognition needs. With AUDIO_NORMALIZE on, a recording is
+downmixed to mono AUDIO_SAMPLE_RATE, stripped of leading and trailing
+silence and encoded to Opus at AUDIO_OPUS_BITRATE before it is stored and
+sent to Whisper. Only AUDIO_NORMALIZE_CONTENT_TYPES are normalized, by
+default the uncompressed formats where the saving dwarfs the encoding
+time. ffmpeg does the transcoding; calls to it run in a bounded
+process pool with a timeout, like PDF extraction. Normalization is only an
+optimization, so when ffmpeg is missing, fails, or would not make the file
+smaller, the original recording is used unchanged.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NORMALIZED_EXTENSION = "ogg"
+NORMALIZED_CONTENT_TYPE = "audio/ogg"
+COPY_CHUNK_SIZE = 1024 * 1024
+# Silence kept at each trimmed end, so the first word is not clipped
+SILENCE_PADDING_SECONDS = 0.2
+
+_executor = None
+_ffmpeg_missing_logged = False
+
+
+@dataclass
+class NormalizedAudio:
+    """Opus encoding of a recording, readable until its context exits"""
+    file: object
+    filename: str
+    content_type: str
+    original_bytes: int
+    normalized_bytes: int
+    duration_ms: float
+
+
+def _silence_filter(threshold_db: float) -> str:
+    # silenceremove only trims the start reliably across ffmpeg versions, so trim, reverse, trim, reverse
+    trim = (
+        f"silenceremove=start_periods=1:start_threshold={threshold_db}dB"
+        f":start_silence={SILENCE_PADDING_SECONDS}"
+    )
+    return f"{trim},areverse,{trim},areverse"
+
+
+def transcode_to_opus(
+    ffmpeg: str,
+    source: str,
+    target: str,
+    sample_rate: int,
+    bitrate: int,
+    complexity: int,
+    threshold_db: float,
+    timeout: float
+):
+    """
+    Run ffmpeg on a file; executed in the pool, raises on failure
+    """
+    subprocess.run(
+        [
+            ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", source,
+            "-vn", "-ac", "1", "-ar", str(sample_rate),
+            "-af", _silence_filter(threshold_db),
+            "-c:a", "libopus", "-b:a", str(bitrate),
+            "-compression_level", str(complexity), "-application", "voip",
+            "-f", "ogg", target,
+        ],
+        check=True,
+        capture_output=True,
+        timeout=timeout
+    )
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.AUDIO_NORMALIZE_WORKERS)
+    return _executor
+
+
+def shutdown():
+    """
+    Stop the normalization process pool
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _ffmpeg_path() -> Optional[str]:
+    global _ffmpeg_missing_logged
+    path = shutil.which(settings.AUDIO_FFMPEG_PATH)
+    if path is None and not _ffmpeg_missing_logged:
+        logger.warning("AUDIO_NORMALIZE is on but %s was not found; storing recordings as sent", settings.AUDIO_FFMPEG_PATH)
+        _ffmpeg_missing_logged = True
+    return path
+
+
+def _copy_to_path(fileobj, path: str) -> int:
+    fileobj.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, COPY_CHUNK_SIZE)
+        size = out.tell()
+    fileobj.seek(0)
+    return size
+
+
+async def _transcode(ffmpeg: str, source: str, target: str):
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        await loop.run_in_executor(
+            executor, transcode_to_opus,
+            ffmpeg, source, target,
+            settings.AUDIO_SAMPLE_RATE,
+            settings.AUDIO_OPUS_BITRATE,
+            settings.AUDIO_OPUS_COMPLEXITY,
+            settings.AUDIO_SILENCE_THRESHOLD_DB,
+            settings.AUDIO_NORMALIZE_TIMEOUT
+        )
+    except BrokenProcessPool:
+        # Others that ran on this pool fail too; only the first replaces it
+        if _executor is executor:
+            shutdown()
+        raise
+
+
+@asynccontextmanager
+async def normalized_audio(fileobj, filename: str, content_type: str):
+    """
+    Normalize a recording held in a seekable file object
+
+    Yields a NormalizedAudio whose file stays readable inside the context,
+    or None when normalization is off, not wanted for content_type,
+    unavailable, failed or saved nothing; then use fileobj, which is left rewound.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    wanted = settings.AUDIO_NORMALIZE and media_type in settings.AUDIO_NORMALIZE_CONTENT_TYPES
+    ffmpeg = _ffmpeg_path() if wanted else None
+    if ffmpeg is None:
+        yield None
+        return
+
+    with tempfile.TemporaryDirectory(prefix="answer_audio_") as workdir:
+        source = os.path.join(workdir, "source")
+        target = os.path.join(workdir, f"answer.{NORMALIZED_EXTENSION}")
+        start = time.perf_counter()
+
+        failure = None
+        try:
+            original_bytes = await asyncio.to_thread(_copy_to_path, fileobj, source)
+            await _transcode(ffmpeg, source, target)
+        except (OSError, subprocess.SubprocessError, BrokenProcessPool) as e:
+            failure = e
+
+        if failure is not None:
+            stderr = (getattr(failure, "stderr", None) or b"").decode(errors="replace").strip()
+            logger.warning("Audio normalization of %s failed, using the original: %s", filename, stderr[-500:] or failure)
+            yield None
+            return
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        normalized_bytes = os.path.getsize(target)
+        if not 0 < normalized_bytes < original_bytes:
+            yield None
+            return
+
+        stem = filename.rsplit(".", 1)[0] if "." in filename else filename
+        with open(target, "rb") as normalized:
+            yield NormalizedAudio(
+                file=normalized,
+                filename=f"{stem}.{NORMALIZED_EXTENSION}",
+                content_type=NORMALIZED_CONTENT_TYPE,
+                original_bytes=original_bytes,
+                normalized_bytes=normalized_bytes,
+                duration_ms=duration_ms
+            )
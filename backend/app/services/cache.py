@@ -0,0 +1,84 @@
+"""
+Cache Primitives
+"""
+import threading
+import time
+from collections import OrderedDict
+from app.core.metrics import registry, Counter
+
+CACHE_HITS = registry.register(Counter(
+    "cache_hits_total", "Cache lookups answered, by cache and tier", ("cache", "tier")
+))
+CACHE_MISSES = registry.register(Counter(
+    "cache_misses_total", "Cache lookups that found nothing", ("cache",)
+))
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStats:
+    """Hit and miss counters for a cache, also exported to /metrics when named"""
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self.hits = {}
+        self.misses = 0
+
+    def hit(self, tier: str):
+        self.hits[tier] = self.hits.get(tier, 0) + 1
+        if self.name:
+            CACHE_HITS.inc(cache=self.name, tier=tier)
+
+    def miss(self):
+        self.misses += 1
+        if self.name:
+            CACHE_MISSES.inc(cache=self.name)
+
+    def as_dict(self) -> dict:
+        total_hits = sum(self.hits.values())
+        lookups = total_hits + self.misses
+        return {
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_ratio": total_hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,128 @@
+"""
+Cover Letter Feedback Streaming
+
+Generation runs in a background task that outlives any one HTTP
+connection, so clients can disconnect and resume. Event ids are character
+offsets into the feedback text, which lets a reconnecting client resume
+from either the live buffer or the persisted CoverLetter.ai_feedback.
+"""
+import asyncio
+import json
+import logging
+from app.core.database import SessionLocal
+from app.models import CoverLetter
+from .openai_service import OpenAIService
+
+logger = logging.getLogger(__name__)
+
+# Streams in flight on this worker, keyed by cover letter id
+_streams = {}
+# Strong references so pending tasks are not garbage collected
+_tasks = set()
+
+
+def sse_event(event: str, data: dict, event_id: int = None) -> str:
+    """
+    Format a server-sent event
+    """
+    message = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event_id is not None:
+        message = f"id: {event_id}\n{message}"
+    return message
+
+
+class FeedbackStream:
+    """Feedback text for one cover letter, filled in as tokens arrive"""
+
+    def __init__(self, letter_id: int):
+        self.letter_id = letter_id
+        self.parts = []
+        self.length = 0
+        self.done = False
+        self.failed = False
+        self._changed = asyncio.Condition()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    async def publish(self, delta: str = None, done: bool = False, failed: bool = False):
+        async with self._changed:
+            if delta:
+                self.parts.append(delta)
+                self.length += len(delta)
+            self.done = self.done or done
+            self.failed = self.failed or failed
+            self._changed.notify_all()
+
+    async def events(self, offset: int = 0):
+        """
+        Yield SSE events for text after offset, following the stream until it ends
+        """
+        sent = offset
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.length > sent or self.done)
+                delta = self.text[sent:] if self.length > sent else ""
+                finished = self.done
+                failed = self.failed
+
+            if delta:
+                sent += len(delta)
+                yield sse_event("token", {"delta": delta}, event_id=sent)
+
+            if finished:
+                if failed:
+                    yield sse_event("error", {"detail": "Failed to generate feedback"})
+                else:
+                    yield sse_event("done", {"cover_letter_id": self.letter_id}, event_id=sent)
+                return
+
+
+def get_feedback_stream(letter_id: int):
+    """
+    Stream in flight on this worker, if any
+    """
+    return _streams.get(letter_id)
+
+
+async def _generate(stream: FeedbackStream, user_spec: str, job_analysis: dict, content: str):
+    try:
+        async for delta in OpenAIService.stream_cover_letter_feedback(
+            user_spec=user_spec,
+            job_analysis=job_analysis,
+            cover_letter=content
+        ):
+            await stream.publish(delta)
+
+        # Persist before announcing completion so resumes can fall back to the DB
+        async with SessionLocal() as db:
+            cover_letter = await db.get(CoverLetter, stream.letter_id)
+            if cover_letter:
+                cover_letter.ai_feedback = stream.text
+                await db.commit()
+
+        await stream.publish(done=True)
+
+    except Exception:
+        logger.exception("Failed to stream feedback for cover letter %s", stream.letter_id)
+        await stream.publish(done=True, failed=True)
+
+    finally:
+        _streams.pop(stream.letter_id, None)
+
+
+def start_feedback_stream(letter_id: int, user_spec: str, job_analysis: dict, content: str) -> FeedbackStream:
+    """
+    Start generating feedback in the background, or join the one already running
+    """
+    stream = _streams.get(letter_id)
+    if stream:
+        return stream
+
+    stream = FeedbackStream(letter_id)
+    _streams[letter_id] = stream
+    task = asyncio.create_task(_generate(stream, user_spec, job_analysis, content))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return stream
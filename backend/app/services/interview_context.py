@@ -0,0 +1,101 @@
+"""
+Interview Conversation Context
+
+Follow-up questions are generated from a running summary of the interview
+plus its latest turns verbatim, rather than the whole transcript. As each
+answer arrives the turn leaving the verbatim window is folded into the
+summary, alongside transcription, so question prompts stay about the same
+size however long the interview runs.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from .openai_service import OpenAIService
+from .tokens import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def fit_to_budget(summary: Optional[str], recent_qa: List[dict], budget: int) -> Tuple[Optional[str], List[dict]]:
+    """
+    Trim context to the token budget, dropping the oldest verbatim turns first
+
+    The latest turn is always kept, with its answer cut short if needed.
+    """
+    summary = truncate_to_tokens(summary, budget // 2) if summary else summary
+    remaining = budget - estimate_tokens(summary)
+
+    kept = []
+    for qa in reversed(recent_qa):
+        cost = estimate_tokens(qa["question"]) + estimate_tokens(qa["answer"])
+        if cost > remaining:
+            if not kept:
+                answer_budget = max(remaining - estimate_tokens(qa["question"]), 0)
+                kept.append({**qa, "answer": truncate_to_tokens(qa["answer"], answer_budget)})
+            break
+        kept.append(qa)
+        remaining -= cost
+
+    return summary, list(reversed(kept))
+
+
+class InterviewContext:
+    """
+    Conversation state for the next question of one session
+
+    Built from the session's stored summary and the turns it does not yet
+    cover. start() folds turns that leave the verbatim window into the
+    summary in the background; the new summary is stored with the answer.
+    """
+
+    def __init__(self, summary: Optional[str], summary_turns: int, turns: list, turn_number: int):
+        self.summary = summary
+        self.summary_turns = summary_turns
+        self._qa = [
+            {
+                "turn_number": t.turn_number,
+                "question": t.question_text,
+                "answer": t.answer_stt_text
+            }
+            for t in turns
+            if summary_turns < t.turn_number < turn_number and t.answer_stt_text
+        ]
+        # Once turn_number is answered, turns up to here leave the verbatim window
+        self._fold_through = turn_number - settings.INTERVIEW_CONTEXT_RECENT_TURNS
+        self._fold = None
+
+    @property
+    def changed(self) -> bool:
+        return self._fold is not None and self._fold.done() and self._fold.result()
+
+    def start(self):
+        """
+        Start folding old turns into the summary, to overlap with transcription
+        """
+        pending = [qa for qa in self._qa if qa["turn_number"] <= self._fold_through]
+        if pending:
+            self._fold = asyncio.create_task(self._fold_turns(pending))
+
+    async def _fold_turns(self, pending: List[dict]) -> bool:
+        try:
+            summary = await OpenAIService.summarize_interview(self.summary, pending)
+
+        except Exception as e:
+            # Keep the old summary; the turns stay verbatim until a later answer folds them
+            logger.warning("Failed to summarize interview turns: %s", e)
+            return False
+
+        self.summary = summary
+        self.summary_turns = pending[-1]["turn_number"]
+        return True
+
+    async def for_next_question(self, turn_number: int, question: str, answer: str) -> Tuple[Optional[str], List[dict]]:
+        """
+        Summary and recent turns to prompt the question after turn_number
+        """
+        if self._fold:
+            await self._fold
+        recent_qa = [qa for qa in self._qa if qa["turn_number"] > self.summary_turns]
+        recent_qa.append({"turn_number": turn_number, "question": question, "answer": answer})
+        return fit_to_budget(self.summary, recent_qa, settings.INTERVIEW_CONTEXT_TOKEN_BUDGET)
@@ -0,0 +1,116 @@
+"""
+Interview Feedback Jobs
+
+Each answered turn is graded in the background as soon as it is saved, and
+answers from many sessions are graded together in one batched call. When
+the interview ends, the overall feedback only has to combine the finished
+per-turn feedback, so the wait after the last answer is one short call.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models import InterviewSession, InterviewTurn
+from .openai_service import OpenAIService
+from .job_queue import job_handler
+from .rate_limiter import set_caller
+
+INTERVIEW_FEEDBACK_JOB = "interview_feedback"
+TURN_FEEDBACK_JOB = "turn_feedback"
+
+# A user is waiting on the overall feedback; per-turn grading is ahead of need
+INTERVIEW_FEEDBACK_PRIORITY = 10
+
+
+def _turn_data(turn: InterviewTurn) -> dict:
+    return {
+        "id": turn.id,
+        "turn_number": turn.turn_number,
+        "question": turn.question_text,
+        "answer": turn.answer_stt_text,
+        "feedback": turn.turn_feedback
+    }
+
+
+async def _grade_turns(db: AsyncSession, turns: list) -> dict:
+    """
+    Grade turns in one call and store the feedback on those still without it
+
+    Commits before calling the LLM so no connection is held while it runs.
+    """
+    turns_data = [_turn_data(t) for t in turns]
+    await db.commit()
+
+    feedbacks = await OpenAIService.generate_turn_feedbacks(turns_data)
+
+    for turn in turns:
+        # Graded concurrently by the other job kind; keep the stored feedback
+        await db.refresh(turn)
+        if turn.turn_feedback is None and turn.id in feedbacks:
+            turn.turn_feedback = feedbacks[turn.id]
+
+    await db.commit()
+    return {turn.id: turn.turn_feedback for turn in turns}
+
+
+@job_handler(TURN_FEEDBACK_JOB, batch_size=settings.TURN_FEEDBACK_BATCH_SIZE)
+async def generate_feedback_for_turns(payloads: list, db: AsyncSession):
+    """
+    Grade a batch of answered turns, possibly from different sessions
+    """
+    set_caller("jobs")
+
+    turns = (await db.execute(
+        select(InterviewTurn).where(
+            InterviewTurn.id.in_([payload["turn_id"] for payload in payloads]),
+            InterviewTurn.answer_stt_text.is_not(None),
+            InterviewTurn.turn_feedback.is_(None)
+        ).order_by(InterviewTurn.id)
+    )).scalars().all()
+
+    if turns:
+        await _grade_turns(db, turns)
+
+
+async def mark_feedback_failed(payload: dict, db: AsyncSession, error: Exception):
+    """
+    Record that feedback could not be generated after all retries
+    """
+    session = await db.get(InterviewSession, payload["session_id"])
+    if session:
+        session.feedback_status = "feedback_failed"
+        await db.commit()
+
+
+@job_handler(INTERVIEW_FEEDBACK_JOB, on_failure=mark_feedback_failed)
+async def generate_feedback_for_session(payload: dict, db: AsyncSession):
+    """
+    Combine per-turn feedback into the overall feedback for a completed session
+    """
+    session_id = payload["session_id"]
+    set_caller(payload.get("user_id", "jobs"))
+
+    turns = (await db.execute(
+        select(InterviewTurn).where(
+            InterviewTurn.session_id == session_id
+        ).order_by(InterviewTurn.turn_number)
+    )).scalars().all()
+
+    # Usually just the last answer; also covers turn jobs still queued or failed
+    ungraded = [t for t in turns if t.turn_feedback is None]
+    if ungraded:
+        await _grade_turns(db, ungraded)
+        if any(t.turn_feedback is None for t in turns):
+            raise Exception(f"Feedback missing for turns of interview session {session_id}")
+
+    turns_data = [_turn_data(t) for t in turns]
+
+    # Release the connection while waiting on the LLM
+    await db.commit()
+
+    total_feedback = await OpenAIService.generate_interview_feedback(turns_data)
+
+    session = await db.get(InterviewSession, session_id)
+    session.total_feedback = total_feedback
+    session.feedback_status = "feedback_ready"
+
+    await db.commit()
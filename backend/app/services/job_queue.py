@@ -0,0 +1,286 @@
+"""
+Background Job Queue
+
+Jobs are rows in the jobs table, so the queue works on SQLite or Postgres
+without an external broker. Workers claim due jobs, run the registered
+handler with their own DB session, and reschedule failures with
+exponential backoff until max_attempts is reached. Kinds registered with a
+batch_size are claimed several due jobs at a time and handled together.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.backoff import retry_delay
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> (handler, on_failure, batch_size)
+HANDLERS = {}
+
+_wakeup = None
+
+
+def job_handler(kind: str, on_failure=None, batch_size: int = 1):
+    """
+    Register an async handler(payload, db) for a job kind
+
+    on_failure(payload, db, error) runs once the job has exhausted its retries.
+    With batch_size above 1 the handler is called as handler(payloads, db)
+    with up to batch_size due jobs of the kind, which succeed or fail together.
+    """
+    def decorator(func):
+        HANDLERS[kind] = (func, on_failure, batch_size)
+        return func
+    return decorator
+
+
+def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    max_attempts: int = None,
+    delay: float = 0,
+    priority: int = 0
+) -> Job:
+    """
+    Add a job to the caller's transaction; it becomes visible on commit
+
+    Due jobs with a higher priority are claimed first.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        priority=priority,
+        run_after=datetime.utcnow() + timedelta(seconds=delay)
+    )
+    db.add(job)
+    return job
+
+
+def wake_workers():
+    """
+    Nudge the in-process worker to poll now instead of at its next interval
+    """
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+class JobWorker:
+    """Pool of coroutines that claim and run queued jobs"""
+
+    def __init__(self, concurrency: int = None, poll_interval: float = None):
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._runners = []
+        self._stopping = False
+
+    @staticmethod
+    def _describe(job: Job) -> dict:
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "payload": job.payload,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts
+        }
+
+    async def _claim_batch(self, db: AsyncSession, kind: str, limit: int, now: datetime) -> list:
+        """
+        Claim up to limit more due jobs of kind alongside one already claimed
+        """
+        query = select(Job.id).where(
+            Job.kind == kind, Job.status == "queued", Job.run_after <= now
+        ).order_by(Job.run_after, Job.id).limit(limit)
+
+        if engine.dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+
+        candidates = (await db.execute(query)).scalars().all()
+        if not candidates:
+            return []
+
+        claimed = (await db.execute(
+            update(Job).where(
+                Job.id.in_(candidates),
+                Job.status == "queued"
+            ).values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_by=self.worker_id,
+                locked_at=now
+            ).returning(Job.id).execution_options(synchronize_session=False)
+        )).scalars().all()
+        await db.commit()
+
+        if not claimed:
+            return []
+        return (await db.execute(select(Job).where(Job.id.in_(claimed)).order_by(Job.id))).scalars().all()
+
+    async def _claim(self) -> list:
+        async with SessionLocal() as db:
+            now = datetime.utcnow()
+            stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+            query = select(Job.id).where(or_(
+                and_(Job.status == "queued", Job.run_after <= now),
+                and_(Job.status == "running", Job.locked_at < stale)
+            )).order_by(Job.priority.desc(), Job.run_after, Job.id).limit(1)
+
+            if engine.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+
+            candidate = (await db.execute(query)).scalar()
+            if not candidate:
+                return []
+
+            # Conditional update so two workers can never claim the same job
+            result = await db.execute(
+                update(Job).where(
+                    Job.id == candidate,
+                    or_(Job.status == "queued", and_(Job.status == "running", Job.locked_at < stale))
+                ).values(
+                    status="running",
+                    attempts=Job.attempts + 1,
+                    locked_by=self.worker_id,
+                    locked_at=now
+                ).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            if not result.rowcount:
+                return []
+
+            job = await db.get(Job, candidate)
+            jobs = [job]
+            batch_size = HANDLERS.get(job.kind, (None, None, 1))[2]
+            if batch_size > 1:
+                jobs += await self._claim_batch(db, job.kind, batch_size - 1, now)
+            return [self._describe(j) for j in jobs]
+
+    async def _finish(self, job_id: int, error: Exception = None, attempts: int = 0, max_attempts: int = 0) -> bool:
+        """
+        Record the outcome; returns True if the job has permanently failed
+
+        Only while this claim still holds the job: one that ran past
+        JOB_LOCK_TIMEOUT may have been reclaimed, and then the new owner's
+        outcome is the one that counts.
+        """
+        if error is None:
+            values = {"status": "succeeded", "last_error": None}
+        elif attempts < max_attempts:
+            values = {
+                "status": "queued",
+                "last_error": repr(error),
+                "run_after": datetime.utcnow() + timedelta(
+                    seconds=retry_delay(attempts, settings.JOB_RETRY_BASE_DELAY, settings.JOB_RETRY_MAX_DELAY)
+                )
+            }
+        else:
+            values = {"status": "failed", "last_error": repr(error)}
+
+        async with SessionLocal() as db:
+            # attempts grows with every claim, so it tells this claim from a later one by the same worker
+            result = await db.execute(
+                update(Job).where(
+                    Job.id == job_id,
+                    Job.status == "running",
+                    Job.locked_by == self.worker_id,
+                    Job.attempts == attempts
+                ).values(
+                    locked_by=None,
+                    locked_at=None,
+                    **values
+                ).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        if not result.rowcount:
+            logger.warning("Job %s was reclaimed while attempt %s ran; discarding its outcome", job_id, attempts)
+            return False
+        return values["status"] == "failed"
+
+    async def _run(self, jobs: list):
+        kind = jobs[0]["kind"]
+        handler, on_failure, batch_size = HANDLERS.get(kind, (None, None, 1))
+        error = None
+
+        async with SessionLocal() as db:
+            try:
+                if handler is None:
+                    raise Exception(f"No handler registered for job kind: {kind}")
+                if batch_size > 1:
+                    await handler([job["payload"] for job in jobs], db)
+                else:
+                    await handler(jobs[0]["payload"], db)
+            except Exception as e:
+                await db.rollback()
+                error = e
+                logger.exception(
+                    "Jobs %s (%s) failed on attempt %s",
+                    [job["id"] for job in jobs], kind, [job["attempts"] for job in jobs]
+                )
+
+        for job in jobs:
+            exhausted = await self._finish(job["id"], error, job["attempts"], job["max_attempts"])
+
+            if exhausted and on_failure:
+                async with SessionLocal() as db:
+                    await on_failure(job["payload"], db, error)
+
+    async def _runner(self):
+        while not self._stopping:
+            try:
+                jobs = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim job")
+                jobs = []
+
+            if jobs:
+                try:
+                    await self._run(jobs)
+                except Exception:
+                    # Outcome not recorded; the jobs are reclaimed once their lock goes stale
+                    logger.exception("Failed to finish jobs %s", [job["id"] for job in jobs])
+                continue
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+
+    async def start(self):
+        """
+        Start the runner coroutines on the current event loop
+        """
+        global _wakeup
+        _wakeup = asyncio.Event()
+        self._stopping = False
+        self._runners = [asyncio.create_task(self._runner()) for _ in range(self.concurrency)]
+        logger.info("Job worker %s started with %s runners", self.worker_id, self.concurrency)
+
+    async def stop(self):
+        """
+        Stop polling and wait for jobs in progress to finish
+        """
+        self._stopping = True
+        wake_workers()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners = []
+
+    async def run_forever(self):
+        """
+        Run as a standalone worker process
+        """
+        await self.start()
+        await asyncio.gather(*self._runners)
@@ -1,16 +1,94 @@
 """
 OpenAI Service
 """
-from openai import OpenAI
+import asyncio
+import json
+import httpx
+from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.metrics import instrumented, annotate, record_tokens
+from .rate_limiter import rate_limiter
+from .tokens import estimate_tokens
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# Shared connection pool for every OpenAI call made by this worker
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    ),
+    timeout=httpx.Timeout(settings.OPENAI_CHAT_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+)
+
+client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_BASE_URL,
+    http_client=http_client,
+    max_retries=0,  # rate_limiter retries against the shared budget instead
+)
+
+# Per model family timeouts and concurrency limits
+TIMEOUTS = {
+    "chat": httpx.Timeout(settings.OPENAI_CHAT_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+    "tts": httpx.Timeout(settings.OPENAI_TTS_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+    "stt": httpx.Timeout(settings.OPENAI_STT_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+}
+
+LIMITS = {
+    "chat": asyncio.Semaphore(settings.OPENAI_CHAT_CONCURRENCY),
+    "tts": asyncio.Semaphore(settings.OPENAI_TTS_CONCURRENCY),
+    "stt": asyncio.Semaphore(settings.OPENAI_STT_CONCURRENCY),
+}
+
+CHAT_MODEL = "gpt-4o"
+TTS_MODEL = "tts-1-hd"
+STT_MODEL = "whisper-1"
+TTS_VOICE = "alloy"
+
+# Bump when the analyze_job_posting prompt changes to invalidate cached results
+ANALYZE_JOB_POSTING_PROMPT_VERSION = "1"
+
+
+def chat_tokens(messages: list, max_tokens: int = None) -> int:
+    """
+    Tokens a chat call is charged up front: the prompt plus the expected completion
+    """
+    prompt = sum(estimate_tokens(message["content"]) for message in messages)
+    return prompt + (max_tokens or settings.OPENAI_COMPLETION_TOKEN_ESTIMATE)
+
+
+async def close_client():
+    """
+    Close the shared HTTP connection pool
+    """
+    await client.close()
 
 
 class OpenAIService:
     """Service for OpenAI API integration"""
     
     @staticmethod
+    async def _chat(messages: list, **kwargs):
+        """
+        Governed chat completion; retried on 429s and server errors
+        """
+        async def request():
+            return await client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                timeout=TIMEOUTS["chat"],
+                **kwargs
+            )
+        
+        tokens = chat_tokens(messages, kwargs.get("max_tokens"))
+        response = await rate_limiter.call(CHAT_MODEL, request, tokens=tokens, limit=LIMITS["chat"])
+        
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            record_tokens(CHAT_MODEL, usage.prompt_tokens, usage.completion_tokens)
+        return response
+    
+    @staticmethod
+    @instrumented("openai")
     async def analyze_job_posting(text: str) -> dict:
         """
         Analyze job posting and extract keywords and requirements
@@ -28,8 +106,7 @@ class OpenAIService:
 
 키워드는 주요 기술 스택, 요구사항은 필수 역량이나 경력을 포함해주세요."""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await OpenAIService._chat(
             messages=[
                 {"role": "system", "content": "당신은 채용 공고 분석 전문가입니다."},
                 {"role": "user", "content": prompt}
@@ -38,19 +115,15 @@ class OpenAIService:
             response_format={"type": "json_object"}
         )
         
-        import json
         result = json.loads(response.choices[0].message.content)
         return result
     
     @staticmethod
-    async def generate_cover_letter_feedback(
+    def _cover_letter_feedback_messages(
         user_spec: str,
         job_analysis: dict,
         cover_letter: str
-    ) -> str:
-        """
-        Generate feedback for cover letter
-        """
+    ) -> list:
         prompt = f"""당신은 채용 전문가입니다. 다음 정보를 바탕으로 자기소개서에 대한 피드백을 제공해주세요.
 
 [지원자 스펙]
@@ -69,25 +142,70 @@ class OpenAIService:
 3. 개선점
 4. 구체적인 조언"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "당신은 채용 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
+        return [
+            {"role": "system", "content": "당신은 채용 전문가입니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    @instrumented("openai")
+    async def generate_cover_letter_feedback(
+        user_spec: str,
+        job_analysis: dict,
+        cover_letter: str
+    ) -> str:
+        """
+        Generate feedback for cover letter
+        """
+        response = await OpenAIService._chat(
+            messages=OpenAIService._cover_letter_feedback_messages(user_spec, job_analysis, cover_letter),
             temperature=0.7
         )
         
         return response.choices[0].message.content
     
     @staticmethod
+    @instrumented("openai")
+    async def stream_cover_letter_feedback(
+        user_spec: str,
+        job_analysis: dict,
+        cover_letter: str
+    ):
+        """
+        Stream cover letter feedback tokens as they are generated
+        """
+        messages = OpenAIService._cover_letter_feedback_messages(user_spec, job_analysis, cover_letter)
+        
+        async def request():
+            return await client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=0.7,
+                stream=True,
+                timeout=TIMEOUTS["chat"]
+            )
+        
+        # Hold the concurrency slot for the whole stream, not just its first byte
+        async with LIMITS["chat"]:
+            stream = await rate_limiter.call(CHAT_MODEL, request, tokens=chat_tokens(messages))
+            
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    @staticmethod
+    @instrumented("openai")
     async def generate_interview_question(
         context: str,
         turn_number: int,
-        previous_qa: list = None
+        previous_qa: list = None,
+        summary: str = None,
+        max_turns: int = 5
     ) -> str:
         """
         Generate interview question
+
+        previous_qa holds the most recent turns; earlier ones arrive condensed in summary.
         """
         if turn_number == 1:
             prompt = f"""당신은 {context}입니다.
@@ -95,20 +213,23 @@ class OpenAIService:
 지원자의 첫 번째 면접 질문을 해주세요. 자기소개를 요청하는 것이 좋습니다."""
         else:
             prev_conversation = "\n\n".join([
-                f"Q{i+1}: {qa['question']}\nA{i+1}: {qa['answer']}"
-                for i, qa in enumerate(previous_qa)
+                f"Q{qa['turn_number']}: {qa['question']}\nA{qa['turn_number']}: {qa['answer']}"
+                for qa in previous_qa or []
             ])
+            summary_section = f"""이전 대화 요약:
+{summary}
+
+""" if summary else ""
             
             prompt = f"""당신은 {context}입니다.
 
-이전 대화:
+{summary_section}최근 대화:
 {prev_conversation}
 
-현재 {turn_number}/5 턴입니다.
+현재 {turn_number}/{max_turns} 턴입니다.
 이전 답변을 고려하여 다음 질문을 해주세요. 꼬리 질문이나 새로운 주제 모두 가능합니다."""
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await OpenAIService._chat(
             messages=[
                 {"role": "system", "content": "당신은 면접관입니다."},
                 {"role": "user", "content": prompt}
@@ -119,66 +240,147 @@ class OpenAIService:
         return response.choices[0].message.content
     
     @staticmethod
+    @instrumented("openai")
+    async def summarize_interview(summary: str, turns: list) -> str:
+        """
+        Fold turns into the running summary of an interview in progress
+        """
+        conversation = "\n\n".join([
+            f"Q{t['turn_number']}: {t['question']}\nA{t['turn_number']}: {t['answer']}"
+            for t in turns
+        ])
+        
+        prompt = f"""다음은 진행 중인 면접의 기존 요약과 이어진 대화입니다.
+
+[기존 요약]
+{summary or '없음'}
+
+[이어진 대화]
+{conversation}
+
+기존 요약에 이어진 대화를 반영하여 새 요약을 작성해주세요.
+지원자의 경험, 강점과 약점, 이미 다룬 주제를 중심으로 간결하게 정리해주세요."""
+        
+        response = await OpenAIService._chat(
+            messages=[
+                {"role": "system", "content": "당신은 면접 기록을 요약하는 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=settings.INTERVIEW_SUMMARY_MAX_TOKENS
+        )
+        
+        return response.choices[0].message.content
+    
+    @staticmethod
+    @instrumented("openai")
     async def generate_tts(text: str) -> bytes:
         """
         Generate TTS audio from text
         """
-        response = client.audio.speech.create(
-            model="tts-1-hd",
-            voice="alloy",
-            input=text
-        )
+        async def request():
+            return await client.audio.speech.create(
+                model=TTS_MODEL,
+                voice=TTS_VOICE,
+                input=text,
+                timeout=TIMEOUTS["tts"]
+            )
+        
+        response = await rate_limiter.call(TTS_MODEL, request, limit=LIMITS["tts"])
+        annotate(model=TTS_MODEL, characters=len(text))
         
         return response.content
     
     @staticmethod
+    @instrumented("openai")
     async def transcribe_audio(audio_file) -> str:
         """
         Transcribe audio to text using Whisper
         """
-        transcript = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file
-        )
+        # audio_file may be a file object or a (filename, file, content_type) tuple
+        fileobj = audio_file[1] if isinstance(audio_file, tuple) else audio_file
+        
+        async def request():
+            if hasattr(fileobj, "seek"):
+                fileobj.seek(0)  # a retry must resend the whole recording
+            return await client.audio.transcriptions.create(
+                model=STT_MODEL,
+                file=audio_file,
+                timeout=TIMEOUTS["stt"]
+            )
+        
+        transcript = await rate_limiter.call(STT_MODEL, request, limit=LIMITS["stt"])
         
         return transcript.text
     
     @staticmethod
-    async def generate_interview_feedback(turns: list) -> dict:
+    @instrumented("openai")
+    async def generate_turn_feedbacks(turns: list) -> dict:
         """
-        Generate feedback for entire interview
+        Generate feedback for answered turns, possibly from different interviews, in one call
+
+        Each turn is a dict with id, question and answer; returns {id: feedback}.
         """
-        conversation = "\n\n".join([
-            f"[질문 {t['turn_number']}]\n{t['question']}\n\n[답변 {t['turn_number']}]\n{t['answer']}"
+        answers = "\n\n".join([
+            f"[ID {t['id']}]\n질문: {t['question']}\n답변: {t['answer']}"
             for t in turns
         ])
         
-        prompt = f"""다음은 5턴의 면접 전체 기록입니다.
+        prompt = f"""다음은 서로 다른 면접에서 나온 질문과 답변 {len(turns)}개입니다.
+각 답변을 독립적으로 평가하여 구체적인 피드백을 작성해주세요.
 
-{conversation}
+{answers}
 
 다음 형식으로 JSON을 생성해주세요:
 {{
-    "total_feedback": "전체적인 종합 피드백",
-    "turn_feedbacks": [
-        "질문 1에 대한 피드백",
-        "질문 2에 대한 피드백",
-        "질문 3에 대한 피드백",
-        "질문 4에 대한 피드백",
-        "질문 5에 대한 피드백"
+    "feedbacks": [
+        {{"id": ID, "feedback": "해당 답변에 대한 피드백"}},
+        ...
     ]
 }}"""
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await OpenAIService._chat(
             messages=[
                 {"role": "system", "content": "당신은 면접 평가 전문가입니다."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
+            max_tokens=settings.TURN_FEEDBACK_MAX_TOKENS * len(turns),
             response_format={"type": "json_object"}
         )
         
-        import json
-        return json.loads(response.choices[0].message.content)
+        result = json.loads(response.choices[0].message.content)
+        return {
+            int(item["id"]): item["feedback"]
+            for item in result.get("feedbacks", [])
+            if item.get("id") is not None and item.get("feedback")
+        }
+    
+    @staticmethod
+    @instrumented("openai")
+    async def generate_interview_feedback(turns: list) -> str:
+        """
+        Combine finished per-turn feedback into the overall interview feedback
+        """
+        feedbacks = "\n\n".join([
+            f"[질문 {t['turn_number']}] {t['question']}\n[피드백] {t['feedback']}"
+            for t in turns
+        ])
+        
+        prompt = f"""다음은 {len(turns)}턴 면접의 질문별 피드백입니다.
+
+{feedbacks}
 
+질문별 피드백을 종합하여 지원자에 대한 전체적인 종합 피드백을 작성해주세요.
+반복되는 강점과 개선점을 중심으로 간결하게 정리해주세요."""
+        
+        response = await OpenAIService._chat(
+            messages=[
+                {"role": "system", "content": "당신은 면접 평가 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=settings.INTERVIEW_FEEDBACK_MAX_TOKENS
+        )
+        
+        return response.choices[0].message.content
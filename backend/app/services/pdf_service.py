@@ -0,0 +1,96 @@
+"""
+PDF Text Extraction
+
+Extraction is CPU bound, so it runs in a bounded process pool with a page
+limit and a per-document timeout instead of on the event loop.
+"""
+import asyncio
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import PyPDF2
+import pdfplumber
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionError(Exception):
+    """Raised when text cannot be extracted from a PDF"""
+
+
+def extract_with_pypdf2(content: bytes, max_pages: int) -> str:
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    return "\n".join(page.extract_text() or "" for page in reader.pages[:max_pages])
+
+
+def extract_with_pdfplumber(content: bytes, max_pages: int) -> str:
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages[:max_pages])
+
+
+EXTRACTORS = {
+    "pypdf2": extract_with_pypdf2,
+    "pdfplumber": extract_with_pdfplumber,
+}
+
+_executor = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PDF_MAX_WORKERS)
+    return _executor
+
+
+def _reset_executor(executor: ProcessPoolExecutor):
+    """
+    Kill the pool so a runaway extraction stops consuming CPU
+
+    Only if it is still the current pool: extractions that were in flight
+    on an already replaced pool must not take down its successor.
+    """
+    global _executor
+    if _executor is not executor:
+        return
+    _executor = None
+    for process in list(getattr(executor, "_processes", {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    """
+    Stop the extraction process pool
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def extract_pdf_text(content: bytes, engine: str = None) -> str:
+    """
+    Extract text from the first PDF_MAX_PAGES pages off the event loop
+    """
+    extractor = EXTRACTORS[engine or settings.PDF_EXTRACTOR]
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    future = loop.run_in_executor(executor, extractor, content, settings.PDF_MAX_PAGES)
+
+    try:
+        return await asyncio.wait_for(future, timeout=settings.PDF_EXTRACT_TIMEOUT)
+
+    except asyncio.TimeoutError:
+        logger.warning("PDF extraction exceeded %ss, restarting pool", settings.PDF_EXTRACT_TIMEOUT)
+        _reset_executor(executor)
+        raise PDFExtractionError("PDF extraction timed out")
+
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        raise PDFExtractionError("PDF extraction worker crashed")
+
+    except Exception as e:
+        raise PDFExtractionError(str(e))
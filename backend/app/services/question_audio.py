@@ -0,0 +1,219 @@
+"""
+Question Audio Rendering
+
+Synthesizes interview questions sentence by sentence in the background so
+the question text can be returned before its audio exists. Chunks are
+published as they finish, letting clients stream the audio while the full
+file is still being rendered and uploaded.
+
+Live renders exist only on the worker that started them, so each turn
+created without audio also gets a delayed QUESTION_AUDIO_JOB. It does
+nothing if the audio was stored by then, and otherwise renders and stores
+it with the job queue's retries, covering renders that failed or were lost
+to a restart.
+"""
+import asyncio
+import logging
+import re
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import InterviewTurn
+from .job_queue import enqueue, job_handler
+from .rate_limiter import set_caller
+from .tts_cache import tts_cache
+
+logger = logging.getLogger(__name__)
+
+QUESTION_AUDIO_JOB = "question_audio"
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s+")
+MIN_SENTENCE_LENGTH = 20
+
+# Renders in flight on this worker, keyed by turn id
+_renders = {}
+# Strong references so pending tasks are not garbage collected
+_tasks = set()
+
+
+def split_sentences(text: str) -> list:
+    """
+    Split text into sentences, merging fragments too short to be worth a TTS call
+    """
+    sentences = []
+    for part in SENTENCE_BOUNDARY.split(text.strip()):
+        if sentences and len(sentences[-1]) < MIN_SENTENCE_LENGTH:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        elif part:
+            sentences.append(part)
+    return sentences
+
+
+async def synthesize_sentences(text: str):
+    """
+    Yield MP3 chunks in sentence order while synthesizing all sentences concurrently
+    """
+    tasks = [asyncio.create_task(tts_cache.synthesize(sentence)) for sentence in split_sentences(text)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class QuestionAudioRender:
+    """Audio for one question, filled in chunk by chunk"""
+
+    def __init__(self, turn_id: int):
+        self.turn_id = turn_id
+        self.chunks = []
+        self.done = False
+        self.failed = False
+        self.url = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, chunk: bytes = None, done: bool = False, failed: bool = False):
+        async with self._changed:
+            if chunk:
+                self.chunks.append(chunk)
+            self.done = self.done or done
+            self.failed = self.failed or failed
+            self._changed.notify_all()
+
+    async def stream(self):
+        """
+        Yield chunks already rendered, then follow the render until it finishes
+        """
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.chunks) > sent or self.done)
+                chunks = self.chunks[sent:]
+                finished = self.done
+            for chunk in chunks:
+                yield chunk
+            sent += len(chunks)
+            if finished and sent == len(self.chunks):
+                return
+
+    async def wait(self) -> bool:
+        """
+        Wait for the render to finish; True if its audio was stored
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+        return not self.failed
+
+
+def get_render(turn_id: int):
+    """
+    Render in flight on this worker, if any
+    """
+    return _renders.get(turn_id)
+
+
+def _forget(render: QuestionAudioRender):
+    if _renders.get(render.turn_id) is render:
+        del _renders[render.turn_id]
+
+
+async def _save_url(db: AsyncSession, turn_id: int, url: str):
+    # Plain UPDATE so the turn's version is untouched and a concurrent
+    # answer submission does not see a conflict
+    await db.execute(
+        update(InterviewTurn).where(
+            InterviewTurn.id == turn_id
+        ).values(question_audio_url=url, question_audio_status=None)
+    )
+    await db.commit()
+
+
+async def _render(render: QuestionAudioRender, text: str):
+    try:
+        async for chunk in synthesize_sentences(text):
+            await render.publish(chunk)
+
+        render.url = await tts_cache.store(text, b"".join(render.chunks))
+        async with SessionLocal() as db:
+            await _save_url(db, render.turn_id, render.url)
+
+        await render.publish(done=True)
+        _forget(render)
+
+    except Exception:
+        # Pollers see the failure for a while; the turn's job retries the render
+        logger.exception("Failed to render audio for interview turn %s", render.turn_id)
+        await render.publish(done=True, failed=True)
+        asyncio.get_running_loop().call_later(settings.QUESTION_AUDIO_FAILED_TTL, _forget, render)
+
+
+async def lookup_question_audio(text: str):
+    """
+    URL of audio already rendered for identical question text, if any
+    """
+    return await tts_cache.lookup_url(text)
+
+
+def schedule_render(db: AsyncSession, session_id: int, turn_number: int):
+    """
+    Add the durable render of a turn's question audio to the caller's transaction
+    """
+    enqueue(
+        db, QUESTION_AUDIO_JOB, {"session_id": session_id, "turn_number": turn_number},
+        delay=settings.QUESTION_AUDIO_JOB_DELAY
+    )
+
+
+def start_render(turn_id: int, text: str) -> QuestionAudioRender:
+    """
+    Start rendering question audio in the background on this worker
+    """
+    render = QuestionAudioRender(turn_id)
+    _renders[turn_id] = render
+    task = asyncio.create_task(_render(render, text))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return render
+
+
+async def mark_question_audio_failed(payload: dict, db: AsyncSession, error: Exception):
+    """
+    Record that the question audio could not be rendered after all retries
+    """
+    await db.execute(
+        update(InterviewTurn).where(
+            InterviewTurn.session_id == payload["session_id"],
+            InterviewTurn.turn_number == payload["turn_number"],
+            InterviewTurn.question_audio_url.is_(None)
+        ).values(question_audio_status="failed")
+    )
+    await db.commit()
+
+
+@job_handler(QUESTION_AUDIO_JOB, on_failure=mark_question_audio_failed)
+async def render_question_audio(payload: dict, db: AsyncSession):
+    """
+    Store a turn's question audio unless a live render already has
+    """
+    set_caller("jobs")
+
+    turn = (await db.execute(
+        select(InterviewTurn).where(
+            InterviewTurn.session_id == payload["session_id"],
+            InterviewTurn.turn_number == payload["turn_number"]
+        )
+    )).scalars().first()
+    await db.commit()
+    if turn is None or turn.question_audio_url:
+        return
+
+    # Still rendering on this worker; its result decides whether to start over
+    render = get_render(turn.id)
+    if render and await render.wait():
+        return
+
+    audio = b"".join([chunk async for chunk in synthesize_sentences(turn.question_text)])
+    url = await tts_cache.store(turn.question_text, audio)
+    await _save_url(db, turn.id, url)
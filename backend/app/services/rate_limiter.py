@@ -0,0 +1,415 @@
+"""
+OpenAI Rate Limiter
+
+Every worker shares one OpenAI org, so calls are governed client side
+against per-model requests/min and tokens/min budgets. Callers wait in
+per-user queues that are served round-robin, so one user's burst cannot
+starve everyone else. Budgets live in memory by default; the database
+backend keeps them in the rate_limit_buckets table so every uvicorn
+worker and worker.py obey one global budget. 429s and 5xx responses are
+retried with jittered backoff, and a 429 pauses the shared bucket for
+every worker, not just the caller.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+from openai import APIConnectionError, InternalServerError, RateLimitError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.core.backoff import retry_delay
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.metrics import registry, annotate, Gauge, Histogram
+from app.models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Whose queue a call joins; set per request by the auth dependency
+rate_limit_caller = contextvars.ContextVar("rate_limit_caller", default="anonymous")
+
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+
+QUEUE_WAIT = registry.register(Histogram(
+    "openai_queue_wait_seconds", "Time calls waited for their turn and budget", ("model",)
+))
+
+# Longest the dispatcher sleeps before re-checking a shared budget
+MAX_DISPATCH_SLEEP = 1.0
+
+
+def set_caller(key):
+    """
+    Queue OpenAI calls made from the current context under key
+    """
+    rate_limit_caller.set(str(key))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header from an OpenAI error response, if any
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def refill(level: float, updated_at: float, capacity: float, now: float) -> float:
+    """
+    Budget available at now for a bucket refilling capacity per minute
+    """
+    return min(capacity, level + max(0.0, now - updated_at) * capacity / 60)
+
+
+class MemoryRateLimitBackend:
+    """Per-process token buckets"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets = {}
+
+    async def take(self, amounts: dict, capacities: dict) -> float:
+        """
+        Charge every bucket in amounts, or none; returns seconds to wait if short
+        """
+        now = time.time()
+        levels = {
+            name: refill(*self._buckets.get(name, (capacities[name], now)), capacities[name], now)
+            for name in amounts
+        }
+        wait = max(
+            (amounts[name] - levels[name]) * 60 / capacities[name]
+            for name in amounts
+        )
+        if wait > 0:
+            return wait
+
+        for name, amount in amounts.items():
+            self._buckets[name] = (levels[name] - amount, now)
+        return 0.0
+
+    async def charge(self, name: str, amount: float, capacity: float):
+        """
+        Adjust a bucket without waiting; negative amounts refund
+        """
+        now = time.time()
+        level, updated_at = self._buckets.get(name, (capacity, now))
+        self._buckets[name] = (min(capacity, refill(level, updated_at, capacity, now) - amount), max(updated_at, now))
+
+    async def pause(self, name: str, seconds: float, capacity: float):
+        """
+        Empty a bucket and hold off refilling it for seconds
+        """
+        self._buckets[name] = (0.0, time.time() + seconds)
+
+
+class DatabaseRateLimitBackend:
+    """Buckets shared by every worker through the rate_limit_buckets table"""
+
+    name = "database"
+
+    async def _load(self, db, names, capacities: dict, now: float) -> dict:
+        query = select(RateLimitBucket).where(RateLimitBucket.name.in_(list(names)))
+        if engine.dialect.name == "postgresql":
+            query = query.with_for_update()
+
+        rows = {row.name: row for row in (await db.execute(query)).scalars().all()}
+        for name in names:
+            if name not in rows:
+                rows[name] = RateLimitBucket(name=name, level=capacities[name], updated_at=now)
+                db.add(rows[name])
+        return rows
+
+    async def take(self, amounts: dict, capacities: dict) -> float:
+        """
+        Charge every bucket in amounts, or none; returns seconds to wait if short
+        """
+        async with SessionLocal() as db:
+            try:
+                now = time.time()
+                rows = await self._load(db, amounts, capacities, now)
+                levels = {
+                    name: refill(rows[name].level, rows[name].updated_at, capacities[name], now)
+                    for name in amounts
+                }
+                wait = max(
+                    (amounts[name] - levels[name]) * 60 / capacities[name]
+                    for name in amounts
+                )
+                if wait > 0:
+                    await db.rollback()
+                    return wait
+
+                for name, amount in amounts.items():
+                    rows[name].level = levels[name] - amount
+                    rows[name].updated_at = now
+                await db.commit()
+                return 0.0
+            except IntegrityError:
+                # Another worker created the bucket row first
+                await db.rollback()
+                return 0.05
+
+    async def charge(self, name: str, amount: float, capacity: float):
+        """
+        Adjust a bucket without waiting; negative amounts refund
+        """
+        async with SessionLocal() as db:
+            try:
+                now = time.time()
+                row = (await self._load(db, [name], {name: capacity}, now))[name]
+                row.level = min(capacity, refill(row.level, row.updated_at, capacity, now) - amount)
+                row.updated_at = max(row.updated_at, now)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+
+    async def pause(self, name: str, seconds: float, capacity: float):
+        """
+        Empty a bucket and hold off refilling it for seconds
+        """
+        async with SessionLocal() as db:
+            try:
+                now = time.time()
+                row = (await self._load(db, [name], {name: capacity}, now))[name]
+                row.level = 0.0
+                row.updated_at = max(row.updated_at, now + seconds)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+
+
+BACKENDS = {
+    MemoryRateLimitBackend.name: MemoryRateLimitBackend,
+    DatabaseRateLimitBackend.name: DatabaseRateLimitBackend,
+}
+
+
+class GovernorStats:
+    """Queue depth, wait times and retry counters for one model"""
+
+    def __init__(self, window: int = 1000):
+        self._waits = deque(maxlen=window)
+        self.granted = 0
+        self.retries = 0
+        self.throttled = 0
+
+    def record_wait(self, seconds: float):
+        self.granted += 1
+        self._waits.append(seconds * 1000)
+
+    def as_dict(self) -> dict:
+        waits = sorted(self._waits)
+
+        def pick(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 1) if waits else 0
+
+        return {
+            "granted": self.granted,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "wait_ms_p50": pick(0.50),
+            "wait_ms_p95": pick(0.95),
+            "wait_ms_max": pick(1.0),
+        }
+
+
+class ModelGovernor:
+    """Fair queue in front of one model's requests and tokens budgets"""
+
+    def __init__(self, model: str, backend, rpm: int, tpm: Optional[int] = None):
+        self.model = model
+        self.backend = backend
+        self.capacities = {f"{model}:requests": rpm}
+        if tpm:
+            self.capacities[f"{model}:tokens"] = tpm
+        self.stats = GovernorStats()
+        self._queues = OrderedDict()  # caller -> deque of (future, tokens, queued_at)
+        self._wakeup = None
+        self._dispatcher = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _amounts(self, tokens: int) -> dict:
+        amounts = {f"{self.model}:requests": 1}
+        if f"{self.model}:tokens" in self.capacities:
+            # A prompt larger than the whole budget would otherwise never be admitted
+            amounts[f"{self.model}:tokens"] = min(tokens, self.capacities[f"{self.model}:tokens"])
+        return amounts
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def acquire(self, tokens: int = 0):
+        """
+        Wait for this caller's turn and for room in the model's budgets
+        """
+        caller = rate_limit_caller.get()
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(caller, deque()).append((future, tokens, time.monotonic()))
+        self._ensure_dispatcher()
+        self._wakeup.set()
+        await future
+
+    async def settle(self, estimated: int, actual: Optional[int]):
+        """
+        Correct the tokens budget once the response reports real usage
+        """
+        name = f"{self.model}:tokens"
+        if actual is None or name not in self.capacities or actual == estimated:
+            return
+        await self.backend.charge(name, actual - estimated, self.capacities[name])
+
+    async def throttle(self, seconds: float):
+        """
+        Pause the requests budget after a 429 so every worker backs off
+        """
+        self.stats.throttled += 1
+        name = f"{self.model}:requests"
+        await self.backend.pause(name, seconds, self.capacities[name])
+
+    def _next(self):
+        """
+        Head of the first non-empty caller queue, dropping cancelled waiters
+        """
+        while self._queues:
+            caller, queue = next(iter(self._queues.items()))
+            while queue and queue[0][0].done():
+                queue.popleft()
+            if queue:
+                return caller, queue
+            del self._queues[caller]
+        return None, None
+
+    async def _dispatch(self):
+        while True:
+            caller, queue = self._next()
+            if queue is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            future, tokens, queued_at = queue[0]
+            try:
+                wait = await self.backend.take(self._amounts(tokens), self.capacities)
+            except Exception:
+                logger.exception("Rate limit backend failed for %s; admitting call", self.model)
+                wait = 0.0
+
+            if wait > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(wait, MAX_DISPATCH_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Round-robin: the caller goes to the back of the line
+            queue.popleft()
+            del self._queues[caller]
+            if queue:
+                self._queues[caller] = queue
+
+            if future.done():
+                # Cancelled while its budget was being taken; hand it back
+                for name, amount in self._amounts(tokens).items():
+                    await self.backend.charge(name, -amount, self.capacities[name])
+                continue
+
+            waited = time.monotonic() - queued_at
+            self.stats.record_wait(waited)
+            QUEUE_WAIT.observe(waited, model=self.model)
+            future.set_result(None)
+
+    def as_dict(self) -> dict:
+        stats = self.stats.as_dict()
+        stats.update(queue_depth=self.queue_depth, waiting_callers=len(self._queues))
+        return stats
+
+
+class RateLimiter:
+    """Per-model governors plus retries for OpenAI calls"""
+
+    def __init__(self, backend, limits: dict):
+        self.governors = {
+            model: ModelGovernor(model, backend, limit["rpm"], limit.get("tpm"))
+            for model, limit in limits.items()
+        }
+
+    async def call(self, model: str, request, tokens: int = 0, limit: asyncio.Semaphore = None):
+        """
+        Run request() once admitted, retrying 429s and server errors
+
+        request is a zero-argument coroutine function so every attempt sends a
+        fresh request; limit caps calls in flight once they are admitted.
+        """
+        governor = self.governors.get(model)
+        attempts = 0
+        queued = 0.0
+
+        while True:
+            attempts += 1
+            if governor is not None:
+                started = time.monotonic()
+                await governor.acquire(tokens)
+                queued += time.monotonic() - started
+
+            try:
+                if limit is not None:
+                    async with limit:
+                        response = await request()
+                else:
+                    response = await request()
+            except RETRYABLE_ERRORS as e:
+                if attempts > settings.OPENAI_MAX_RETRIES:
+                    raise
+
+                retry_after = retry_after_seconds(e)
+                # Never sooner than the server asked for
+                delay = max(
+                    retry_after or 0,
+                    retry_delay(attempts, settings.OPENAI_RETRY_BASE_DELAY, settings.OPENAI_RETRY_MAX_DELAY)
+                )
+                if governor is not None:
+                    governor.stats.retries += 1
+                    if isinstance(e, RateLimitError):
+                        await governor.throttle(retry_after or delay)
+                logger.warning("%s call failed (%s), retry %s in %.1fs", model, type(e).__name__, attempts, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if governor is not None:
+                usage = getattr(response, "usage", None)
+                await governor.settle(tokens, getattr(usage, "total_tokens", None))
+            annotate(attempts=attempts, queued_ms=round(queued * 1000, 1))
+            return response
+
+    def as_dict(self) -> dict:
+        return {model: governor.as_dict() for model, governor in self.governors.items()}
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Build the limiter for the OPENAI_RATE_LIMIT_BACKEND budget store
+    """
+    return RateLimiter(BACKENDS[settings.OPENAI_RATE_LIMIT_BACKEND](), settings.OPENAI_RATE_LIMITS)
+
+
+# Singleton instance
+rate_limiter = get_rate_limiter()
+
+registry.register(Gauge(
+    "openai_queue_depth", "Calls waiting for their turn and budget", ("model",),
+    lambda: {(model,): governor.queue_depth for model, governor in rate_limiter.governors.items()}
+))
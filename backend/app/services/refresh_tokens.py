@@ -0,0 +1,225 @@
+"""
+Refresh Token Rotation
+
+Every login opens a refresh session whose id travels in its tokens as
+"sid". A refresh token is valid only while its jti is the session's
+current_jti, and rotating swaps in a new jti with one conditional UPDATE by
+primary key, so the check costs the same however many tokens were issued.
+Presenting a token that was already rotated means it leaked, so the whole
+session is revoked.
+
+Access tokens are never looked up. Revoked session ids are held in a per
+process RevocationIndex until the last access token they issued expires,
+refreshed from the table every few seconds, so checking one on every
+request is a dict lookup. Expired sessions are compacted in the background.
+"""
+import asyncio
+import heapq
+import logging
+import secrets
+import time
+from typing import Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import create_refresh_token
+from app.models import RefreshSession
+
+logger = logging.getLogger(__name__)
+
+# Re-read revocations this far behind the newest seen, for commits that landed late
+REVOCATION_SYNC_OVERLAP = 30.0
+
+
+class RefreshTokenError(Exception):
+    """Refresh token is unknown, expired, revoked or was already used"""
+
+
+class RevocationIndex:
+    """Revoked session ids, each kept until a deadline, with a heap ordered by deadline for compaction"""
+
+    def __init__(self):
+        self._deadlines = {}
+        self._heap = []
+
+    def add(self, session_id: str, until: float):
+        if until <= self._deadlines.get(session_id, 0):
+            return
+        self._deadlines[session_id] = until
+        heapq.heappush(self._heap, (until, session_id))
+
+    def __contains__(self, session_id: str) -> bool:
+        until = self._deadlines.get(session_id)
+        return until is not None and until > time.time()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Drop entries past their deadline; returns how many were dropped
+        """
+        now = now or time.time()
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            until, session_id = heapq.heappop(self._heap)
+            # Superseded heap entries no longer match the deadline
+            if self._deadlines.get(session_id) == until:
+                del self._deadlines[session_id]
+                removed += 1
+        return removed
+
+
+def _new_id() -> str:
+    return secrets.token_hex(16)
+
+
+def _refresh_lifetime() -> float:
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+def _access_lifetime() -> float:
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + settings.JWT_LEEWAY_SECONDS
+
+
+class RefreshTokenStore:
+    """Refresh sessions in the database, revocations mirrored in memory"""
+
+    def __init__(self):
+        self.revoked = RevocationIndex()
+        self._synced_until = 0.0
+        self._task = None
+
+    async def issue(self, db: AsyncSession, user_id: int) -> Tuple[str, str]:
+        """
+        Open a session for a login and commit it
+        Returns: (session id, refresh token)
+        """
+        session_id, jti = _new_id(), _new_id()
+        db.add(RefreshSession(
+            id=session_id,
+            user_id=user_id,
+            current_jti=jti,
+            expires_at=time.time() + _refresh_lifetime()
+        ))
+        await db.commit()
+        return session_id, create_refresh_token({"sub": str(user_id), "sid": session_id, "jti": jti})
+
+    async def rotate(self, db: AsyncSession, payload: dict) -> str:
+        """
+        Exchange a verified refresh token payload for the next token in its session
+
+        Raises RefreshTokenError when the token may not be used; reusing a
+        rotated token also revokes its session.
+        """
+        session_id, jti = payload.get("sid"), payload.get("jti")
+        if not session_id or not jti or session_id in self.revoked:
+            raise RefreshTokenError("Invalid refresh token")
+
+        now = time.time()
+        new_jti = _new_id()
+        result = await db.execute(
+            update(RefreshSession).where(
+                RefreshSession.id == session_id,
+                RefreshSession.current_jti == jti,
+                RefreshSession.revoked_at.is_(None),
+                RefreshSession.expires_at > now
+            ).values(
+                current_jti=new_jti,
+                previous_jti=jti,
+                rotated_at=now,
+                expires_at=now + _refresh_lifetime()
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            await db.commit()
+            return create_refresh_token({"sub": payload["sub"], "sid": session_id, "jti": new_jti})
+
+        session = await db.get(RefreshSession, session_id)
+        await db.commit()
+        if session is None or session.revoked_at is not None or session.expires_at <= now:
+            raise RefreshTokenError("Invalid refresh token")
+
+        # A client retrying a refresh whose response it lost; reject without revoking
+        if session.previous_jti == jti and now - (session.rotated_at or 0) < settings.REFRESH_REUSE_GRACE_SECONDS:
+            raise RefreshTokenError("Refresh token was already used")
+
+        logger.warning("Refresh token reuse for session %s of user %s; revoking", session_id, session.user_id)
+        await self.revoke(db, session_id)
+        raise RefreshTokenError("Refresh token was already used")
+
+    async def revoke(self, db: AsyncSession, session_id: str):
+        """
+        End a session; its tokens stop working here at once and on other workers after the next sync
+        """
+        now = time.time()
+        await db.execute(
+            update(RefreshSession).where(
+                RefreshSession.id == session_id,
+                RefreshSession.revoked_at.is_(None)
+            ).values(revoked_at=now)
+        )
+        await db.commit()
+        self.revoked.add(session_id, now + _access_lifetime())
+
+    async def sync(self):
+        """
+        Load sessions revoked by any worker whose access tokens may still be live
+        """
+        since = max(self._synced_until - REVOCATION_SYNC_OVERLAP, time.time() - _access_lifetime())
+        async with SessionLocal() as db:
+            rows = (await db.execute(
+                select(RefreshSession.id, RefreshSession.revoked_at).where(RefreshSession.revoked_at > since)
+            )).all()
+
+        for session_id, revoked_at in rows:
+            self.revoked.add(session_id, revoked_at + _access_lifetime())
+            self._synced_until = max(self._synced_until, revoked_at)
+        self.revoked.compact()
+
+    async def compact(self) -> int:
+        """
+        Delete expired sessions in batches; returns how many were deleted
+        """
+        removed = 0
+        while True:
+            async with SessionLocal() as db:
+                expired = select(RefreshSession.id).where(
+                    RefreshSession.expires_at < time.time()
+                ).order_by(RefreshSession.expires_at).limit(settings.REFRESH_COMPACTION_BATCH_SIZE)
+                result = await db.execute(delete(RefreshSession).where(RefreshSession.id.in_(expired)))
+                await db.commit()
+            removed += result.rowcount
+            if result.rowcount < settings.REFRESH_COMPACTION_BATCH_SIZE:
+                return removed
+
+    async def _run(self):
+        next_compaction = 0.0
+        while True:
+            try:
+                await self.sync()
+                if time.time() >= next_compaction:
+                    removed = await self.compact()
+                    if removed:
+                        logger.info("Compacted %d expired refresh sessions", removed)
+                    next_compaction = time.time() + settings.REFRESH_COMPACTION_INTERVAL
+            except Exception:
+                logger.exception("Refresh session maintenance failed")
+            await asyncio.sleep(settings.REFRESH_REVOCATION_SYNC_INTERVAL)
+
+    async def start(self):
+        """
+        Follow revocations from other workers and compact expired sessions
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+refresh_store = RefreshTokenStore()
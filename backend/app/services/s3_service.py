@@ -2,28 +2,43 @@
 AWS S3 Service
 """
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from app.core.config import settings
-import uuid
+from app.core.metrics import instrumented
+from typing import Optional
+from .storage_service import StorageService, StoredObject
 
 
-class S3Service:
+class S3Service(StorageService):
     """Service for AWS S3 operations"""
-    
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    DIRECT_UPLOADS = True
+
     def __init__(self):
+        super().__init__()
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+            region_name=settings.AWS_REGION,
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            config=Config(
+                max_pool_connections=settings.STORAGE_MAX_WORKERS * settings.AWS_S3_MULTIPART_CONCURRENCY,
+                # SigV4 signs Content-Type and Content-Length into presigned PUTs
+                signature_version="s3v4"
+            )
         )
         self.bucket = settings.AWS_S3_BUCKET
-    
-    def upload_file(self, file_content: bytes, file_key: str, content_type: str = "application/octet-stream") -> str:
-        """
-        Upload file to S3
-        Returns: Public URL of uploaded file
-        """
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.AWS_S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.AWS_S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.AWS_S3_MULTIPART_CONCURRENCY
+        )
+
+    def _put_object(self, file_content: bytes, file_key: str, content_type: str):
         try:
             self.s3_client.put_object(
                 Bucket=self.bucket,
@@ -31,51 +46,196 @@ class S3Service:
                 Body=file_content,
                 ContentType=content_type
             )
-            
-            url = f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
-            return url
-        
+
         except ClientError as e:
             raise Exception(f"Failed to upload file to S3: {str(e)}")
-    
-    def generate_presigned_url(self, file_key: str, expiration: int = 3600) -> str:
+
+    def _upload_fileobj(self, fileobj, file_key: str, content_type: str):
+        try:
+            # Switches to multipart above the threshold, reading one chunk at a time
+            self.s3_client.upload_fileobj(
+                fileobj,
+                self.bucket,
+                file_key,
+                ExtraArgs={"ContentType": content_type},
+                Config=self.transfer_config
+            )
+
+        except ClientError as e:
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+
+    @instrumented("s3")
+    async def upload_file(self, file_content: bytes, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Upload file to S3
+        Returns: Public URL of uploaded file
+        """
+        await self._run(self._put_object, file_content, file_key, content_type)
+        return self.get_url(file_key)
+
+    @instrumented("s3")
+    async def upload_fileobj(self, fileobj, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Stream file-like object to S3 using multipart upload
+        Returns: Public URL of uploaded file
+        """
+        await self._run(self._upload_fileobj, fileobj, file_key, content_type)
+        return self.get_url(file_key)
+
+    def _download_fileobj(self, file_key: str, fileobj):
+        try:
+            self.s3_client.download_fileobj(self.bucket, file_key, fileobj, Config=self.transfer_config)
+
+        except ClientError as e:
+            raise Exception(f"Failed to download file from S3: {str(e)}")
+
+    @instrumented("s3")
+    async def download_fileobj(self, file_key: str, fileobj):
+        """
+        Stream an S3 object into a writable file-like object
+        """
+        await self._run(self._download_fileobj, file_key, fileobj)
+
+    def _multipart_call(self, method: str, **kwargs):
+        try:
+            return getattr(self.s3_client, method)(Bucket=self.bucket, **kwargs)
+
+        except ClientError as e:
+            raise Exception(f"Failed multipart upload step {method} in S3: {str(e)}")
+
+    @instrumented("s3")
+    async def create_multipart_upload(self, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Start an S3 multipart upload
+        Returns: upload id
+        """
+        response = await self._run(self._multipart_call, "create_multipart_upload", Key=file_key, ContentType=content_type)
+        return response["UploadId"]
+
+    @instrumented("s3")
+    async def upload_part(self, file_key: str, upload_id: str, part_number: int, fileobj) -> str:
+        """
+        Upload one part of a multipart upload
+        Returns: part ETag
+        """
+        response = await self._run(
+            self._multipart_call, "upload_part",
+            Key=file_key, UploadId=upload_id, PartNumber=part_number, Body=fileobj
+        )
+        return response["ETag"]
+
+    @instrumented("s3")
+    async def complete_multipart_upload(self, file_key: str, upload_id: str, parts: list) -> str:
+        """
+        Join uploaded parts into the object, without moving any bytes through this worker
+        Returns: Public URL of the object
+        """
+        await self._run(
+            self._multipart_call, "complete_multipart_upload",
+            Key=file_key, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)]}
+        )
+        return self.get_url(file_key)
+
+    @instrumented("s3")
+    async def abort_multipart_upload(self, file_key: str, upload_id: str):
+        """
+        Discard an unfinished multipart upload and its stored parts
+        """
+        await self._run(self._multipart_call, "abort_multipart_upload", Key=file_key, UploadId=upload_id)
+
+    async def generate_presigned_url(self, file_key: str, expiration: int = 3600) -> str:
         """
         Generate presigned URL for private file access
         """
         try:
+            # Signing is local computation, no network round-trip
             url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket, 'Key': file_key},
                 ExpiresIn=expiration
             )
             return url
-        
+
         except ClientError as e:
             raise Exception(f"Failed to generate presigned URL: {str(e)}")
-    
-    def delete_file(self, file_key: str):
+
+    async def generate_presigned_post(self, file_key: str, content_type: str, max_bytes: int, expiration: int = 900) -> dict:
+        """
+        Sign a form POST whose policy S3 enforces: this key, this content type, at most max_bytes
+        """
+        try:
+            return self.s3_client.generate_presigned_post(
+                self.bucket,
+                file_key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, max_bytes]
+                ],
+                ExpiresIn=expiration
+            )
+
+        except ClientError as e:
+            raise Exception(f"Failed to generate presigned POST: {str(e)}")
+
+    async def generate_presigned_put(self, file_key: str, content_type: str, size: int, expiration: int = 900) -> str:
+        """
+        Sign a PUT; S3 rejects one whose Content-Type or Content-Length differs from the signed values
+        """
+        try:
+            return self.s3_client.generate_presigned_url(
+                'put_object',
+                Params={'Bucket': self.bucket, 'Key': file_key, 'ContentType': content_type, 'ContentLength': size},
+                ExpiresIn=expiration
+            )
+
+        except ClientError as e:
+            raise Exception(f"Failed to generate presigned PUT: {str(e)}")
+
+    @instrumented("s3")
+    async def delete_file(self, file_key: str):
         """
         Delete file from S3
         """
         try:
-            self.s3_client.delete_object(
+            await self._run(
+                self.s3_client.delete_object,
                 Bucket=self.bucket,
                 Key=file_key
             )
-        
+
         except ClientError as e:
             raise Exception(f"Failed to delete file from S3: {str(e)}")
-    
-    @staticmethod
-    def generate_file_key(prefix: str, filename: str) -> str:
+
+    def _head_object(self, file_key: str) -> Optional[StoredObject]:
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket, Key=file_key)
+            return StoredObject(response["ContentLength"], response.get("ContentType", "application/octet-stream"))
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise Exception(f"Failed to check file in S3: {str(e)}")
+
+    @instrumented("s3")
+    async def exists(self, file_key: str) -> bool:
         """
-        Generate unique file key
+        Check whether an object exists in S3
         """
-        unique_id = str(uuid.uuid4())
-        extension = filename.split('.')[-1] if '.' in filename else ''
-        return f"{prefix}/{unique_id}.{extension}" if extension else f"{prefix}/{unique_id}"
+        return await self._run(self._head_object, file_key) is not None
 
+    @instrumented("s3")
+    async def stat(self, file_key: str) -> Optional[StoredObject]:
+        """
+        Size and content type of an S3 object, or None if there is none
+        """
+        return await self._run(self._head_object, file_key)
 
-# Singleton instance
-s3_service = S3Service()
-
+    def get_url(self, file_key: str) -> str:
+        """
+        Public URL of a stored object
+        """
+        if settings.AWS_S3_ENDPOINT_URL:
+            return f"{settings.AWS_S3_ENDPOINT_URL.rstrip('/')}/{self.bucket}/{file_key}"
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
@@ -0,0 +1,274 @@
+"""
+Storage Service
+"""
+import asyncio
+import functools
+import hashlib
+import io
+import mimetypes
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from app.core.config import settings
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# Unfinished multipart uploads of the local backend, under its root
+MULTIPART_DIR = ".multipart"
+
+
+class StoredObject(NamedTuple):
+    """Size and content type of a stored file"""
+    size: int
+    content_type: str
+
+
+class StorageService:
+    """Base class for async object storage backends"""
+
+    # Smallest multipart part other than the last
+    MIN_PART_SIZE = 0
+    # Whether clients can upload straight to storage with presigned requests
+    DIRECT_UPLOADS = False
+
+    def __init__(self):
+        # Bounded pool so blocking storage I/O never runs on the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.STORAGE_MAX_WORKERS,
+            thread_name_prefix="storage"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Run a blocking call in the storage thread pool
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def upload_file(self, file_content: bytes, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Upload bytes
+        Returns: URL of uploaded file
+        """
+        return await self.upload_fileobj(io.BytesIO(file_content), file_key, content_type)
+
+    async def upload_fileobj(self, fileobj, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Stream a file-like object to storage without buffering it in memory
+        Returns: URL of uploaded file
+        """
+        raise NotImplementedError
+
+    async def download_fileobj(self, file_key: str, fileobj):
+        """
+        Stream a stored file into a writable file-like object
+        """
+        raise NotImplementedError
+
+    async def create_multipart_upload(self, file_key: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Start assembling a file from parts
+        Returns: upload id
+        """
+        raise NotImplementedError
+
+    async def upload_part(self, file_key: str, upload_id: str, part_number: int, fileobj) -> str:
+        """
+        Store one part, numbered from 1; re-sending a number replaces it
+        Returns: part ETag
+        """
+        raise NotImplementedError
+
+    async def complete_multipart_upload(self, file_key: str, upload_id: str, parts: list) -> str:
+        """
+        Join [part number, ETag] pairs into the file
+        Returns: URL of the file
+        """
+        raise NotImplementedError
+
+    async def abort_multipart_upload(self, file_key: str, upload_id: str):
+        """
+        Discard an unfinished multipart upload and its parts
+        """
+        raise NotImplementedError
+
+    async def generate_presigned_url(self, file_key: str, expiration: int = 3600) -> str:
+        """
+        Generate URL for private file access
+        """
+        raise NotImplementedError
+
+    async def generate_presigned_post(self, file_key: str, content_type: str, max_bytes: int, expiration: int = 900) -> dict:
+        """
+        Sign a browser form POST that may store up to max_bytes of content_type under file_key
+        Returns: {"url": ..., "fields": {...}} to send as multipart/form-data with the file last
+        """
+        raise NotImplementedError
+
+    async def generate_presigned_put(self, file_key: str, content_type: str, size: int, expiration: int = 900) -> str:
+        """
+        Sign a PUT of exactly size bytes of content_type to file_key
+        Returns: URL; the request must carry the signed Content-Type and Content-Length
+        """
+        raise NotImplementedError
+
+    async def delete_file(self, file_key: str):
+        """
+        Delete file from storage
+        """
+        raise NotImplementedError
+
+    async def exists(self, file_key: str) -> bool:
+        """
+        Check whether a file is stored under file_key
+        """
+        raise NotImplementedError
+
+    async def stat(self, file_key: str) -> Optional[StoredObject]:
+        """
+        Size and content type of a stored file, or None if there is none
+        """
+        raise NotImplementedError
+
+    def get_url(self, file_key: str) -> str:
+        """
+        Public URL for a stored file
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """
+        Stop the storage thread pool
+        """
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def generate_file_key(prefix: str, filename: str) -> str:
+        """
+        Generate unique file key
+        """
+        unique_id = str(uuid.uuid4())
+        extension = filename.split('.')[-1] if '.' in filename else ''
+        return f"{prefix}/{unique_id}.{extension}" if extension else f"{prefix}/{unique_id}"
+
+
+class LocalStorageService(StorageService):
+    """Filesystem storage backend for development and tests"""
+
+    def __init__(self, root: str = None, base_url: str = None):
+        super().__init__()
+        self.root = os.path.abspath(root or settings.LOCAL_STORAGE_PATH)
+        self.base_url = (base_url or settings.LOCAL_STORAGE_URL).rstrip('/')
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, file_key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, file_key))
+        if not path.startswith(self.root + os.sep):
+            raise Exception(f"Invalid file key: {file_key}")
+        return path
+
+    def _write(self, fileobj, file_key: str):
+        path = self._path(file_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise Exception(f"Failed to write file to local storage: {str(e)}")
+
+    async def upload_fileobj(self, fileobj, file_key: str, content_type: str = "application/octet-stream") -> str:
+        await self._run(self._write, fileobj, file_key)
+        return self.get_url(file_key)
+
+    def _read(self, file_key: str, fileobj):
+        with open(self._path(file_key), "rb") as f:
+            shutil.copyfileobj(f, fileobj, COPY_CHUNK_SIZE)
+
+    async def download_fileobj(self, file_key: str, fileobj):
+        await self._run(self._read, file_key, fileobj)
+
+    def _part_dir(self, upload_id: str) -> str:
+        return self._path(f"{MULTIPART_DIR}/{upload_id}")
+
+    async def create_multipart_upload(self, file_key: str, content_type: str = "application/octet-stream") -> str:
+        upload_id = uuid.uuid4().hex
+        await self._run(os.makedirs, self._part_dir(upload_id))
+        return upload_id
+
+    def _write_part(self, upload_id: str, part_number: int, fileobj) -> str:
+        digest = hashlib.md5()
+        path = os.path.join(self._part_dir(upload_id), f"{part_number:05d}")
+        with open(f"{path}.tmp", "wb") as f:
+            for chunk in iter(lambda: fileobj.read(COPY_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(f"{path}.tmp", path)
+        return f'"{digest.hexdigest()}"'
+
+    async def upload_part(self, file_key: str, upload_id: str, part_number: int, fileobj) -> str:
+        return await self._run(self._write_part, upload_id, part_number, fileobj)
+
+    def _join_parts(self, file_key: str, upload_id: str, parts: list):
+        part_dir = self._part_dir(upload_id)
+        path = self._path(file_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp_path, "wb") as out:
+                for part_number, _ in sorted(parts):
+                    with open(os.path.join(part_dir, f"{part_number:05d}"), "rb") as f:
+                        shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise Exception(f"Failed to join parts in local storage: {str(e)}")
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    async def complete_multipart_upload(self, file_key: str, upload_id: str, parts: list) -> str:
+        await self._run(self._join_parts, file_key, upload_id, parts)
+        return self.get_url(file_key)
+
+    async def abort_multipart_upload(self, file_key: str, upload_id: str):
+        await self._run(shutil.rmtree, self._part_dir(upload_id), True)
+
+    async def generate_presigned_url(self, file_key: str, expiration: int = 3600) -> str:
+        return self.get_url(file_key)
+
+    async def delete_file(self, file_key: str):
+        path = self._path(file_key)
+        if os.path.exists(path):
+            await self._run(os.remove, path)
+
+    async def exists(self, file_key: str) -> bool:
+        return os.path.exists(self._path(file_key))
+
+    async def stat(self, file_key: str) -> Optional[StoredObject]:
+        path = self._path(file_key)
+        if not os.path.exists(path):
+            return None
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        return StoredObject(os.path.getsize(path), content_type)
+
+    def get_url(self, file_key: str) -> str:
+        return f"{self.base_url}/{file_key}"
+
+
+def get_storage_service() -> StorageService:
+    """
+    Build the storage backend selected by STORAGE_BACKEND
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageService()
+
+    from .s3_service import S3Service
+    return S3Service()
+
+
+# Singleton instance
+storage_service = get_storage_service()
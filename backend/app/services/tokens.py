@@ -0,0 +1,34 @@
+"""
+Token Estimates
+
+Approximate token counts for prompt budgets and rate limiting, without
+shipping a tokenizer.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer
+
+    About four ASCII characters per token and one token per character for
+    Hangul and other scripts, which errs on the high side for GPT-4o.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """
+    Keep the start of text within roughly the given number of tokens
+    """
+    if estimate_tokens(text) <= tokens:
+        return text
+    kept, used = [], 0
+    for ch in text:
+        used += 0.25 if ord(ch) < 128 else 1
+        if used > tokens:
+            break
+        kept.append(ch)
+    return "".join(kept) + "…"
@@ -0,0 +1,186 @@
+"""
+TTS Audio Cache
+
+Synthesized audio is content addressed by (text, voice, model). Sentence
+audio is kept in a size-bounded LRU directory on local disk to skip
+re-synthesis, and full question audio is stored under a deterministic key
+so repeated questions reuse the existing object and URL instead of being
+uploaded again. Lookups that find nothing in storage are remembered for
+TTS_URL_MISS_TTL, so asking again does not repeat the HEAD request.
+Hits and misses of both tiers are exported to /metrics.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import uuid
+from typing import Optional
+from app.core.config import settings
+from .cache import TTLCache, CacheStats
+from .openai_service import OpenAIService, TTS_MODEL, TTS_VOICE
+from .storage_service import storage_service
+
+
+def tts_cache_key(text: str, voice: str = TTS_VOICE, model: str = TTS_MODEL) -> str:
+    """
+    Content address for synthesized audio
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{voice}\0".encode())
+    digest.update(text.strip().encode())
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """Directory of cached blobs, evicting least recently used files past max_bytes"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._total = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Rebuild the index from whatever survived a restart, oldest first
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".part"):
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._sizes[name] = size
+            self._total += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            # Re-insert to mark as most recently used
+            self._sizes[key] = self._sizes.pop(key)
+
+        try:
+            path = self._path(key)
+            os.utime(path)  # Keeps recency across restarts
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            with self._lock:
+                self._total -= self._sizes.pop(key, 0)
+            return None
+
+    def set(self, key: str, value: bytes):
+        tmp_path = f"{self._path(key)}.{uuid.uuid4().hex}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        os.replace(tmp_path, self._path(key))
+
+        evicted = []
+        with self._lock:
+            self._total += len(value) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(value)
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                oldest = next(iter(self._sizes))
+                self._total -= self._sizes.pop(oldest)
+                evicted.append(oldest)
+
+        for name in evicted:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+
+class TTSCache:
+    """Cache in front of OpenAIService.generate_tts and question audio uploads"""
+
+    def __init__(self):
+        self.disk = None
+        if settings.TTS_CACHE_MAX_BYTES > 0:
+            self.disk = DiskLRUCache(settings.TTS_CACHE_DIR, settings.TTS_CACHE_MAX_BYTES)
+        self._urls = TTLCache(max_entries=settings.TTS_CACHE_MAX_ENTRIES, ttl=24 * 3600)
+        # Keys known to be missing from storage; short-lived since another worker may store them
+        self._missing = TTLCache(max_entries=settings.TTS_CACHE_MAX_ENTRIES, ttl=settings.TTS_URL_MISS_TTL)
+        self.audio_stats = CacheStats("tts_audio")
+        self.url_stats = CacheStats("tts_url")
+
+    @staticmethod
+    def file_key(text: str) -> str:
+        """
+        Deterministic storage key for a question's audio
+        """
+        return f"tts/{TTS_MODEL}/{TTS_VOICE}/{tts_cache_key(text)}.mp3"
+
+    async def synthesize(self, text: str) -> bytes:
+        """
+        Synthesize text, reusing audio from the disk tier when possible
+        """
+        key = tts_cache_key(text)
+
+        if self.disk:
+            audio = await asyncio.to_thread(self.disk.get, key)
+            if audio is not None:
+                self.audio_stats.hit("disk")
+                return audio
+
+        self.audio_stats.miss()
+        audio = await OpenAIService.generate_tts(text)
+
+        if self.disk:
+            await asyncio.to_thread(self.disk.set, key, audio)
+        return audio
+
+    async def lookup_url(self, text: str) -> Optional[str]:
+        """
+        URL of already stored audio for text, if any
+        """
+        file_key = self.file_key(text)
+
+        url = self._urls.get(file_key)
+        if url:
+            self.url_stats.hit("memory")
+            return url
+
+        if self._missing.get(file_key):
+            self.url_stats.miss()
+            return None
+
+        if await storage_service.exists(file_key):
+            self.url_stats.hit("storage")
+            url = storage_service.get_url(file_key)
+            self._urls.set(file_key, url)
+            return url
+
+        self.url_stats.miss()
+        self._missing.set(file_key, True)
+        return None
+
+    async def store(self, text: str, audio: bytes) -> str:
+        """
+        Upload question audio under its content address
+        """
+        file_key = self.file_key(text)
+        url = await storage_service.upload_file(
+            file_content=audio,
+            file_key=file_key,
+            content_type="audio/mpeg"
+        )
+        self._urls.set(file_key, url)
+        self._missing.delete(file_key)
+        return url
+
+    def stats(self) -> dict:
+        return {
+            "audio": self.audio_stats.as_dict(),
+            "url": self.url_stats.as_dict(),
+        }
+
+
+# Singleton instance
+tts_cache = TTSCache()
@@ -0,0 +1,205 @@
+"""
+Authenticated User Cache
+
+get_current_user runs on every authenticated request. User rows are cached
+by id as plain column values, so a hit skips the SELECT and is merged into
+the request's session without touching the database. The memory tier is per
+process; the optional Redis tier is shared by every worker and broadcasts
+invalidations so their memory tiers drop stale rows too.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.models import User
+from .cache import TTLCache, CacheStats
+
+logger = logging.getLogger(__name__)
+
+# Never cached, so it stays out of shared stores; unloaded on cache hits
+EXCLUDED_FIELDS = {"password_hash"}
+CACHED_COLUMNS = [column for column in User.__table__.columns if column.name not in EXCLUDED_FIELDS]
+DATETIME_FIELDS = {column.name for column in CACHED_COLUMNS if isinstance(column.type, DateTime)}
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+
+def user_to_dict(user: User) -> dict:
+    return {column.name: getattr(user, column.name) for column in CACHED_COLUMNS}
+
+
+def user_from_dict(values: dict) -> User:
+    """
+    Rebuild a detached User that can be merged into a session without a load
+    """
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class MemoryUserBackend:
+    """Per-process LRU tier"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            max_entries=settings.USER_CACHE_MAX_ENTRIES,
+            ttl=settings.USER_CACHE_TTL
+        )
+
+    async def get(self, user_id: int) -> Optional[dict]:
+        return self._cache.get(user_id)
+
+    async def set(self, user_id: int, values: dict):
+        self._cache.set(user_id, values)
+
+    async def delete(self, user_id: int):
+        self._cache.delete(user_id)
+
+
+class RedisUserBackend:
+    """Tier shared by every worker through Redis"""
+
+    name = "redis"
+
+    def __init__(self):
+        import redis.asyncio as redis
+
+        if not settings.REDIS_URL:
+            raise Exception("REDIS_URL is required for the redis user cache tier")
+        self._redis = redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[dict]:
+        raw = await self._redis.get(self._key(user_id))
+        if raw is None:
+            return None
+        values = json.loads(raw)
+        for field in DATETIME_FIELDS:
+            if values.get(field):
+                values[field] = datetime.fromisoformat(values[field])
+        return values
+
+    async def set(self, user_id: int, values: dict):
+        raw = json.dumps(values, default=lambda value: value.isoformat())
+        await self._redis.set(self._key(user_id), raw, ex=settings.USER_CACHE_SHARED_TTL)
+
+    async def delete(self, user_id: int):
+        await self._redis.delete(self._key(user_id))
+        await self._redis.publish(INVALIDATION_CHANNEL, str(user_id))
+
+    async def listen(self, on_invalidate):
+        """
+        Call on_invalidate(user_id) for invalidations published by any worker
+        """
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    await on_invalidate(int(message["data"]))
+        finally:
+            await pubsub.close()
+
+    async def close(self):
+        await self._redis.close()
+
+
+BACKENDS = {
+    MemoryUserBackend.name: MemoryUserBackend,
+    RedisUserBackend.name: RedisUserBackend,
+}
+
+
+class UserCache:
+    """Tiered cache in front of the get_current_user lookup"""
+
+    def __init__(self, backends: list):
+        self.backends = backends
+        self.stats = CacheStats()
+        # Bumped on invalidation so a load that raced a write is not cached
+        self._generations = {}
+        self._listener = None
+
+    async def _lookup(self, user_id: int) -> Optional[dict]:
+        for i, backend in enumerate(self.backends):
+            values = await backend.get(user_id)
+            if values is not None:
+                self.stats.hit(backend.name)
+                for earlier in self.backends[:i]:
+                    await earlier.set(user_id, values)
+                return values
+        return None
+
+    async def get_user(self, db: AsyncSession, user_id: int, min_version: int = 0) -> Optional[User]:
+        """
+        User attached to db, from the cache when possible
+
+        Cached rows older than min_version, the profile version in the
+        caller's access token, are reloaded. password_hash is not cached and
+        must not be read from the result.
+        """
+        values = await self._lookup(user_id)
+        if values is not None and values.get("profile_version", 0) >= min_version:
+            return await db.merge(user_from_dict(values), load=False)
+
+        self.stats.miss()
+        generation = self._generations.get(user_id, 0)
+        user = await db.get(User, user_id)
+        if user and self._generations.get(user_id, 0) == generation:
+            values = user_to_dict(user)
+            for backend in self.backends:
+                await backend.set(user_id, values)
+        return user
+
+    async def _evict_local(self, user_id: int):
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        for backend in self.backends:
+            if backend.name == MemoryUserBackend.name:
+                await backend.delete(user_id)
+
+    async def invalidate(self, user_id: int):
+        """
+        Drop a user from every tier after their row changes
+        """
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        for backend in self.backends:
+            await backend.delete(user_id)
+
+    async def start(self):
+        """
+        Follow invalidations from other workers when a shared tier is configured
+        """
+        for backend in self.backends:
+            if hasattr(backend, "listen"):
+                self._listener = asyncio.create_task(backend.listen(self._evict_local))
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        for backend in self.backends:
+            if hasattr(backend, "close"):
+                await backend.close()
+
+
+def get_user_cache() -> UserCache:
+    """
+    Build the cache tiers listed in USER_CACHE_BACKENDS
+    """
+    names = [name.strip() for name in settings.USER_CACHE_BACKENDS.split(",") if name.strip()]
+    return UserCache([BACKENDS[name]() for name in names])
+
+
+# Singleton instance
+user_cache = get_user_cache()
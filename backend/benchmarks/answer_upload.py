@@ -0,0 +1,131 @@
+"""
+Resumable Answer Upload Benchmark
+
+Delivers answer recordings over a simulated flaky link, once as a single
+multipart POST to /answer and once as resumable chunks, and reports bytes
+sent, requests made, wall time and the Python heap peak while the app
+handled them. A drop loses the request in flight: the single POST starts
+over, while the chunked client asks for the stored offset and resends only
+the lost chunk.
+
+    python -m benchmarks.answer_upload [--size-mb 5] [--drop-rate 0.2] [--interviews 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import tracemalloc
+from .common import configure_environment
+
+configure_environment()
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from .pool_occupancy import sign_up, install_fake_openai  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class FlakyLink:
+    """Drops each request with a probability that grows with its size"""
+
+    def __init__(self, drop_rate: float, seed: int):
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.bytes_sent = 0
+        self.requests = 0
+
+    def send(self, size: int) -> bool:
+        """
+        Count a request of size bytes; False if it was lost
+        """
+        self.requests += 1
+        self.bytes_sent += size
+        return self.random.random() < (1 - self.drop_rate) ** (size / MB)
+
+
+async def start_session(client: httpx.AsyncClient, headers: dict) -> int:
+    letter = (await client.post("/api/cover-letters", headers=headers, json={"content": "hello"})).json()
+    session = (await client.post(
+        "/api/interviews/start", headers=headers, json={"cover_letter_id": letter["id"]}
+    )).json()
+    return session["session_id"]
+
+
+async def single_post(client: httpx.AsyncClient, headers: dict, session_id: int, audio: bytes, link: FlakyLink):
+    while not link.send(len(audio)):
+        pass
+    response = await client.post(
+        f"/api/interviews/{session_id}/answer", headers=headers,
+        data={"turn_number": 1}, files={"audio": ("answer.webm", audio, "audio/webm")}
+    )
+    response.raise_for_status()
+
+
+async def chunked(client: httpx.AsyncClient, headers: dict, session_id: int, audio: bytes, link: FlakyLink):
+    upload = (await client.post(
+        f"/api/interviews/{session_id}/answer/uploads", headers=headers,
+        json={"turn_number": 1, "size": len(audio), "filename": "answer.webm", "content_type": "audio/webm"}
+    )).json()
+    url = f"/api/interviews/{session_id}/answer/uploads/{upload['upload_id']}"
+    offset, chunk_size = 0, upload["chunk_size"]
+
+    while offset < len(audio):
+        chunk = audio[offset:offset + chunk_size]
+        if not link.send(len(chunk)):
+            # Connection dropped; ask where to resume
+            link.send(0)
+            offset = (await client.get(url, headers=headers)).json()["offset"]
+            continue
+        response = await client.put(url, headers={**headers, "Upload-Offset": str(offset)}, content=chunk)
+        response.raise_for_status()
+        offset = response.json()["offset"]
+
+    link.send(0)
+    (await client.post(f"{url}/commit", headers=headers)).raise_for_status()
+
+
+async def run(size_mb: float, drop_rate: float, interviews: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    install_fake_openai(0.05)
+
+    audio = os.urandom(int(size_mb * MB))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        headers = await sign_up(client, 0)
+        print(f"{interviews} answers of {size_mb} MB, link drops {drop_rate:.0%} of requests per MB sent")
+
+        for name, deliver in (("single POST /answer", single_post), ("resumable chunks", chunked)):
+            link = FlakyLink(drop_rate, seed=1)
+            sessions = [await start_session(client, headers) for _ in range(interviews)]
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            for session_id in sessions:
+                await deliver(client, headers, session_id, audio, link)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"  {name:<20} sent {link.bytes_sent / MB / interviews:>6.1f} MB/answer  "
+                f"{link.requests / interviews:>5.1f} requests/answer  {elapsed / interviews * 1000:>7.1f} ms/answer  "
+                f"heap peak {peak / MB:>5.1f} MB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--drop-rate", type=float, default=0.2, help="chance a 1 MB transfer is lost")
+    parser.add_argument("--interviews", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.size_mb, args.drop_rate, args.interviews))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Answer Audio Normalization Benchmark
+
+Answers every turn of an interview with a synthetic browser recording,
+once as 48 kHz stereo WAV and once as 128 kbit/s stereo WebM/Opus, with
+AUDIO_NORMALIZE off and on. Both formats are normalized here, whatever
+AUDIO_NORMALIZE_CONTENT_TYPES says, to show the tradeoff. The app runs
+against the fake OpenAI and S3 servers, whose uploads are limited to
+--uplink-mbps so fewer bytes show up as lower latency. Reports the bytes
+stored and sent to Whisper, the size reduction, the time spent
+normalizing, and the POST /answer latency per turn next to the
+unnormalized run.
+
+    python -m benchmarks.audio_normalize [--seconds 45] [--turns 5] [--uplink-mbps 50]
+
+Needs ffmpeg with libopus on PATH, or AUDIO_FFMPEG_PATH.
+"""
+import argparse
+import array
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+from .common import configure_environment, percentiles
+from .fakes import FakeOpenAIConfig, ServerThread, build_fake_openai, build_fake_s3, free_port
+
+OPENAI_PORT = free_port()
+S3_PORT = free_port()
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{OPENAI_PORT}/v1"
+os.environ["AWS_S3_ENDPOINT_URL"] = f"http://127.0.0.1:{S3_PORT}"
+os.environ["STORAGE_BACKEND"] = "s3"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("OPENAI_RATE_LIMITS", json.dumps({
+    "gpt-4o": {"rpm": 100000, "tpm": 100000000},
+    "tts-1-hd": {"rpm": 100000},
+    "whisper-1": {"rpm": 100000},
+}))
+configure_environment()
+
+import httpx  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import storage_service  # noqa: E402
+from .answer_upload import start_session  # noqa: E402
+from .pool_occupancy import sign_up  # noqa: E402
+
+SAMPLE_RATE = 48000
+LEAD_SILENCE = 2.0
+TAIL_SILENCE = 3.0
+
+
+def _speech_like(seconds: float, rng: random.Random) -> array.array:
+    """
+    Voiced harmonics at a wandering pitch, gated at a syllable rate, with breath noise
+    """
+    samples = array.array("h")
+    pitch, phase = 150.0, 0.0
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        if i % 2400 == 0:
+            pitch = min(240.0, max(100.0, pitch + rng.uniform(-15, 15)))
+        phase += 2 * math.pi * pitch / SAMPLE_RATE
+        envelope = max(0.0, math.sin(2 * math.pi * 4.0 * t)) ** 0.5
+        voiced = math.sin(phase) + 0.5 * math.sin(2 * phase) + 0.25 * math.sin(3 * phase)
+        samples.append(int(8000 * envelope * voiced + rng.gauss(0, 300)))
+    return samples
+
+
+def _silence(seconds: float, rng: random.Random) -> array.array:
+    # Room tone around -60 dBFS
+    return array.array("h", (int(rng.gauss(0, 30)) for _ in range(int(seconds * SAMPLE_RATE))))
+
+
+def build_recordings(workdir: str, seconds: float, ffmpeg: str) -> dict:
+    """
+    Write the answer as stereo WAV, then encode it the way a browser recorder would
+    """
+    rng = random.Random(7)
+    blocks = [_speech_like(1.0, rng) for _ in range(4)]
+    mono = _silence(LEAD_SILENCE, rng)
+    for _ in range(int(seconds)):
+        mono.extend(rng.choice(blocks))
+    mono.extend(_silence(TAIL_SILENCE, rng))
+
+    stereo = array.array("h", bytes(len(mono) * 4))
+    stereo[0::2] = mono
+    stereo[1::2] = mono
+
+    wav_path = os.path.join(workdir, "answer.wav")
+    with wave.open(wav_path, "wb") as out:
+        out.setnchannels(2)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(stereo.tobytes())
+
+    webm_path = os.path.join(workdir, "answer.webm")
+    subprocess.run(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-i", wav_path,
+         "-c:a", "libopus", "-b:a", "128k", webm_path],
+        check=True
+    )
+
+    with open(wav_path, "rb") as f:
+        wav = f.read()
+    with open(webm_path, "rb") as f:
+        webm = f.read()
+    return {"WAV": ("answer.wav", wav, "audio/wav"), "WebM": ("answer.webm", webm, "audio/webm")}
+
+
+def _server_timing(header: str, name: str) -> float:
+    for entry in header.split(","):
+        metric, _, duration = entry.strip().partition(";dur=")
+        if metric == name:
+            return float(duration)
+    return 0.0
+
+
+async def answer_interview(client: httpx.AsyncClient, headers: dict, recording: tuple, turns: int) -> dict:
+    session_id = await start_session(client, headers)
+    latencies, normalize, stored = [], [], []
+
+    for turn_number in range(1, turns + 1):
+        start = asyncio.get_running_loop().time()
+        response = await client.post(
+            f"/api/interviews/{session_id}/answer", headers=headers,
+            data={"turn_number": turn_number}, files={"audio": recording}
+        )
+        latencies.append((asyncio.get_running_loop().time() - start) * 1000)
+        response.raise_for_status()
+
+        normalize.append(_server_timing(response.headers.get("server-timing", ""), "normalize"))
+        file_key = response.json()["answer_audio_url"].split(f"/{settings.AWS_S3_BUCKET}/", 1)[1]
+        stored.append((await storage_service.stat(file_key)).size)
+
+    return {"latency": percentiles(latencies), "normalize": percentiles(normalize), "stored": max(stored)}
+
+
+async def run(args, ffmpeg: str):
+    bandwidth = args.uplink_mbps * 1e6 / 8
+    openai_config = FakeOpenAIConfig(chat_latency=0.1, token_delay=0.001, upload_bandwidth=bandwidth)
+    openai_server = ServerThread(build_fake_openai(openai_config), OPENAI_PORT).start()
+    s3_server = ServerThread(build_fake_s3(0.01, bandwidth=bandwidth), S3_PORT).start()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    settings.INTERVIEW_MAX_TURNS = args.turns + 1
+    settings.AUDIO_FFMPEG_PATH = ffmpeg
+
+    with tempfile.TemporaryDirectory(prefix="bench_audio_") as workdir:
+        recordings = build_recordings(workdir, args.seconds, ffmpeg)
+
+        print(
+            f"{args.turns} turns per run, {args.seconds:.0f}s answers with {LEAD_SILENCE:.0f}s/{TAIL_SILENCE:.0f}s "
+            f"of silence around them, {args.uplink_mbps:g} Mbit/s to S3 and OpenAI, "
+            f"Opus at {settings.AUDIO_OPUS_BITRATE // 1000} kbit/s"
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            headers = await sign_up(client, 0)
+
+            for name, recording in recordings.items():
+                settings.AUDIO_NORMALIZE_CONTENT_TYPES = [recording[2]]
+                results = {}
+                for normalized in (False, True):
+                    settings.AUDIO_NORMALIZE = normalized
+                    results[normalized] = await answer_interview(client, headers, recording, args.turns)
+
+                original, result = len(recording[1]), results[True]
+                baseline = results[False]["latency"]["p50"]
+                print(f"  {name} input {original / 1024:,.0f} KB")
+                print(f"    as sent      stored/Whisper {results[False]['stored'] / 1024:>7,.0f} KB  "
+                      f"p50 {baseline:>7.1f} ms/turn")
+                print(f"    normalized   stored/Whisper {result['stored'] / 1024:>7,.0f} KB  "
+                      f"p50 {result['latency']['p50']:>7.1f} ms/turn  "
+                      f"({100 * (1 - result['stored'] / original):.0f}% smaller, "
+                      f"{result['latency']['p50'] - baseline:+.1f} ms, "
+                      f"normalize p50 {result['normalize']['p50']:.1f} ms)")
+
+    openai_server.stop()
+    s3_server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=45.0, help="length of speech in each answer")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--uplink-mbps", type=float, default=50.0)
+    args = parser.parse_args()
+
+    ffmpeg = shutil.which(settings.AUDIO_FFMPEG_PATH)
+    if ffmpeg is None:
+        sys.exit(f"{settings.AUDIO_FFMPEG_PATH} not found; install ffmpeg with libopus or set AUDIO_FFMPEG_PATH")
+    asyncio.run(run(args, ffmpeg))
+
+
+if __name__ == "__main__":
+    main()
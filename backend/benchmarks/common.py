@@ -0,0 +1,106 @@
+"""
+Shared Benchmark Helpers
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def configure_environment():
+    """
+    Point the app at throwaway local resources unless already configured
+
+    Must run before anything under app/ is imported.
+    """
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    defaults = {
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "SECRET_KEY": "benchmark-secret-key",
+        "OPENAI_API_KEY": "sk-benchmark",
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "AWS_S3_BUCKET": "benchmark",
+        "STORAGE_BACKEND": "local",
+        "LOCAL_STORAGE_PATH": f"{workdir}/storage",
+        "TTS_CACHE_DIR": f"{workdir}/tts_cache",
+        "JOB_WORKER_IN_PROCESS": "False",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    return workdir
+
+
+def percentiles(samples: list) -> dict:
+    """
+    Summarize latencies in milliseconds
+    """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def format_latency(stats: dict) -> str:
+    if not stats.get("count"):
+        return "no samples"
+    return (
+        f"n={stats['count']} mean={stats['mean']:.1f}ms p50={stats['p50']:.1f}ms "
+        f"p95={stats['p95']:.1f}ms p99={stats['p99']:.1f}ms max={stats['max']:.1f}ms"
+    )
+
+
+async def probe(client, interval: float, stop: asyncio.Event, samples: list):
+    """
+    Time a cheap endpoint until stop is set, to show event loop stalls
+    """
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+class StatementCounter:
+    """
+    Record SQL statements an engine executes while active
+
+        with StatementCounter(engine) as counter:
+            await client.get(...)
+        counter.count
+    """
+
+    def __init__(self, engine):
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        from sqlalchemy import event
+
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+
+        event.remove(self.engine, "before_cursor_execute", self._record)
@@ -0,0 +1,118 @@
+"""
+DB Throughput Benchmark
+
+Seeds job postings and cover letters for one user, then drives the list
+and detail endpoints with concurrent clients and reports requests/sec,
+while probing /health to show how much DB work stalls the event loop.
+
+    python -m benchmarks.db_throughput [--rows 200] [--concurrency 20] [--duration 5]
+
+Seeding uses a plain sync engine so the same script runs against any
+revision of the app; point DATABASE_URL at Postgres for realistic numbers.
+"""
+import argparse
+import asyncio
+import random
+import time
+from .common import configure_environment, percentiles, format_latency, probe
+
+configure_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import JobPosting, CoverLetter  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+
+def sync_url(url: str) -> str:
+    """
+    Driver-agnostic URL for seeding, so the benchmark runs against any engine setup
+    """
+    return url.replace("+aiosqlite", "").replace("+asyncpg", "")
+
+
+def seed(user_id: int, rows: int) -> dict:
+    engine = create_engine(sync_url(settings.DATABASE_URL))
+    with engine.begin() as conn:
+        conn.execute(insert(JobPosting.__table__), [
+            {
+                "user_id": user_id,
+                "title": f"Posting {i}",
+                "original_text": "Backend engineer posting. " * 200,
+                "ai_analysis": {"keywords": ["python", "fastapi"], "requirements": ["3+ years"]},
+            }
+            for i in range(rows)
+        ])
+        conn.execute(insert(CoverLetter.__table__), [
+            {"user_id": user_id, "content": "Cover letter body. " * 200, "ai_feedback": "Feedback. " * 50}
+            for _ in range(rows)
+        ])
+        posting_ids = [row[0] for row in conn.execute(JobPosting.__table__.select().with_only_columns(JobPosting.id))]
+        letter_ids = [row[0] for row in conn.execute(CoverLetter.__table__.select().with_only_columns(CoverLetter.id))]
+    engine.dispose()
+    return {"job-postings": posting_ids, "cover-letters": letter_ids}
+
+
+async def drive(client: httpx.AsyncClient, paths, concurrency: int, duration: float) -> dict:
+    samples = []
+    probe_samples = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, 0.01, stop, probe_samples))
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(paths())
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    return {"rps": len(samples) / elapsed, "latency": percentiles(samples), "health": percentiles(probe_samples)}
+
+
+async def run(rows: int, concurrency: int, duration: float):
+    engine = create_engine(sync_url(settings.DATABASE_URL))
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        user = (await client.post("/api/auth/register", json={"email": EMAIL, "password": PASSWORD})).json()
+        token = (await client.post("/api/auth/login", params={"email": EMAIL, "password": PASSWORD})).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        ids = seed(user["id"], rows)
+
+        scenarios = {}
+        for resource in ("job-postings", "cover-letters"):
+            scenarios[f"GET /api/{resource}"] = lambda resource=resource: f"/api/{resource}"
+            scenarios[f"GET /api/{resource}/{{id}}"] = (
+                lambda resource=resource: f"/api/{resource}/{random.choice(ids[resource])}"
+            )
+
+        for name, paths in scenarios.items():
+            result = await drive(client, paths, concurrency, duration)
+            print(f"{name:<32} {result['rps']:>8.1f} req/s  {format_latency(result['latency'])}")
+            print(f"{'  /health during run':<32} {'':>14}  {format_latency(result['health'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
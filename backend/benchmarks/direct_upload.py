@@ -0,0 +1,116 @@
+"""
+Direct-to-Storage Answer Upload Benchmark
+
+Runs the app against the fake S3 server, which verifies presigned requests
+as S3 does, and delivers answer recordings three ways: a multipart POST to
+/answer, resumable chunks, and a presigned POST straight to storage
+followed by a commit. Reports the recording bytes that passed through the
+app, the time requests to the app took, and the total time per answer.
+
+    python -m benchmarks.direct_upload [--size-mb 5] [--interviews 5]
+"""
+import argparse
+import asyncio
+import os
+import time
+from .common import configure_environment
+from .fakes import ServerThread, build_fake_s3, free_port
+
+S3_PORT = free_port()
+os.environ.setdefault("STORAGE_BACKEND", "s3")
+os.environ.setdefault("AWS_S3_ENDPOINT_URL", f"http://127.0.0.1:{S3_PORT}")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+configure_environment()
+
+import httpx  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from .answer_upload import FlakyLink, start_session, single_post, chunked  # noqa: E402
+from .pool_occupancy import sign_up, install_fake_openai  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class AppMeter(httpx.AsyncBaseTransport):
+    """Count request body bytes and time spent in requests to the app"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self.bytes = 0
+        self.seconds = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.seconds += time.perf_counter() - start
+        self.bytes += int(request.headers.get("Content-Length", 0))
+        return response
+
+
+async def direct(client: httpx.AsyncClient, headers: dict, session_id: int, audio: bytes, storage: httpx.AsyncClient):
+    response = await client.post(
+        f"/api/interviews/{session_id}/answer/uploads/direct", headers=headers,
+        json={"turn_number": 1, "size": len(audio), "filename": "answer.webm", "content_type": "audio/webm"}
+    )
+    response.raise_for_status()
+    presigned = response.json()
+
+    # Straight to storage; the app never sees these bytes
+    (await storage.post(
+        presigned["url"], data=presigned["fields"], files={"file": ("answer.webm", audio, "audio/webm")}
+    )).raise_for_status()
+
+    (await client.post(
+        f"/api/interviews/{session_id}/answer/uploads/{presigned['upload_id']}/commit", headers=headers
+    )).raise_for_status()
+
+
+async def run(size_mb: float, interviews: int):
+    s3_server = ServerThread(build_fake_s3(0.0, secret_key=settings.AWS_SECRET_ACCESS_KEY), S3_PORT).start()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    install_fake_openai(0.05)
+
+    audio = os.urandom(int(size_mb * MB))
+    meter = AppMeter(httpx.ASGITransport(app=app))
+    async with httpx.AsyncClient(transport=meter, base_url="http://bench", timeout=120) as client, \
+            httpx.AsyncClient(timeout=120) as storage:
+        headers = await sign_up(client, 0)
+        print(f"{interviews} answers of {size_mb} MB against the fake S3 at {settings.AWS_S3_ENDPOINT_URL}")
+
+        strategies = (
+            ("POST /answer", lambda *a: single_post(*a, FlakyLink(0.0, seed=1))),
+            ("resumable chunks", lambda *a: chunked(*a, FlakyLink(0.0, seed=1))),
+            ("presigned POST", lambda *a: direct(*a, storage)),
+        )
+        for name, deliver in strategies:
+            sessions = [await start_session(client, headers) for _ in range(interviews)]
+            meter.bytes, meter.seconds = 0, 0.0
+
+            start = time.perf_counter()
+            for session_id in sessions:
+                await deliver(client, headers, session_id, audio)
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"  {name:<17} through app {meter.bytes / MB / interviews:>6.2f} MB/answer  "
+                f"app requests {meter.seconds / interviews * 1000:>7.1f} ms/answer  "
+                f"total {elapsed / interviews * 1000:>7.1f} ms/answer"
+            )
+
+    s3_server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--interviews", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.size_mb, args.interviews))
+
+
+if __name__ == "__main__":
+    main()
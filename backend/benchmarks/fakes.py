@@ -0,0 +1,350 @@
+"""
+Fake OpenAI and S3 Servers
+
+Small HTTP servers that stand in for the OpenAI API and S3 so the app runs
+its real clients (AsyncOpenAI over httpx, boto3) against them. Point the
+app at them with OPENAI_BASE_URL and AWS_S3_ENDPOINT_URL. Each runs on its
+own thread and event loop, so fake latency never blocks the app's loop.
+
+Given the app's S3 secret key, the fake S3 also checks presigned requests
+as S3 does: SigV4 query signatures on PUTs, and the signature, expiry and
+policy conditions (key, content type, content-length-range) of browser
+form POSTs.
+"""
+import asyncio
+import base64
+import calendar
+import hashlib
+import hmac
+import json
+import re
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+TURN_ID = re.compile(r"\[ID (\d+)\]")
+FILLER = "지원자의 답변은 구조가 명확했지만 구체적인 수치와 사례를 덧붙이면 더 설득력이 있습니다. "
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Latency model for the fake OpenAI server"""
+    chat_latency: float = 0.2  # before the first token
+    token_delay: float = 0.005  # per completion token, streamed or not
+    completion_tokens: int = 60
+    tts_latency: float = 0.3
+    stt_latency: float = 0.4
+    upload_bandwidth: float = 0.0  # bytes per second for uploaded audio; 0 is unlimited
+
+
+def _completion_text(prompt: str, tokens: int) -> str:
+    """
+    Plausible content for whichever OpenAIService prompt this is
+    """
+    if '"keywords"' in prompt:
+        return json.dumps({"keywords": ["python", "fastapi"], "requirements": ["3년 이상 백엔드 경력"]})
+    if '"feedbacks"' in prompt:
+        ids = TURN_ID.findall(prompt)
+        return json.dumps({"feedbacks": [{"id": int(i), "feedback": FILLER.strip()} for i in ids]})
+    words = (FILLER * (tokens // 10 + 1)).split(" ")
+    return " ".join(words[:tokens])
+
+
+def _usage(messages: list, completion: str) -> dict:
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 3
+    completion_tokens = max(1, len(completion) // 3)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def build_fake_openai(config: FakeOpenAIConfig) -> Starlette:
+    """
+    Chat completions (plain and streamed), speech and transcription endpoints
+    """
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body["messages"]
+        completion = _completion_text(messages[-1]["content"], config.completion_tokens)
+        created = int(time.time())
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        await asyncio.sleep(config.chat_latency)
+
+        if body.get("stream"):
+            async def events():
+                pieces = completion.split(" ")
+                for i, piece in enumerate(pieces):
+                    await asyncio.sleep(config.token_delay)
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": body["model"],
+                        "choices": [{"index": 0, "delta": {"content": piece + (" " if i < len(pieces) - 1 else "")},
+                                     "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                done = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": body["model"], "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(config.token_delay * config.completion_tokens)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(messages, completion),
+        })
+
+    async def speech(request: Request):
+        body = await request.json()
+        await asyncio.sleep(config.tts_latency)
+        # Roughly 1KB of audio per 10 characters, like a low bitrate mp3
+        return Response(b"\xff\xfb" * (len(body.get("input", "")) * 50 + 512), media_type="audio/mpeg")
+
+    async def transcriptions(request: Request):
+        form = await request.form()
+        audio = form.get("file")
+        if audio is not None:
+            data = await audio.read()
+            if config.upload_bandwidth:
+                await asyncio.sleep(len(data) / config.upload_bandwidth)
+        await asyncio.sleep(config.stt_latency)
+        return JSONResponse({"text": "저는 결제 시스템의 백엔드를 맡아 피크 시간대의 응답 지연을 절반으로 줄였습니다."})
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1/audio/speech", speech, methods=["POST"]),
+        Route("/v1/audio/transcriptions", transcriptions, methods=["POST"]),
+    ])
+
+
+def _signing_key(secret_key: str, scope: str) -> bytes:
+    # scope is date/region/service/aws4_request
+    key = f"AWS4{secret_key}".encode()
+    for part in scope.split("/"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    return key
+
+
+def _amz_timestamp(value: str) -> float:
+    return calendar.timegm(time.strptime(value, "%Y%m%dT%H%M%SZ"))
+
+
+def _s3_error(status_code: int, code: str, message: str) -> Response:
+    xml = f"<Error><Code>{code}</Code><Message>{message}</Message></Error>"
+    return Response(xml, status_code=status_code, media_type="application/xml")
+
+
+def _check_presigned_query(request: Request, secret_key: str) -> Optional[Response]:
+    """
+    Verify a SigV4 presigned URL; None if it is valid
+    """
+    params = request.query_params
+    scope = params["X-Amz-Credential"].split("/", 1)[1]
+    if _amz_timestamp(params["X-Amz-Date"]) + int(params["X-Amz-Expires"]) < time.time():
+        return _s3_error(403, "AccessDenied", "Request has expired")
+
+    signed_headers = params["X-Amz-SignedHeaders"].split(";")
+    query = sorted((k, v) for k, v in params.multi_items() if k != "X-Amz-Signature")
+    canonical_request = "\n".join([
+        request.method,
+        quote(request.url.path, safe="/~"),
+        "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in query),
+        "".join(f"{name}:{request.headers.get(name, '').strip()}\n" for name in signed_headers),
+        ";".join(signed_headers),
+        "UNSIGNED-PAYLOAD",
+    ])
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", params["X-Amz-Date"], scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest(),
+    ])
+    expected = hmac.new(_signing_key(secret_key, scope), string_to_sign.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, params["X-Amz-Signature"]):
+        return _s3_error(403, "SignatureDoesNotMatch", "Signature or signed headers do not match")
+    return None
+
+
+def _check_post_policy(bucket: str, form: dict, size: int, secret_key: str) -> Optional[Response]:
+    """
+    Verify a browser form POST against its signed policy; None if it is allowed
+    """
+    scope = form["x-amz-credential"].split("/", 1)[1]
+    expected = hmac.new(_signing_key(secret_key, scope), form["policy"].encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, form.get("x-amz-signature", "")):
+        return _s3_error(403, "SignatureDoesNotMatch", "Policy signature does not match")
+
+    policy = json.loads(base64.b64decode(form["policy"]))
+    if calendar.timegm(time.strptime(policy["expiration"], "%Y-%m-%dT%H:%M:%SZ")) < time.time():
+        return _s3_error(403, "AccessDenied", "Policy has expired")
+
+    fields = {name.lower(): value for name, value in form.items()}
+    fields["bucket"] = bucket
+    for condition in policy["conditions"]:
+        if isinstance(condition, dict):
+            condition = ["eq", *next(iter(condition.items()))]
+        operator, name, value = condition
+        if operator == "content-length-range":
+            if not name <= size <= value:
+                return _s3_error(400, "EntityTooLarge" if size > value else "EntityTooSmall", "File size is outside the policy")
+            continue
+        actual = fields.get(name.lstrip("$").lower(), "")
+        if operator == "eq" and actual != value or operator == "starts-with" and not actual.startswith(value):
+            return _s3_error(403, "AccessDenied", f"Policy condition failed: {condition}")
+    return None
+
+
+def build_fake_s3(latency: float = 0.02, secret_key: Optional[str] = None, bandwidth: float = 0.0) -> Starlette:
+    """
+    Path-style object PUT/GET/HEAD/DELETE, multipart uploads and form POSTs, kept in memory
+
+    With secret_key, presigned PUTs and form POSTs are verified as S3 does;
+    header-signed SDK calls are always accepted. With bandwidth in bytes per
+    second, uploads take as long as sending their body would.
+    """
+    objects = {}
+    uploads = {}
+
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    async def receive(request: Request) -> bytes:
+        data = await request.body()
+        if bandwidth:
+            await asyncio.sleep(len(data) / bandwidth)
+        return data
+
+    async def object_handler(request: Request):
+        await asyncio.sleep(latency)
+        key = (request.path_params["bucket"], request.path_params["key"])
+        params = request.query_params
+
+        if request.method == "PUT" and "uploadId" in params:
+            data = await receive(request)
+            uploads[params["uploadId"]][int(params["partNumber"])] = data
+            return Response(headers={"ETag": etag(data)})
+
+        if request.method == "PUT" and "X-Amz-Signature" in params and secret_key:
+            denied = _check_presigned_query(request, secret_key)
+            if denied:
+                return denied
+
+        if request.method == "PUT":
+            data = await receive(request)
+            objects[key] = (data, request.headers.get("content-type", "application/octet-stream"))
+            return Response(headers={"ETag": etag(data)})
+
+        if request.method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            uploads[upload_id] = {}
+            xml = (
+                "<InitiateMultipartUploadResult>"
+                f"<Bucket>{key[0]}</Bucket><Key>{key[1]}</Key><UploadId>{upload_id}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+            return Response(xml, media_type="application/xml")
+
+        if request.method == "POST" and "uploadId" in params:
+            await request.body()
+            parts = uploads.pop(params["uploadId"], {})
+            data = b"".join(parts[number] for number in sorted(parts))
+            objects[key] = (data, "application/octet-stream")
+            xml = (
+                "<CompleteMultipartUploadResult>"
+                f"<Bucket>{key[0]}</Bucket><Key>{key[1]}</Key><ETag>{etag(data)}</ETag>"
+                "</CompleteMultipartUploadResult>"
+            )
+            return Response(xml, media_type="application/xml")
+
+        if request.method == "DELETE" and "uploadId" in params:
+            uploads.pop(params["uploadId"], None)
+            return Response(status_code=204)
+
+        if request.method == "DELETE":
+            objects.pop(key, None)
+            return Response(status_code=204)
+
+        stored = objects.get(key)
+        if stored is None:
+            return Response(status_code=404)
+        data, content_type = stored
+        if request.method == "HEAD":
+            return Response(headers={"Content-Length": str(len(data)), "ETag": etag(data)}, media_type=content_type)
+        return Response(data, media_type=content_type, headers={"ETag": etag(data)})
+
+    async def form_upload(request: Request):
+        await asyncio.sleep(latency)
+        bucket = request.path_params["bucket"]
+        async with request.form() as form:
+            upload = form["file"]
+            data = await upload.read()
+            fields = {name: value for name, value in form.items() if name != "file"}
+        if bandwidth:
+            await asyncio.sleep(len(data) / bandwidth)
+
+        if secret_key:
+            denied = _check_post_policy(bucket, fields, len(data), secret_key)
+            if denied:
+                return denied
+
+        content_type = next((v for k, v in fields.items() if k.lower() == "content-type"), "application/octet-stream")
+        objects[(bucket, fields["key"])] = (data, content_type)
+        return Response(status_code=204, headers={"ETag": etag(data)})
+
+    return Starlette(routes=[
+        Route("/{bucket}", form_upload, methods=["POST"]),
+        Route("/{bucket}/{key:path}", object_handler, methods=["GET", "HEAD", "PUT", "POST", "DELETE"]),
+    ])
+
+
+class ServerThread:
+    """Run an ASGI app under uvicorn on its own thread and event loop"""
+
+    def __init__(self, app, port: int = None):
+        import uvicorn
+
+        self.port = port or free_port()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "ServerThread":
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError(f"Server on port {self.port} exited during startup")
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
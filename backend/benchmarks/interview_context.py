@@ -0,0 +1,110 @@
+"""
+Interview Context Growth Benchmark
+
+Plays one long interview against a stand-in chat model and reports, per
+turn, the size of the prompt sent to generate the next question and the
+answer request latency. The stand-in takes longer for longer prompts, the
+way real completions do, so transcript-sized prompts show up as latency
+that climbs turn after turn.
+
+    python -m benchmarks.interview_context [--turns 20] [--answer-chars 600]
+
+Revisions with a fixed interview length stop after their last turn.
+"""
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from .common import configure_environment
+
+configure_environment()
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.services import openai_service  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from app.api.routes import interviews  # noqa: E402
+from app.main import app  # noqa: E402
+from .pool_occupancy import sign_up  # noqa: E402
+
+ANSWER = "저는 결제 시스템의 백엔드를 맡아 트래픽이 몰리는 시간대의 지연을 줄이는 작업을 했습니다. "
+
+
+def install_fake_chat(base_delay: float, ms_per_1k_chars: float, answer_chars: int, calls: list):
+    """
+    Stand in for chat completions, recording each prompt and sleeping in proportion to it
+    """
+    async def create(model, messages, **kwargs):
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        calls.append((messages[0]["content"], prompt_chars))
+        await asyncio.sleep(base_delay + prompt_chars * ms_per_1k_chars / 1_000_000)
+        content = "지금까지의 답변을 바탕으로 가장 어려웠던 기술적 결정과 그 이유를 설명해주세요."
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def transcribe_audio(audio):
+        await asyncio.sleep(base_delay)
+        return (ANSWER * (answer_chars // len(ANSWER) + 1))[:answer_chars]
+
+    async def cached_question_audio(text):
+        return "https://example.com/question.mp3"
+
+    openai_service.client.chat.completions.create = create
+    OpenAIService.transcribe_audio = staticmethod(transcribe_audio)
+    interviews.lookup_question_audio = cached_question_audio
+
+
+async def run(turns: int, answer_chars: int, base_delay: float, ms_per_1k_chars: float):
+    if hasattr(settings, "INTERVIEW_MAX_TURNS"):
+        settings.INTERVIEW_MAX_TURNS = turns
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    calls = []
+    install_fake_chat(base_delay, ms_per_1k_chars, answer_chars, calls)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        headers = await sign_up(client, 0)
+        letter = (await client.post(
+            "/api/cover-letters", headers=headers, json={"content": "I like building reliable systems."}
+        )).json()
+        session = (await client.post(
+            "/api/interviews/start", headers=headers, json={"cover_letter_id": letter["id"]}
+        )).json()
+
+        print(f"{'turn':>4} {'question prompt':>16} {'summary prompt':>15} {'answer latency':>15}")
+        turn_number = 1
+        while True:
+            calls.clear()
+            start = time.perf_counter()
+            response = await client.post(
+                f"/api/interviews/{session['session_id']}/answer", headers=headers,
+                data={"turn_number": turn_number},
+                files={"audio": ("answer.webm", b"\x1a" * 4096, "audio/webm")}
+            )
+            response.raise_for_status()
+            elapsed = (time.perf_counter() - start) * 1000
+            if response.json().get("interview_completed"):
+                break
+
+            question = sum(chars for system, chars in calls if "면접관" in system)
+            summary = sum(chars for system, chars in calls if "요약" in system)
+            print(f"{turn_number:>4} {question:>10} chars {summary:>9} chars {elapsed:>12.0f}ms")
+            turn_number += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--answer-chars", type=int, default=600, help="transcript length of each answer")
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="base latency of each model call")
+    parser.add_argument("--ms-per-1k-chars", type=float, default=100, help="added latency per 1000 prompt chars")
+    args = parser.parse_args()
+    asyncio.run(run(args.turns, args.answer_chars, args.llm_delay, args.ms_per_1k_chars))
+
+
+if __name__ == "__main__":
+    main()
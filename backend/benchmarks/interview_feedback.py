@@ -0,0 +1,138 @@
+"""
+Interview Feedback Latency Benchmark
+
+Plays concurrent interviews with the job worker running in process and
+reports how long each user waits between submitting the last answer and
+the result turning feedback_ready, plus how many answers each grading call
+covered. Users pause between answers as if recording the next one. The
+stand-in chat model takes longer the more answers it has to write feedback
+for, the way real completions do, so grading every turn after the
+interview ends shows up as a long final wait.
+
+    python -m benchmarks.interview_feedback [--interviews 10] [--turns 5] [--think-time 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from types import SimpleNamespace
+from .common import configure_environment, percentiles, format_latency
+
+configure_environment()
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Measure the feedback pipeline, not the default OpenAI budget
+os.environ.setdefault("OPENAI_RATE_LIMITS", '{"gpt-4o": {"rpm": 10000, "tpm": 10000000}}')
+
+import httpx  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.services import openai_service  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from app.services.job_queue import JobWorker  # noqa: E402
+from app.api.routes import interviews  # noqa: E402
+from app.main import app  # noqa: E402
+from .pool_occupancy import sign_up  # noqa: E402
+
+TURN_ID = re.compile(r"\[ID (\d+)\]")
+
+
+def install_fake_chat(base_delay: float, per_answer: float, batches: list):
+    """
+    Stand in for chat completions, sleeping longer for each answer graded
+    """
+    async def create(model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if "feedbacks" in prompt and "turn_feedbacks" not in prompt:
+            ids = TURN_ID.findall(prompt)
+            batches.append(len(ids))
+            await asyncio.sleep(base_delay + per_answer * len(ids))
+            content = json.dumps({"feedbacks": [{"id": int(i), "feedback": "구체적인 수치를 덧붙이세요."} for i in ids]})
+        elif "turn_feedbacks" in prompt:
+            # Revisions that grade the whole transcript in one call
+            answered = prompt.count("[답변 ")
+            batches.append(answered)
+            await asyncio.sleep(base_delay + per_answer * (answered + 1))
+            content = json.dumps({"total_feedback": "좋았습니다.", "turn_feedbacks": ["좋았습니다."] * answered})
+        else:
+            await asyncio.sleep(base_delay + (per_answer if "피드백" in prompt else 0))
+            content = "가장 어려웠던 기술적 결정과 그 이유를 설명해주세요."
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    async def transcribe_audio(audio):
+        await asyncio.sleep(base_delay)
+        return "저는 결제 시스템의 백엔드를 맡아 지연을 줄이는 작업을 했습니다."
+
+    async def cached_question_audio(text):
+        return "https://example.com/question.mp3"
+
+    openai_service.client.chat.completions.create = create
+    OpenAIService.transcribe_audio = staticmethod(transcribe_audio)
+    interviews.lookup_question_audio = cached_question_audio
+
+
+async def interview(client: httpx.AsyncClient, headers: dict, turns: int, think_time: float, waits: list):
+    letter = (await client.post(
+        "/api/cover-letters", headers=headers, json={"content": "I like building reliable systems."}
+    )).json()
+    session = (await client.post(
+        "/api/interviews/start", headers=headers, json={"cover_letter_id": letter["id"]}
+    )).json()
+
+    for turn_number in range(1, turns + 1):
+        await asyncio.sleep(think_time)
+        response = await client.post(
+            f"/api/interviews/{session['session_id']}/answer", headers=headers,
+            data={"turn_number": turn_number},
+            files={"audio": ("answer.webm", b"\x1a" * 4096, "audio/webm")}
+        )
+        response.raise_for_status()
+
+    finished = time.perf_counter()
+    while True:
+        result = (await client.get(f"/api/interviews/{session['session_id']}/result", headers=headers)).json()
+        if result["feedback_status"] != "feedback_pending":
+            break
+        await asyncio.sleep(0.05)
+    waits.append((time.perf_counter() - finished) * 1000)
+
+
+async def run(count: int, turns: int, think_time: float, base_delay: float, per_answer: float):
+    if hasattr(settings, "INTERVIEW_MAX_TURNS"):
+        settings.INTERVIEW_MAX_TURNS = turns
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    batches = []
+    install_fake_chat(base_delay, per_answer, batches)
+
+    worker = JobWorker(poll_interval=0.1)
+    await worker.start()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        users = await asyncio.gather(*[sign_up(client, i) for i in range(count)])
+        waits = []
+        await asyncio.gather(*[interview(client, headers, turns, think_time, waits) for headers in users])
+
+    await worker.stop()
+
+    print(f"Interviews: {count} x {turns} turns (LLM delay {base_delay}s + {per_answer}s per graded answer)")
+    print(f"  last answer -> feedback ready: {format_latency(percentiles(waits))}")
+    print(f"  grading calls: {len(batches)}, answers per call: {sorted(batches)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--think-time", type=float, default=5.0, help="seconds a user spends on each answer")
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="base latency of each model call")
+    parser.add_argument("--per-answer", type=float, default=1.5, help="added latency per answer graded")
+    args = parser.parse_args()
+    asyncio.run(run(args.interviews, args.turns, args.think_time, args.llm_delay, args.per_answer))
+
+
+if __name__ == "__main__":
+    main()
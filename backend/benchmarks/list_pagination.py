@@ -0,0 +1,145 @@
+"""
+List Endpoint Pagination Benchmark
+
+Seeds one user with many job postings, cover letters and interview
+sessions, then reports response size and latency for the list endpoints:
+the first page, a page deep into the list, and a walk over every page.
+Unpaginated revisions return everything in one response, which is
+reported as a single page.
+
+    python -m benchmarks.list_pagination [--rows 10000] [--limit 20] [--repeat 20]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from .common import configure_environment, percentiles, format_latency
+
+configure_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import JobPosting, CoverLetter, InterviewSession  # noqa: E402
+from app.main import app  # noqa: E402
+from .db_throughput import EMAIL, PASSWORD, sync_url  # noqa: E402
+
+ENDPOINTS = {
+    "/api/job-postings": "job_postings",
+    "/api/cover-letters": "cover_letters",
+    "/api/interviews/history": "interview_sessions",
+}
+
+
+def seed(user_id: int, rows: int):
+    start = datetime(2024, 1, 1)
+    engine = create_engine(sync_url(settings.DATABASE_URL))
+    with engine.begin() as conn:
+        conn.execute(insert(JobPosting.__table__), [
+            {
+                "user_id": user_id,
+                "title": f"Posting {i}",
+                "original_text": "Backend engineer posting. " * 160,
+                "ai_analysis": {"keywords": ["python", "fastapi"], "requirements": ["3+ years"]},
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        conn.execute(insert(CoverLetter.__table__), [
+            {
+                "user_id": user_id,
+                "content": "Cover letter body. " * 110,
+                "ai_feedback": "Feedback. " * 50,
+                "created_at": start + timedelta(seconds=i),
+                "updated_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        conn.execute(insert(InterviewSession.__table__), [
+            {
+                "user_id": user_id,
+                "cover_letter_id": 1,
+                "status": "completed",
+                "total_feedback": "Overall feedback. " * 60,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+
+        if engine.dialect.name == "sqlite":
+            for table in ENDPOINTS.values():
+                plan = conn.execute(text(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE user_id = :user_id "
+                    f"ORDER BY created_at DESC, id DESC LIMIT 21"
+                ), {"user_id": user_id}).all()
+                print(f"{table:<20} plan: {' / '.join(row[-1] for row in plan)}")
+    engine.dispose()
+
+
+async def fetch(client: httpx.AsyncClient, path: str, params: dict):
+    start = time.perf_counter()
+    response = await client.get(path, params=params)
+    response.raise_for_status()
+    elapsed = (time.perf_counter() - start) * 1000
+    body = response.json()
+    next_cursor = body.get("next_cursor") if isinstance(body, dict) else None
+    return elapsed, len(response.content), next_cursor
+
+
+async def measure(client: httpx.AsyncClient, path: str, limit: int, repeat: int):
+    first = []
+    for _ in range(repeat):
+        elapsed, size, cursor = await fetch(client, path, {"limit": limit})
+        first.append(elapsed)
+    print(f"{path}")
+    print(f"  first page   {size / 1024:>10.1f} KB  {format_latency(percentiles(first))}")
+
+    # Walk every page, remembering the cursor halfway through
+    pages, total_bytes, cursors = 1, size, []
+    walk_start = time.perf_counter()
+    while cursor:
+        cursors.append(cursor)
+        _, size, cursor = await fetch(client, path, {"limit": limit, "cursor": cursor})
+        pages += 1
+        total_bytes += size
+    walk = time.perf_counter() - walk_start
+
+    if cursors:
+        deep_cursor = cursors[len(cursors) // 2]
+        deep = []
+        for _ in range(repeat):
+            elapsed, size, _ = await fetch(client, path, {"limit": limit, "cursor": deep_cursor})
+            deep.append(elapsed)
+        print(f"  middle page  {size / 1024:>10.1f} KB  {format_latency(percentiles(deep))}")
+    print(f"  all pages    {total_bytes / 1024:>10.1f} KB  pages={pages} walk={walk:.2f}s")
+
+
+async def run(rows: int, limit: int, repeat: int):
+    engine = create_engine(sync_url(settings.DATABASE_URL))
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        user = (await client.post("/api/auth/register", json={"email": EMAIL, "password": PASSWORD})).json()
+        token = (await client.post("/api/auth/login", params={"email": EMAIL, "password": PASSWORD})).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        seed(user["id"], rows)
+
+        print(f"\n{rows} rows per list, limit={limit}")
+        for path in ENDPOINTS:
+            await measure(client, path, limit, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+End-to-End Load Test
+
+Starts fake OpenAI and S3 servers, points the app's real clients at them,
+serves app.main:app under uvicorn with the job worker running in process,
+and drives complete user journeys against it over HTTP, so streamed
+responses are timed as a browser sees them:
+
+    register -> login -> upload job posting PDF -> cover letter (streamed
+    feedback) -> start interview -> answer every turn -> wait for feedback
+
+Reports throughput, per-endpoint p50/p95/p99 and the app's event loop lag. Results
+can be saved as a JSON baseline and later runs compared against it, so a
+regression shows up as a failing comparison in review.
+
+    python -m benchmarks.load_test [--users 20] [--concurrency 10]
+    python -m benchmarks.load_test --save benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --compare benchmarks/baselines/load_test.json
+
+Uses a throwaway SQLite database unless DATABASE_URL is set, e.g. to Postgres.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import httpx
+from .common import configure_environment, percentiles
+from .fakes import FakeOpenAIConfig, ServerThread, build_fake_openai, build_fake_s3, free_port
+from .sample_pdfs import build_pdf
+
+# p95 may grow this much over the baseline before a comparison fails
+DEFAULT_TOLERANCE = 0.25
+# ...and by at least this many ms, so one outlier on a fast endpoint is not a regression
+DEFAULT_MIN_DELTA_MS = 100.0
+
+
+class LoopLagMonitor:
+    """Measure how late a periodic sleep wakes up on the event loop"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, (time.perf_counter() - start - self.interval) * 1000))
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class Recorder:
+    """Latency samples and errors by endpoint"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.requests = 0
+
+    def add(self, name: str, ms: float):
+        self.samples.setdefault(name, []).append(ms)
+
+    def error(self, name: str, detail: str):
+        self.errors.setdefault(name, []).append(detail)
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.add(name, (time.perf_counter() - start) * 1000)
+        self.requests += 1
+        if response.status_code >= 400:
+            self.error(name, f"{response.status_code} {response.text[:200]}")
+            response.raise_for_status()
+        return response
+
+    async def stream(self, client: httpx.AsyncClient, name: str, url: str, **kwargs) -> list:
+        """
+        Consume a server-sent event stream, timing the first event and the whole stream
+        """
+        events = []
+        start = time.perf_counter()
+        async with client.stream("POST", url, **kwargs) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self.error(name, f"{response.status_code} {response.text[:200]}")
+                response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    if not events:
+                        self.add(f"{name} (first event)", (time.perf_counter() - start) * 1000)
+                    events.append(line[len("event: "):])
+        self.add(name, (time.perf_counter() - start) * 1000)
+        self.requests += 1
+        return events
+
+
+async def journey(client: httpx.AsyncClient, index: int, turns: int, think_time: float, recorder: Recorder):
+    email = f"load{index}@example.com"
+    password = "load-test-password"
+
+    await recorder.request(client, "POST /auth/register", "POST", "/api/auth/register",
+                           json={"email": email, "password": password})
+    login = await recorder.request(client, "POST /auth/login", "POST", "/api/auth/login",
+                                   params={"email": email, "password": password})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    posting = (await recorder.request(
+        client, "POST /job-postings", "POST", "/api/job-postings", headers=headers,
+        files={"file": (f"posting{index}.pdf", build_pdf(1 + index % 5), "application/pdf")}
+    )).json()
+
+    events = await recorder.stream(
+        client, "POST /cover-letters/stream", "/api/cover-letters/stream", headers=headers,
+        json={"content": "결제 시스템 백엔드를 개발하며 대용량 트래픽을 다뤘습니다.", "job_posting_id": posting["id"]}
+    )
+    created = next((e for e in events if e == "created"), None)
+    if created is None or events[-1] != "done":
+        recorder.error("POST /cover-letters/stream", f"unexpected events {events[-3:]}")
+
+    letters = (await recorder.request(
+        client, "GET /cover-letters", "GET", "/api/cover-letters", headers=headers, params={"limit": 10}
+    )).json()
+    letter_id = letters["items"][0]["id"]
+
+    session = (await recorder.request(
+        client, "POST /interviews/start", "POST", "/api/interviews/start", headers=headers,
+        json={"cover_letter_id": letter_id}
+    )).json()
+    session_id = session["session_id"]
+
+    for turn_number in range(1, session.get("max_turns", turns) + 1):
+        await asyncio.sleep(think_time)
+        await recorder.request(
+            client, "POST /interviews/{id}/answer", "POST", f"/api/interviews/{session_id}/answer",
+            headers=headers, data={"turn_number": turn_number},
+            files={"audio": ("answer.webm", os.urandom(64 * 1024), "audio/webm")}
+        )
+
+    finished = time.perf_counter()
+    while True:
+        result = (await recorder.request(
+            client, "GET /interviews/{id}/result", "GET", f"/api/interviews/{session_id}/result", headers=headers
+        )).json()
+        if result["feedback_status"] != "feedback_pending":
+            break
+        await asyncio.sleep(0.1)
+    recorder.add("feedback ready after last answer", (time.perf_counter() - finished) * 1000)
+    if result["feedback_status"] != "feedback_ready":
+        recorder.error("feedback", result["feedback_status"])
+
+    await recorder.request(client, "GET /interviews/history", "GET", "/api/interviews/history", headers=headers)
+
+
+def configure(openai_port: int, s3_port: int):
+    """
+    Point the app at the fake servers; must run before anything under app/ is imported
+    """
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{openai_port}/v1"
+    os.environ["AWS_S3_ENDPOINT_URL"] = f"http://127.0.0.1:{s3_port}"
+    os.environ["STORAGE_BACKEND"] = "s3"
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ["JOB_WORKER_IN_PROCESS"] = "True"
+    os.environ.setdefault("JOB_POLL_INTERVAL", "0.1")
+    # Measure the app, not the default OpenAI budget
+    os.environ.setdefault("OPENAI_RATE_LIMITS", json.dumps({
+        "gpt-4o": {"rpm": 100000, "tpm": 100000000},
+        "tts-1-hd": {"rpm": 100000},
+        "whisper-1": {"rpm": 100000},
+    }))
+    configure_environment()
+
+
+async def run(args, openai_port: int, s3_port: int) -> dict:
+    # Imported only once configure() has set up the environment
+    from app.core.config import settings
+    from app.core.database import Base, engine, pool_metrics
+    from app.main import app
+
+    if hasattr(settings, "INTERVIEW_MAX_TURNS"):
+        settings.INTERVIEW_MAX_TURNS = args.turns
+
+    openai_config = FakeOpenAIConfig(
+        chat_latency=args.llm_latency,
+        token_delay=args.token_delay,
+        completion_tokens=args.completion_tokens,
+        tts_latency=args.tts_latency,
+        stt_latency=args.stt_latency
+    )
+    openai_server = ServerThread(build_fake_openai(openai_config), openai_port).start()
+    s3_server = ServerThread(build_fake_s3(args.s3_latency), s3_port).start()
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    recorder = Recorder()
+    monitor = LoopLagMonitor()
+    # The engine and the loop worth watching belong to the server's thread, not this client's
+    app.router.on_startup.insert(0, create_tables)
+    app.router.on_startup.append(monitor.start)
+    app.router.on_shutdown.append(monitor.stop)
+    app_server = ServerThread(app).start()
+    pool_metrics.reset()
+
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def limited(client, index):
+        async with limit:
+            try:
+                await journey(client, index, args.turns, args.think_time, recorder)
+            except httpx.HTTPError as e:
+                recorder.error("journey", repr(e))
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=app_server.url, timeout=120) as client:
+        await asyncio.gather(*[limited(client, i) for i in range(args.users)])
+    elapsed = time.perf_counter() - start
+
+    app_server.stop()
+    openai_server.stop()
+    s3_server.stop()
+
+    return {
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "turns": args.turns,
+            "think_time": args.think_time,
+            "llm_latency": args.llm_latency,
+            "token_delay": args.token_delay,
+            "completion_tokens": args.completion_tokens,
+            "tts_latency": args.tts_latency,
+            "stt_latency": args.stt_latency,
+            "s3_latency": args.s3_latency,
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+        },
+        "throughput": {
+            "elapsed_s": round(elapsed, 2),
+            "journeys_per_s": round(args.users / elapsed, 3),
+            "requests_per_s": round(recorder.requests / elapsed, 2),
+        },
+        "endpoints": {
+            name: {key: round(value, 1) for key, value in percentiles(values).items()}
+            for name, values in sorted(recorder.samples.items())
+        },
+        "loop_lag_ms": {key: round(value, 2) for key, value in percentiles(monitor.samples).items()},
+        "db_pool": pool_metrics.as_dict(),
+        "errors": {name: len(details) for name, details in recorder.errors.items()},
+        "error_samples": {name: details[:3] for name, details in recorder.errors.items()},
+    }
+
+
+def print_report(results: dict):
+    throughput = results["throughput"]
+    print(
+        f"{results['config']['users']} journeys in {throughput['elapsed_s']}s: "
+        f"{throughput['journeys_per_s']} journeys/s, {throughput['requests_per_s']} req/s "
+        f"({results['config']['database']})"
+    )
+    print(f"{'endpoint':<48} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, stats in results["endpoints"].items():
+        print(f"{name:<48} {stats['count']:>5} {stats['p50']:>7.1f}ms {stats['p95']:>7.1f}ms {stats['p99']:>7.1f}ms")
+    lag = results["loop_lag_ms"]
+    print(f"event loop lag: p50={lag.get('p50', 0):.2f}ms p99={lag.get('p99', 0):.2f}ms max={lag.get('max', 0):.2f}ms")
+    if results["errors"]:
+        print(f"errors: {results['errors']}")
+        for name, details in results["error_samples"].items():
+            print(f"  {name}: {details[0]}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    """
+    p95 regressions beyond tolerance, printed next to the baseline
+    """
+    regressions = []
+    print(f"\n{'endpoint':<48} {'baseline p95':>13} {'now p95':>10} {'change':>8}")
+    for name, stats in results["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before.get("p95"):
+            print(f"{name:<48} {'-':>13} {stats['p95']:>8.1f}ms {'new':>8}")
+            continue
+        change = stats["p95"] / before["p95"] - 1
+        flag = ""
+        if change > tolerance and stats["p95"] - before["p95"] > min_delta_ms:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<48} {before['p95']:>11.1f}ms {stats['p95']:>8.1f}ms {change:>+7.0%}{flag}")
+
+    before_rps = baseline.get("throughput", {}).get("requests_per_s")
+    if before_rps:
+        change = results["throughput"]["requests_per_s"] / before_rps - 1
+        print(f"{'requests/s':<48} {before_rps:>13} {results['throughput']['requests_per_s']:>10} {change:>+7.0%}")
+        if change < -tolerance:
+            regressions.append("requests/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="journeys to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="journeys in flight at once")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--think-time", type=float, default=0.5, help="pause before each answer")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake OpenAI time to first token")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="fake OpenAI time per completion token")
+    parser.add_argument("--completion-tokens", type=int, default=60)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--stt-latency", type=float, default=0.4)
+    parser.add_argument("--s3-latency", type=float, default=0.02)
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p95 growth, 0.25 = 25%%")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA_MS, help="smallest p95 growth in ms that fails")
+    args = parser.parse_args()
+
+    openai_port, s3_port = free_port(), free_port()
+    configure(openai_port, s3_port)
+    results = asyncio.run(run(args, openai_port, s3_port))
+    print_report(results)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        if regressions or results["errors"]:
+            print(f"\nFailed: regressions in {regressions}" if regressions else "\nFailed: errors during the run")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
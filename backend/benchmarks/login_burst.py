@@ -0,0 +1,71 @@
+"""
+Login Burst Benchmark
+
+Fires a burst of concurrent logins while probing a cheap endpoint, to show
+that bcrypt work no longer stalls the rest of the worker.
+
+    python -m benchmarks.login_burst [--logins 200] [--probe-interval 0.01]
+"""
+import argparse
+import asyncio
+import time
+from .common import configure_environment, percentiles, format_latency, probe
+
+configure_environment()
+
+import httpx  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+
+async def login(client: httpx.AsyncClient, samples: list):
+    start = time.perf_counter()
+    response = await client.post("/api/auth/login", params={"email": EMAIL, "password": PASSWORD})
+    response.raise_for_status()
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def run(logins: int, probe_interval: float):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/auth/register", json={"email": EMAIL, "password": PASSWORD})
+
+        baseline = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, probe_interval, stop, baseline))
+        await asyncio.sleep(1)
+        stop.set()
+        await prober
+
+        login_samples = []
+        probe_samples = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, probe_interval, stop, probe_samples))
+        start = time.perf_counter()
+        await asyncio.gather(*[login(client, login_samples) for _ in range(logins)])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    print(f"Logins:         {logins} in {elapsed:.2f}s ({logins / elapsed:.1f} logins/s)")
+    print(f"Login latency:  {format_latency(percentiles(login_samples))}")
+    print(f"/health idle:   {format_latency(percentiles(baseline))}")
+    print(f"/health burst:  {format_latency(percentiles(probe_samples))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+PDF Extraction Benchmark
+
+Reports pages per second for each extractor over the sample corpus, or
+over a directory of real postings.
+
+    python -m benchmarks.pdf_extract [--corpus DIR] [--repeat N]
+"""
+import argparse
+import glob
+import io
+import os
+import tempfile
+import time
+from .common import configure_environment
+
+configure_environment()
+
+import PyPDF2  # noqa: E402
+from app.services.pdf_service import EXTRACTORS  # noqa: E402
+from .sample_pdfs import write_corpus  # noqa: E402
+
+MAX_PAGES = 10_000
+
+
+def count_pages(content: bytes) -> int:
+    return len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+
+
+def run(paths: list, repeat: int) -> dict:
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        documents.append((os.path.basename(path), content, count_pages(content)))
+
+    results = {}
+    for engine, extract in EXTRACTORS.items():
+        print(f"\n[{engine}]")
+        total_pages = 0
+        total_seconds = 0.0
+        for name, content, pages in documents:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                extract(content, MAX_PAGES)
+            elapsed = (time.perf_counter() - start) / repeat
+            total_pages += pages
+            total_seconds += elapsed
+            print(f"  {name:<24} {pages:>4} pages  {elapsed * 1000:>9.1f} ms  {pages / elapsed:>8.1f} pages/s")
+        results[engine] = total_pages / total_seconds
+        print(f"  {'total':<24} {total_pages:>4} pages  {total_seconds * 1000:>9.1f} ms  {results[engine]:>8.1f} pages/s")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of PDFs (defaults to the generated sample corpus)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    else:
+        paths = write_corpus(tempfile.mkdtemp(prefix="pdf_corpus_"))
+
+    results = run(paths, args.repeat)
+    fastest = max(results, key=results.get)
+    print(f"\nFastest extractor: {fastest} (set PDF_EXTRACTOR={fastest})")
+
+
+if __name__ == "__main__":
+    main()
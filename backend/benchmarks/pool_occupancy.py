@@ -0,0 +1,131 @@
+"""
+Connection Pool Occupancy Benchmark
+
+Runs concurrent interviews against slow stand-ins for OpenAI, then reports
+how long requests kept pooled connections checked out and the peak number
+in use. Handlers that hold a connection across LLM, TTS or storage calls
+show hold times as long as those calls.
+
+    python -m benchmarks.pool_occupancy [--interviews 30] [--turns 2] [--llm-delay 0.5]
+"""
+import argparse
+import asyncio
+import os
+import time
+from .common import configure_environment, percentiles, format_latency
+
+configure_environment()
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from app.core.database import Base, engine, pool_metrics  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from app.main import app  # noqa: E402
+from .sample_pdfs import build_pdf  # noqa: E402
+
+
+def install_fake_openai(delay: float):
+    """
+    Replace OpenAI calls with sleeps of a realistic order of magnitude
+    """
+    async def analyze_job_posting(text):
+        await asyncio.sleep(delay)
+        return {"keywords": ["python"], "requirements": []}
+
+    async def generate_cover_letter_feedback(**kwargs):
+        await asyncio.sleep(delay)
+        return "feedback"
+
+    async def generate_interview_question(**kwargs):
+        await asyncio.sleep(delay)
+        return f"Question {kwargs.get('turn_number')}: tell me about a project you are proud of."
+
+    async def summarize_interview(summary, turns):
+        await asyncio.sleep(delay)
+        return f"{summary} The candidate described {len(turns)} more projects.".strip()
+
+    async def generate_tts(text):
+        await asyncio.sleep(delay / 2)
+        return b"\x00" * 1024
+
+    async def transcribe_audio(audio):
+        await asyncio.sleep(delay)
+        return "I built the backend for a hiring platform."
+
+    for func in (analyze_job_posting, generate_cover_letter_feedback, generate_interview_question,
+                 summarize_interview, generate_tts, transcribe_audio):
+        setattr(OpenAIService, func.__name__, staticmethod(func))
+
+
+async def sign_up(client: httpx.AsyncClient, index: int) -> dict:
+    email = f"bench{index}@example.com"
+    await client.post("/api/auth/register", json={"email": email, "password": "benchmark-password"})
+    login = await client.post("/api/auth/login", params={"email": email, "password": "benchmark-password"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+async def interview(client: httpx.AsyncClient, index: int, headers: dict, turns: int, samples: dict):
+    async def timed(name, method, url, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        return response.json()
+
+    posting = await timed(
+        "POST /job-postings", "POST", "/api/job-postings", headers=headers,
+        files={"file": (f"posting{index}.pdf", build_pdf(1 + index % 3), "application/pdf")}
+    )
+    letter = await timed(
+        "POST /cover-letters", "POST", "/api/cover-letters", headers=headers,
+        json={"content": "I like building reliable systems.", "job_posting_id": posting["id"]}
+    )
+    session = await timed(
+        "POST /interviews/start", "POST", "/api/interviews/start", headers=headers,
+        json={"cover_letter_id": letter["id"]}
+    )
+    for turn_number in range(1, turns + 1):
+        await timed(
+            "POST /interviews/{id}/answer", "POST", f"/api/interviews/{session['session_id']}/answer",
+            headers=headers, data={"turn_number": turn_number},
+            files={"audio": ("answer.webm", b"\x1a" * 4096, "audio/webm")}
+        )
+
+
+async def run(interviews: int, turns: int, delay: float):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    install_fake_openai(delay)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        users = await asyncio.gather(*[sign_up(client, i) for i in range(interviews)])
+
+        pool_metrics.reset()
+        samples = {}
+        start = time.perf_counter()
+        await asyncio.gather(*[interview(client, i, headers, turns, samples) for i, headers in enumerate(users)])
+        elapsed = time.perf_counter() - start
+
+    print(f"Interviews: {interviews} x {turns} turns in {elapsed:.2f}s (LLM delay {delay}s)")
+    for name, values in samples.items():
+        print(f"  {name:<30} {format_latency(percentiles(values))}")
+
+    stats = pool_metrics.as_dict()
+    print(
+        f"Pool: peak in use={stats['peak']} checkouts={stats['checkouts']} "
+        f"hold p50={stats['hold_ms_p50']}ms p95={stats['hold_ms_p95']}ms max={stats['hold_ms_max']}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--llm-delay", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.interviews, args.turns, args.llm_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Interview Query Count Check
+
+Plays one interview to the end and counts the SQL statements each interview
+endpoint runs at every turn. Exits non-zero if an endpoint's count changes
+as turns accumulate or goes over its budget, so N+1 loads show up here.
+
+    python -m benchmarks.query_count [--verbose]
+
+Question audio is reported as already cached, so no background render
+writes to the database while a request is being counted. Answers after
+the first INTERVIEW_CONTEXT_RECENT_TURNS also store the rolling summary of
+the turns leaving the verbatim window, and are budgeted separately.
+"""
+import argparse
+import asyncio
+import sys
+from .common import configure_environment, StatementCounter
+
+configure_environment()
+
+import httpx  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.api.routes import interviews  # noqa: E402
+from .pool_occupancy import install_fake_openai, sign_up  # noqa: E402
+from .sample_pdfs import build_pdf  # noqa: E402
+
+# Most statements one request of each kind may run. A non-final answer
+# also INSERTs its turn-feedback job in the same transaction as the answer,
+# so grading is never lost between commit and enqueue.
+STATEMENT_BUDGET = {
+    "POST /interviews/start": 4,
+    "POST /interviews/{id}/answer": 6,
+    "POST /interviews/{id}/answer (summary fold)": 7,
+    "POST /interviews/{id}/answer (last)": 6,
+    "GET /interviews/{id}/result": 1,
+    "GET /interviews/{id}/turns/{turn}/audio": 1,
+    "GET /interviews/history": 1,
+}
+
+
+async def cached_question_audio(text: str):
+    return "https://example.com/question.mp3"
+
+
+async def play_interview(verbose: bool = False) -> dict:
+    """
+    Statement counts per endpoint, one entry per request, over a whole interview
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    install_fake_openai(0)
+    interviews.lookup_question_audio = cached_question_audio
+
+    counts = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        headers = await sign_up(client, 0)
+
+        async def counted(name, method, url, **kwargs):
+            with StatementCounter(engine) as counter:
+                response = await client.request(method, url, headers=headers, **kwargs)
+            response.raise_for_status()
+            counts.setdefault(name, []).append(counter.count)
+            if verbose:
+                print(f"{name} ({counter.count})")
+                for statement in counter.statements:
+                    print("    " + " ".join(statement.split())[:160])
+            return response.json()
+
+        posting = (await client.post(
+            "/api/job-postings", headers=headers,
+            files={"file": ("posting.pdf", build_pdf(1), "application/pdf")}
+        )).json()
+        letter = (await client.post(
+            "/api/cover-letters", headers=headers,
+            json={"content": "I like building reliable systems.", "job_posting_id": posting["id"]}
+        )).json()
+
+        session = await counted(
+            "POST /interviews/start", "POST", "/api/interviews/start",
+            json={"cover_letter_id": letter["id"]}
+        )
+        session_id = session["session_id"]
+
+        turn_number = 1
+        while True:
+            await counted(
+                "GET /interviews/{id}/turns/{turn}/audio", "GET",
+                f"/api/interviews/{session_id}/turns/{turn_number}/audio"
+            )
+            answer_name = "POST /interviews/{id}/answer"
+            if turn_number > settings.INTERVIEW_CONTEXT_RECENT_TURNS:
+                answer_name += " (summary fold)"
+            answer = await counted(
+                answer_name, "POST", f"/api/interviews/{session_id}/answer",
+                data={"turn_number": turn_number},
+                files={"audio": ("answer.webm", b"\x1a" * 4096, "audio/webm")}
+            )
+            await counted("GET /interviews/{id}/result", "GET", f"/api/interviews/{session_id}/result")
+            await counted("GET /interviews/history", "GET", "/api/interviews/history")
+            if answer.get("interview_completed"):
+                break
+            turn_number += 1
+
+    # The answer that ends the interview takes a different path
+    answers = counts[answer_name]
+    counts["POST /interviews/{id}/answer (last)"] = [answers.pop()]
+    if not answers:
+        del counts[answer_name]
+    return counts
+
+
+def check(name: str, values: list) -> list:
+    """
+    What is wrong with an endpoint's statement counts, if anything
+    """
+    budget = STATEMENT_BUDGET[name]
+    problems = []
+    if len(set(values)) > 1:
+        problems.append("varies with turns")
+    if max(values) > budget:
+        problems.append(f"over budget of {budget}")
+    return problems
+
+
+async def run(verbose: bool) -> bool:
+    counts = await play_interview(verbose)
+
+    ok = True
+    print(f"Statements per request over a {len(counts['GET /interviews/history'])}-turn interview")
+    for name, values in counts.items():
+        problems = check(name, values)
+        ok = ok and not problems
+        print(f"  {name:<46} {' '.join(str(v) for v in values):<20} {', '.join(problems) or 'ok'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print every statement")
+    args = parser.parse_args()
+    if not asyncio.run(run(args.verbose)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+OpenAI Rate Limit Benchmark
+
+One user fires a burst of job posting analyses while a second user sends a
+few shortly after, against a stand-in chat model that answers a share of
+calls with 429. Reports how long each user's calls took, how many failed,
+and the governor's queue counters. With the fair queue the light user is
+served between the heavy user's calls instead of behind the whole burst,
+and 429s are retried instead of surfacing as errors.
+
+    python -m benchmarks.rate_limit [--heavy 40] [--light 3] [--rpm 30] [--error-rate 0.1]
+"""
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from .common import configure_environment, percentiles, format_latency
+
+configure_environment()
+
+import httpx  # noqa: E402
+from openai import RateLimitError  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services import openai_service  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from app.services.rate_limiter import RateLimiter, MemoryRateLimitBackend, set_caller  # noqa: E402
+
+
+def install_fake_chat(delay: float, error_rate: float):
+    """
+    Stand in for chat completions, rejecting a share of calls with 429
+    """
+    async def create(model, messages, **kwargs):
+        await asyncio.sleep(delay)
+        if random.random() < error_rate:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            response = httpx.Response(429, request=request, headers={"retry-after": "0.2"})
+            raise RateLimitError("Rate limit reached", response=response, body=None)
+        content = '{"keywords": ["python"], "requirements": ["3년 이상 경력"]}'
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=400)
+        )
+
+    openai_service.client.chat.completions.create = create
+
+
+async def user_calls(user: str, count: int, delay: float, latencies: list, errors: list):
+    await asyncio.sleep(delay)
+    set_caller(user)
+
+    async def one():
+        start = time.perf_counter()
+        try:
+            await OpenAIService.analyze_job_posting("Backend engineer, Python, 3+ years")
+        except Exception as e:
+            errors.append(e)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def run(heavy: int, light: int, rpm: int, llm_delay: float, error_rate: float):
+    settings.OPENAI_RETRY_BASE_DELAY = 0.1
+    openai_service.rate_limiter = RateLimiter(MemoryRateLimitBackend(), {"gpt-4o": {"rpm": rpm, "tpm": rpm * 2000}})
+    install_fake_chat(llm_delay, error_rate)
+
+    results = {"heavy": ([], []), "light": ([], [])}
+    await asyncio.gather(
+        user_calls("heavy", heavy, 0, *results["heavy"]),
+        user_calls("light", light, 0.5, *results["light"]),
+    )
+
+    for user, (latencies, errors) in results.items():
+        print(f"{user:>5}: {format_latency(percentiles(latencies))} errors={len(errors)}")
+    print(f"governor: {openai_service.rate_limiter.as_dict()['gpt-4o']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--heavy", type=int, default=40, help="calls in the first user's burst")
+    parser.add_argument("--light", type=int, default=3, help="calls from the second user")
+    parser.add_argument("--rpm", type=int, default=30, help="requests per minute budget")
+    parser.add_argument("--llm-delay", type=float, default=0.2, help="latency of each model call")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="share of calls answered with 429")
+    args = parser.parse_args()
+    asyncio.run(run(args.heavy, args.light, args.rpm, args.llm_delay, args.error_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Refresh Token Rotation Benchmark
+
+Seeds the refresh_sessions table with many sessions, then reports what the
+rotation store adds to /auth/refresh (one conditional UPDATE by primary
+key) next to the cheapest committed write on the same database, the full
+/auth/refresh latency, the cost of the in-memory revocation check every
+authenticated request makes, and how long compacting expired sessions
+takes.
+
+    python -m benchmarks.refresh_rotation [--sessions 200000] [--rotations 500]
+"""
+import argparse
+import asyncio
+import time
+from .common import configure_environment, percentiles, format_latency
+
+configure_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, update  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import decode_token  # noqa: E402
+from app.models import RefreshSession  # noqa: E402
+from app.services.refresh_tokens import RevocationIndex, refresh_store  # noqa: E402
+from app.main import app  # noqa: E402
+from .pool_occupancy import sign_up  # noqa: E402
+
+SEED_BATCH = 10000
+
+
+async def seed(user_id: int, count: int):
+    """
+    Sessions from other logins; every other one already expired
+    """
+    now = time.time()
+    async with SessionLocal() as db:
+        for start in range(0, count, SEED_BATCH):
+            await db.execute(insert(RefreshSession), [
+                {
+                    "id": f"{i:032x}",
+                    "user_id": user_id,
+                    "current_jti": f"{i:032x}",
+                    "expires_at": now + 86400 if i % 2 else now - 60,
+                }
+                for i in range(start, min(start + SEED_BATCH, count))
+            ])
+        await db.commit()
+
+
+async def login(client: httpx.AsyncClient, index: int) -> dict:
+    response = await client.post(
+        "/api/auth/login", params={"email": f"bench{index}@example.com", "password": "benchmark-password"}
+    )
+    return response.json()
+
+
+def revocation_lookups(entries: int, lookups: int) -> float:
+    """
+    Nanoseconds per membership check with this many revoked sessions held
+    """
+    index = RevocationIndex()
+    until = time.time() + 900
+    for i in range(entries):
+        index.add(f"{i:032x}", until)
+    probes = [f"{i * 7919 % (entries * 2):032x}" for i in range(1000)]
+    start = time.perf_counter()
+    for i in range(lookups):
+        probes[i % 1000] in index
+    return (time.perf_counter() - start) / lookups * 1e9
+
+
+async def run(sessions: int, rotations: int, revoked: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await sign_up(client, 0)
+        start = time.perf_counter()
+        await seed(1, sessions)
+        print(f"Seeded {sessions} refresh sessions in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+        # Floor: any single-row write and commit on this database
+        floor_samples = []
+        async with SessionLocal() as db:
+            for _ in range(rotations):
+                start = time.perf_counter()
+                await db.execute(
+                    update(RefreshSession).where(RefreshSession.id == f"{1:032x}").values(rotated_at=time.time())
+                )
+                await db.commit()
+                floor_samples.append((time.perf_counter() - start) * 1000)
+        print(f"  one-row write:        {format_latency(percentiles(floor_samples))}")
+
+        # Store only: the rotation UPDATE and commit
+        payload = decode_token((await login(client, 0))["refresh_token"])
+        store_samples = []
+        async with SessionLocal() as db:
+            for _ in range(rotations):
+                start = time.perf_counter()
+                token = await refresh_store.rotate(db, payload)
+                store_samples.append((time.perf_counter() - start) * 1000)
+                payload = decode_token(token)
+        print(f"  refresh_store.rotate: {format_latency(percentiles(store_samples))}")
+
+        # End to end through the route
+        token = (await login(client, 0))["refresh_token"]
+        route_samples = []
+        for _ in range(rotations):
+            start = time.perf_counter()
+            response = await client.post("/api/auth/refresh", params={"refresh_token": token})
+            route_samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            token = response.json()["refresh_token"]
+        print(f"  POST /auth/refresh:   {format_latency(percentiles(route_samples))}")
+
+    print(f"  revocation check with {revoked} revoked sessions: {revocation_lookups(revoked, 1_000_000):.0f} ns")
+
+    start = time.perf_counter()
+    removed = await refresh_store.compact()
+    print(f"  compacted {removed} expired sessions in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200000, help="sessions seeded before measuring")
+    parser.add_argument("--rotations", type=int, default=500)
+    parser.add_argument("--revoked", type=int, default=1000000, help="entries in the revocation index")
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.rotations, args.revoked))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Sample PDF Corpus
+
+Generates text-only job posting PDFs of various page counts without any
+PDF authoring dependency.
+"""
+import os
+
+LINES = [
+    "Backend Engineer (Python / FastAPI)",
+    "We are looking for an engineer to design and operate our API platform.",
+    "Requirements: 3+ years of Python, SQL databases, REST API design.",
+    "Preferred: AWS, Docker, asynchronous programming, LLM integration.",
+    "Responsibilities: build services, review code, improve performance.",
+    "Benefits: flexible hours, remote work, education budget, stock options.",
+]
+
+CORPUS = {
+    "posting_1p.pdf": 1,
+    "posting_5p.pdf": 5,
+    "posting_20p.pdf": 20,
+    "posting_50p.pdf": 50,
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """
+    Build a minimal PDF with Helvetica text on each page
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for page in range(pages):
+        rows = ["BT /F1 10 Tf 50 780 Td 14 TL"]
+        for i in range(lines_per_page):
+            line = f"{page + 1}-{i + 1}. {LINES[(page + i) % len(LINES)]}"
+            rows.append(f"({_escape(line)}) Tj T*")
+        rows.append("ET")
+        stream = "\n".join(rows).encode()
+
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_corpus(directory: str) -> list:
+    """
+    Write the sample corpus to directory and return the file paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, pages in CORPUS.items():
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(build_pdf(pages))
+        paths.append(path)
+    return paths
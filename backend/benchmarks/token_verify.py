@@ -0,0 +1,80 @@
+"""
+Access Token Verification Benchmark
+
+Reports tokens verified per second by python-jose's jwt.decode, the path
+every request took before, and by the app's TokenCodec for HS256 and the
+asymmetric algorithms workers can verify with only a public key.
+
+    python -m benchmarks.token_verify [--iterations 20000]
+"""
+import argparse
+import time
+from .common import configure_environment
+
+configure_environment()
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa  # noqa: E402
+from jose import jwt  # noqa: E402
+from app.core.security import AsymmetricSigner, HMACSigner, TokenCodec  # noqa: E402
+
+SECRET = "benchmark-secret-key"
+CLAIMS = {"sub": "42", "name": "김지원", "ver": 3, "type": "access"}
+
+
+def rate(verify, token: str, iterations: int) -> float:
+    assert verify(token), "token did not verify"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verify(token)
+    return iterations / (time.perf_counter() - start)
+
+
+def pem_pair(private_key) -> tuple:
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem, public_pem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {**CLAIMS, "exp": int(time.time()) + 3600}
+    rsa_private, rsa_public = pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    ed_private, ed_public = pem_pair(ed25519.Ed25519PrivateKey.generate())
+
+    hs256 = TokenCodec("HS256", HMACSigner("HS256", SECRET))
+    rs256 = TokenCodec("RS256", AsymmetricSigner("RS256", rsa_private, None))
+    eddsa = TokenCodec("EdDSA", AsymmetricSigner("EdDSA", ed_private, None))
+    # Edge workers hold only the public key
+    rs256_public = TokenCodec("RS256", AsymmetricSigner("RS256", None, rsa_public))
+    eddsa_public = TokenCodec("EdDSA", AsymmetricSigner("EdDSA", None, ed_public))
+
+    jose_hs256 = jwt.encode(claims, SECRET, algorithm="HS256")
+    jose_rs256 = jwt.encode(claims, rsa_private.decode(), algorithm="RS256")
+    cases = [
+        ("python-jose HS256", lambda t: jwt.decode(t, SECRET, algorithms=["HS256"]), jose_hs256),
+        ("TokenCodec HS256", lambda t: hs256.decode(t, "access"), hs256.encode(claims)),
+        ("TokenCodec HS256 (jose-issued token)", lambda t: hs256.decode(t, "access"), jose_hs256),
+        ("python-jose RS256", lambda t: jwt.decode(t, rsa_public.decode(), algorithms=["RS256"]), jose_rs256),
+        ("TokenCodec RS256 (public key only)", lambda t: rs256_public.decode(t, "access"), rs256.encode(claims)),
+        ("TokenCodec EdDSA (public key only)", lambda t: eddsa_public.decode(t, "access"), eddsa.encode(claims)),
+    ]
+
+    print(f"Verifying {args.iterations} tokens per case")
+    baseline = None
+    for name, verify, token in cases:
+        per_second = rate(verify, token, args.iterations)
+        if name == "python-jose HS256":
+            baseline = per_second
+        print(f"  {name:<38} {per_second:>10,.0f} tokens/s  {1e6 / per_second:>7.1f} us  x{per_second / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,20 @@
 """
 Database Initialization Script
 """
+import asyncio
 from app.core.database import Base, engine
-from app.models import User, JobPosting, CoverLetter, InterviewSession, InterviewTurn
+from app.models import User, JobPosting, CoverLetter, InterviewSession, InterviewTurn, Job, AnalysisCacheEntry, RateLimitBucket, RefreshSession, AnswerUpload
 
 
-def init_db():
+async def init_db():
     """
     Initialize database tables
     """
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     print("✅ Database tables created successfully!")
 
 
 if __name__ == "__main__":
-    init_db()
-
+    asyncio.run(init_db())
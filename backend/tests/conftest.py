@@ -0,0 +1,11 @@
+"""
+Test Configuration
+
+Settings are read when app/ is first imported, so point the app at
+throwaway local resources before any test module imports it.
+"""
+import os
+from benchmarks.common import configure_environment
+
+configure_environment()
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
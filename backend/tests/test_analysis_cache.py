@@ -0,0 +1,89 @@
+"""
+Job posting analysis cache tiers: exported stats and expired row purging
+"""
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.models import AnalysisCacheEntry
+from app.services.analysis_cache import AnalysisCache, DatabaseAnalysisBackend, MemoryAnalysisBackend
+from app.services.cache import CACHE_HITS, CACHE_MISSES
+from app.services.openai_service import OpenAIService
+
+
+@pytest_asyncio.fixture
+async def tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        await db.execute(delete(AnalysisCacheEntry))
+        await db.commit()
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+def analyze(monkeypatch):
+    """Fake LLM analysis; returns the texts it was asked to analyze"""
+    analyzed = []
+
+    async def analyze_job_posting(text):
+        analyzed.append(text)
+        return {"keywords": [text], "requirements": []}
+
+    monkeypatch.setattr(OpenAIService, "analyze_job_posting", staticmethod(analyze_job_posting))
+    return analyzed
+
+
+async def store(key: str, expires_at: datetime):
+    async with SessionLocal() as db:
+        db.add(AnalysisCacheEntry(cache_key=key, prompt_version="test", result={}, expires_at=expires_at))
+        await db.commit()
+
+
+async def load(key: str) -> AnalysisCacheEntry:
+    async with SessionLocal() as db:
+        return await db.get(AnalysisCacheEntry, key)
+
+
+@pytest.mark.asyncio
+async def test_hits_are_exported_per_tier(tables, analyze):
+    misses = CACHE_MISSES._values.get(("analysis",), 0)
+    memory_hits = CACHE_HITS._values.get(("analysis", "memory"), 0)
+    database_hits = CACHE_HITS._values.get(("analysis", "database"), 0)
+
+    await AnalysisCache([MemoryAnalysisBackend(), DatabaseAnalysisBackend()]).get_or_analyze("Backend engineer")
+    # Another worker: its memory tier is empty but the database tier is shared
+    other_worker = AnalysisCache([MemoryAnalysisBackend(), DatabaseAnalysisBackend()])
+    await other_worker.get_or_analyze("Backend engineer")
+    await other_worker.get_or_analyze("Backend engineer")
+
+    assert analyze == ["Backend engineer"]
+    assert CACHE_MISSES._values[("analysis",)] == misses + 1
+    assert CACHE_HITS._values[("analysis", "database")] == database_hits + 1
+    assert CACHE_HITS._values[("analysis", "memory")] == memory_hits + 1
+
+
+@pytest.mark.asyncio
+async def test_database_miss_purges_expired_rows(tables, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_CACHE_PURGE_BATCH_SIZE", 2)
+    now = datetime.utcnow()
+    for i in range(3):
+        await store(f"expired-{i}", now - timedelta(minutes=3 - i))
+    await store("live", now + timedelta(hours=1))
+
+    backend = DatabaseAnalysisBackend()
+    assert await backend.get("expired-2") is None
+    # Oldest first, one batch per miss
+    assert await load("expired-0") is None
+    assert await load("expired-1") is None
+    assert await load("expired-2") is not None
+
+    assert await backend.get("live") == {}
+    assert await load("expired-2") is not None
+
+    assert await backend.get("unknown") is None
+    assert await load("expired-2") is None
+    assert await load("live") is not None
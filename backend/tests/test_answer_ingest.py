@@ -0,0 +1,45 @@
+"""
+Stored answer recordings replaced by their normalized copy
+"""
+import io
+from contextlib import asynccontextmanager
+import pytest
+from app.services import answer_ingest
+from app.services.answer_ingest import discard_replaced_recording, transcribe_stored_answer
+from app.services.audio_normalize import NormalizedAudio
+from app.services.openai_service import OpenAIService
+from app.services.storage_service import storage_service
+
+
+@pytest.fixture
+def normalize(monkeypatch):
+    """Normalize every recording to a fixed Opus payload without ffmpeg"""
+    @asynccontextmanager
+    async def normalized_audio(fileobj, filename, content_type):
+        yield NormalizedAudio(
+            file=io.BytesIO(b"opus"), filename="answer.ogg", content_type="audio/ogg",
+            original_bytes=8, normalized_bytes=4, duration_ms=1.0
+        )
+
+    async def transcribe_audio(audio_file):
+        return "I built the backend."
+
+    monkeypatch.setattr(answer_ingest, "normalized_audio", normalized_audio)
+    monkeypatch.setattr(OpenAIService, "transcribe_audio", staticmethod(transcribe_audio))
+
+
+@pytest.mark.asyncio
+async def test_original_kept_until_answer_committed(normalize):
+    await storage_service.upload_file(b"wavwavwa", "answers/test/turn1.wav", "audio/wav")
+
+    result = await transcribe_stored_answer("answers/test/turn1.wav", "turn1.wav", "audio/wav")
+    assert result.answer_audio_url.endswith("answers/test/turn1.ogg")
+    assert result.replaced_key == "answers/test/turn1.wav"
+
+    # A failed commit can retry from the original
+    assert await storage_service.exists("answers/test/turn1.wav")
+    retried = await transcribe_stored_answer("answers/test/turn1.wav", "turn1.wav", "audio/wav")
+
+    await discard_replaced_recording(retried)
+    assert not await storage_service.exists("answers/test/turn1.wav")
+    assert await storage_service.exists("answers/test/turn1.ogg")
@@ -0,0 +1,73 @@
+"""
+Cover letter edits under concurrent writes
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.database import Base, engine
+from app.main import app
+from app.models import CoverLetter
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        credentials = {"email": "letters@example.com", "password": "test-password"}
+        await client.post("/api/auth/register", json=credentials)
+        login = (await client.post("/api/auth/login", params=credentials)).json()
+        client.headers["Authorization"] = f"Bearer {login['access_token']}"
+        yield client
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def concurrent_write():
+    """Bump the letter's version just before the request's UPDATE, as another writer would"""
+    def bump(session, flush_context, instances):
+        for instance in session.dirty:
+            if isinstance(instance, CoverLetter):
+                session.connection().execute(
+                    text("UPDATE cover_letters SET version = version + 1 WHERE id = :id"), {"id": instance.id}
+                )
+
+    event.listen(Session, "before_flush", bump)
+    yield
+    event.remove(Session, "before_flush", bump)
+
+
+@pytest.mark.asyncio
+async def test_update(client):
+    letter = (await client.post("/api/cover-letters", json={"content": "first draft"})).json()
+
+    response = await client.patch(f"/api/cover-letters/{letter['id']}", json={"content": "second draft"})
+    assert response.status_code == 200
+    assert response.json()["content"] == "second draft"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_update_conflicts(client, concurrent_write):
+    letter = (await client.post("/api/cover-letters", json={"content": "first draft"})).json()
+
+    response = await client.patch(f"/api/cover-letters/{letter['id']}", json={"content": "second draft"})
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_update_missing_letter(client):
+    response = await client.patch("/api/cover-letters/999999", json={"content": "second draft"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_create_returns_created(client):
+    response = await client.post("/api/cover-letters/stream", json={"content": "first draft"})
+    assert response.status_code == 201
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: created" in response.text
@@ -0,0 +1,132 @@
+"""
+Job completion by the worker that holds the claim
+"""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.models import Job
+from app.services.job_queue import HANDLERS, JobWorker, enqueue, job_handler, wake_workers
+
+KIND = "test_job"
+
+
+@pytest_asyncio.fixture
+async def job_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        # Leave no other due jobs for the worker to claim first
+        await db.execute(update(Job).where(Job.status.in_(["queued", "running"])).values(status="succeeded"))
+        job = enqueue(db, KIND, {"n": 1}, max_attempts=2)
+        await db.commit()
+
+    yield job.id
+    await engine.dispose()
+
+
+async def load(job_id: int) -> Job:
+    async with SessionLocal() as db:
+        return await db.get(Job, job_id)
+
+
+async def reclaim(job_id: int, worker_id: str):
+    """Take over a job as a worker would once its lock went stale"""
+    async with SessionLocal() as db:
+        await db.execute(
+            update(Job).where(Job.id == job_id).values(
+                attempts=Job.attempts + 1, locked_by=worker_id, locked_at=datetime.utcnow()
+            )
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_finish_records_outcome(job_id):
+    worker = JobWorker()
+    [claimed] = await worker._claim()
+    assert claimed["id"] == job_id
+
+    assert await worker._finish(job_id, None, claimed["attempts"], claimed["max_attempts"]) is False
+    job = await load(job_id)
+    assert job.status == "succeeded"
+    assert job.locked_by is None
+
+
+@pytest.mark.asyncio
+async def test_finish_after_reclaim_by_another_worker_is_discarded(job_id):
+    worker = JobWorker()
+    [claimed] = await worker._claim()
+    await reclaim(job_id, "other-host:1")
+
+    failed = await worker._finish(job_id, Exception("boom"), claimed["attempts"], claimed["max_attempts"])
+    assert failed is False
+
+    job = await load(job_id)
+    assert job.status == "running"
+    assert job.locked_by == "other-host:1"
+    assert job.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_finish_after_reclaim_by_same_worker_is_discarded(job_id):
+    worker = JobWorker()
+    [claimed] = await worker._claim()
+    await reclaim(job_id, worker.worker_id)
+
+    assert await worker._finish(job_id, None, claimed["attempts"], claimed["max_attempts"]) is False
+    assert (await load(job_id)).status == "running"
+
+
+@pytest.mark.asyncio
+async def test_stale_lock_is_reclaimed_and_finished_by_new_owner(job_id):
+    first, second = JobWorker(), JobWorker()
+    second.worker_id = "other-host:1"
+    [claimed] = await first._claim()
+
+    async with SessionLocal() as db:
+        stale = datetime.utcnow() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT + 1)
+        await db.execute(update(Job).where(Job.id == job_id).values(locked_at=stale))
+        await db.commit()
+    [reclaimed] = await second._claim()
+
+    assert await first._finish(job_id, None, claimed["attempts"], claimed["max_attempts"]) is False
+    assert await second._finish(job_id, Exception("boom"), reclaimed["attempts"], reclaimed["max_attempts"]) is True
+    job = await load(job_id)
+    assert job.status == "failed"
+    assert job.locked_by is None
+
+
+@pytest.mark.asyncio
+async def test_runner_survives_failing_on_failure(job_id):
+    handled = []
+
+    async def on_failure(payload, db, error):
+        raise Exception("could not record the failure")
+
+    @job_handler(KIND, on_failure=on_failure)
+    async def handler(payload, db):
+        handled.append(payload["n"])
+        if payload["n"] == 1:
+            raise Exception("boom")
+
+    worker = JobWorker(concurrency=1, poll_interval=0.05)
+    await worker.start()
+    try:
+        async with SessionLocal() as db:
+            await db.execute(update(Job).where(Job.id == job_id).values(max_attempts=1))
+            enqueue(db, KIND, {"n": 2})
+            await db.commit()
+        wake_workers()
+
+        for _ in range(100):
+            if handled == [1, 2]:
+                break
+            await asyncio.sleep(0.05)
+        assert handled == [1, 2]
+    finally:
+        await worker.stop()
+        HANDLERS.pop(KIND, None)
@@ -0,0 +1,22 @@
+"""
+PDF extraction process pool resets
+"""
+import pytest
+from app.services import pdf_service
+from benchmarks.sample_pdfs import build_pdf
+
+
+@pytest.mark.asyncio
+async def test_stale_reset_keeps_replacement_pool():
+    old = pdf_service._get_executor()
+    pdf_service._reset_executor(old)
+    replacement = pdf_service._get_executor()
+    assert replacement is not old
+
+    # A second extraction that was in flight on the old pool fails late
+    pdf_service._reset_executor(old)
+    assert pdf_service._get_executor() is replacement
+
+    text = await pdf_service.extract_pdf_text(build_pdf(1), engine="pypdf2")
+    assert text.strip()
+    pdf_service.shutdown()
@@ -0,0 +1,25 @@
+"""
+SQL statement budgets of the interview endpoints, from benchmarks.query_count
+"""
+import asyncio
+import pytest
+from app.core.database import engine
+from benchmarks.query_count import STATEMENT_BUDGET, check, play_interview
+
+
+@pytest.fixture(scope="module")
+def statement_counts():
+    async def play():
+        try:
+            return await play_interview()
+        finally:
+            # Connections belong to this loop; don't hand them to later tests
+            await engine.dispose()
+
+    return asyncio.run(play())
+
+
+@pytest.mark.parametrize("name", STATEMENT_BUDGET)
+def test_statement_budget(statement_counts, name):
+    assert name in statement_counts
+    assert check(name, statement_counts[name]) == [], statement_counts[name]
@@ -0,0 +1,126 @@
+"""
+Question audio renders: live renders, failure eviction and the durable render job
+"""
+import asyncio
+import pytest
+import pytest_asyncio
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.models import InterviewSession, InterviewTurn
+from app.services import question_audio
+from app.services.openai_service import OpenAIService
+
+
+@pytest_asyncio.fixture
+async def turn():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        session = InterviewSession(user_id=1, cover_letter_id=1, status="in_progress")
+        db.add(session)
+        await db.flush()
+        turn = InterviewTurn(
+            session_id=session.id, turn_number=1,
+            question_text="Tell me about a system you designed. What would you change today?"
+        )
+        db.add(turn)
+        await db.commit()
+
+    yield turn
+    await engine.dispose()
+
+
+@pytest.fixture
+def tts(monkeypatch):
+    """Fake TTS; set tts.fail to make every call raise"""
+    class FakeTTS:
+        fail = False
+        calls = 0
+
+    async def generate_tts(text):
+        FakeTTS.calls += 1
+        if FakeTTS.fail:
+            raise Exception("TTS unavailable")
+        return text.encode()
+
+    monkeypatch.setattr(OpenAIService, "generate_tts", staticmethod(generate_tts))
+    monkeypatch.setattr(settings, "TTS_CACHE_MAX_BYTES", 0)
+    monkeypatch.setattr(question_audio.tts_cache, "disk", None)
+    return FakeTTS
+
+
+def payload(turn: InterviewTurn) -> dict:
+    return {"session_id": turn.session_id, "turn_number": turn.turn_number}
+
+
+async def load(turn: InterviewTurn) -> InterviewTurn:
+    async with SessionLocal() as db:
+        return await db.get(InterviewTurn, turn.id)
+
+
+@pytest.mark.asyncio
+async def test_live_render_stores_audio(turn, tts):
+    render = question_audio.start_render(turn.id, turn.question_text)
+    assert await render.wait()
+
+    assert question_audio.get_render(turn.id) is None
+    assert (await load(turn)).question_audio_url == render.url
+
+
+@pytest.mark.asyncio
+async def test_failed_render_is_evicted_after_ttl(turn, tts, monkeypatch):
+    monkeypatch.setattr(settings, "QUESTION_AUDIO_FAILED_TTL", 0.05)
+    tts.fail = True
+
+    render = question_audio.start_render(turn.id, turn.question_text)
+    assert not await render.wait()
+    assert question_audio.get_render(turn.id) is render
+
+    await asyncio.sleep(0.1)
+    assert question_audio.get_render(turn.id) is None
+
+
+@pytest.mark.asyncio
+async def test_job_renders_audio_lost_by_the_live_render(turn, tts):
+    async with SessionLocal() as db:
+        await question_audio.render_question_audio(payload(turn), db)
+
+    stored = await load(turn)
+    assert stored.question_audio_url
+    assert stored.question_audio_status is None
+
+
+@pytest.mark.asyncio
+async def test_job_retries_after_live_render_failed(turn, tts):
+    tts.fail = True
+    render = question_audio.start_render(turn.id, turn.question_text)
+    assert not await render.wait()
+
+    tts.fail = False
+    async with SessionLocal() as db:
+        await question_audio.render_question_audio(payload(turn), db)
+    assert (await load(turn)).question_audio_url
+
+
+@pytest.mark.asyncio
+async def test_job_skips_stored_audio(turn, tts):
+    render = question_audio.start_render(turn.id, turn.question_text)
+    assert await render.wait()
+    calls = tts.calls
+
+    async with SessionLocal() as db:
+        await question_audio.render_question_audio(payload(turn), db)
+    assert tts.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_job_failure_is_recorded(turn, tts):
+    tts.fail = True
+    async with SessionLocal() as db:
+        with pytest.raises(Exception):
+            await question_audio.render_question_audio(payload(turn), db)
+        await db.rollback()
+        await question_audio.mark_question_audio_failed(payload(turn), db, Exception("TTS unavailable"))
+
+    assert (await load(turn)).question_audio_status == "failed"
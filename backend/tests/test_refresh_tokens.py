@@ -0,0 +1,197 @@
+"""
+Refresh token rotation, reuse detection and session revocation
+"""
+import time
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import decode_token
+from app.main import app
+from app.models import RefreshSession
+from app.services.refresh_tokens import RefreshTokenError, RefreshTokenStore, RevocationIndex, refresh_store
+
+
+@pytest_asyncio.fixture
+async def tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    # Connections belong to this test's loop
+    await engine.dispose()
+
+
+@pytest.fixture
+def store():
+    return RefreshTokenStore()
+
+
+async def issue(store: RefreshTokenStore, user_id: int = 1) -> dict:
+    async with SessionLocal() as db:
+        _, token = await store.issue(db, user_id)
+    return decode_token(token, token_type="refresh")
+
+
+async def rotate(store: RefreshTokenStore, payload: dict) -> dict:
+    # A fresh database session per call, as each request gets
+    async with SessionLocal() as db:
+        token = await store.rotate(db, payload)
+    return decode_token(token, token_type="refresh")
+
+
+async def load(session_id: str) -> RefreshSession:
+    async with SessionLocal() as db:
+        return await db.get(RefreshSession, session_id)
+
+
+@pytest.mark.asyncio
+async def test_rotation_is_single_use(tables, store):
+    first = await issue(store)
+    second = await rotate(store, first)
+
+    assert second["sid"] == first["sid"]
+    assert second["jti"] != first["jti"]
+    assert (await load(first["sid"])).current_jti == second["jti"]
+
+    third = await rotate(store, second)
+    assert third["jti"] not in (first["jti"], second["jti"])
+
+
+@pytest.mark.asyncio
+async def test_reuse_within_grace_keeps_session(tables, store, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_REUSE_GRACE_SECONDS", 60)
+    first = await issue(store)
+    second = await rotate(store, first)
+
+    # A client retrying a refresh whose response it lost
+    with pytest.raises(RefreshTokenError):
+        await rotate(store, first)
+
+    assert first["sid"] not in store.revoked
+    assert (await load(first["sid"])).revoked_at is None
+    await rotate(store, second)
+
+
+@pytest.mark.asyncio
+async def test_reuse_after_grace_revokes_session(tables, store, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_REUSE_GRACE_SECONDS", 0)
+    first = await issue(store)
+    second = await rotate(store, first)
+
+    with pytest.raises(RefreshTokenError):
+        await rotate(store, first)
+
+    assert first["sid"] in store.revoked
+    assert (await load(first["sid"])).revoked_at is not None
+    # The legitimate holder's token dies with the session
+    with pytest.raises(RefreshTokenError):
+        await rotate(store, second)
+
+
+@pytest.mark.asyncio
+async def test_older_token_reuse_revokes_inside_grace(tables, store, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_REUSE_GRACE_SECONDS", 60)
+    first = await issue(store)
+    second = await rotate(store, first)
+    await rotate(store, second)
+
+    # Only the token replaced by the last rotation is forgiven
+    with pytest.raises(RefreshTokenError):
+        await rotate(store, first)
+    assert first["sid"] in store.revoked
+
+
+@pytest.mark.asyncio
+async def test_expired_session_rejected(tables, store):
+    payload = await issue(store)
+    async with SessionLocal() as db:
+        await db.execute(
+            update(RefreshSession).where(RefreshSession.id == payload["sid"]).values(expires_at=time.time() - 1)
+        )
+        await db.commit()
+
+    with pytest.raises(RefreshTokenError):
+        await rotate(store, payload)
+    assert payload["sid"] not in store.revoked
+
+
+@pytest.mark.asyncio
+async def test_sync_picks_up_other_workers_revocations(tables, store):
+    payload = await issue(store)
+    async with SessionLocal() as db:
+        await store.revoke(db, payload["sid"])
+
+    other_worker = RefreshTokenStore()
+    assert payload["sid"] not in other_worker.revoked
+    await other_worker.sync()
+    assert payload["sid"] in other_worker.revoked
+
+    with pytest.raises(RefreshTokenError):
+        await rotate(other_worker, payload)
+
+
+@pytest.mark.asyncio
+async def test_compact_deletes_expired_sessions_in_batches(tables, store, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_COMPACTION_BATCH_SIZE", 2)
+    await store.compact()
+
+    expired = [await issue(store) for _ in range(5)]
+    live = await issue(store)
+    async with SessionLocal() as db:
+        await db.execute(
+            update(RefreshSession).where(
+                RefreshSession.id.in_([p["sid"] for p in expired])
+            ).values(expires_at=time.time() - 1)
+        )
+        await db.commit()
+
+    assert await store.compact() == 5
+    assert await load(expired[0]["sid"]) is None
+    assert await load(live["sid"]) is not None
+
+
+def test_revocation_index_expiry():
+    index = RevocationIndex()
+    now = time.time()
+    index.add("live", now + 60)
+    index.add("lapsed", now - 1)
+
+    assert "live" in index
+    assert "lapsed" not in index
+    assert "unknown" not in index
+
+
+def test_revocation_index_compaction():
+    index = RevocationIndex()
+    index.add("a", 100)
+    index.add("b", 200)
+    index.add("a", 300)  # extended; the first heap entry is now stale
+    index.add("b", 150)  # earlier deadlines never shorten an entry
+
+    assert index.compact(now=250) == 1
+    assert len(index) == 1
+    assert index.compact(now=250) == 0
+    assert index.compact(now=300) == 1
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_and_refresh_tokens(tables):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        credentials = {"email": "logout@example.com", "password": "test-password"}
+        await client.post("/api/auth/register", json=credentials)
+        tokens = (await client.post("/api/auth/login", params=credentials)).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        assert (await client.get("/api/users/me", headers=headers)).status_code == 200
+
+        response = await client.post("/api/auth/logout", params={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 204
+        assert decode_token(tokens["access_token"])["sid"] in refresh_store.revoked
+
+        assert (await client.get("/api/users/me", headers=headers)).status_code == 401
+        response = await client.post("/api/auth/refresh", params={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 401
@@ -0,0 +1,188 @@
+"""
+Access and refresh token encoding and verification
+"""
+import base64
+import json
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from app.core.security import (
+    AsymmetricSigner,
+    HMACSigner,
+    TokenCodec,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+)
+
+SECRET = "test-secret"
+
+
+def segment(value) -> str:
+    raw = value if isinstance(value, bytes) else json.dumps(value).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def forge(header: dict, claims: dict, signer=None) -> str:
+    """
+    Build a token by hand, signed with signer or left unsigned
+    """
+    signing_input = f"{segment(header)}.{segment(claims)}"
+    signature = signer.sign(signing_input.encode("ascii")) if signer else b""
+    return f"{signing_input}.{segment(signature)}"
+
+
+def claims(**extra) -> dict:
+    return {"sub": "1", "exp": int(time.time()) + 60, **extra}
+
+
+@pytest.fixture
+def codec():
+    return TokenCodec("HS256", HMACSigner("HS256", SECRET))
+
+
+def test_round_trip(codec):
+    token = codec.encode(claims(type="access"))
+    assert codec.decode(token, "access")["sub"] == "1"
+
+
+def test_tampered_signature_rejected(codec):
+    token = codec.encode(claims())
+    signing_input, signature = token.rsplit(".", 1)
+    flipped = bytearray(base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4)))
+    flipped[0] ^= 1
+    assert codec.decode(f"{signing_input}.{segment(bytes(flipped))}") is None
+
+
+def test_tampered_payload_rejected(codec):
+    header, _, signature = codec.encode(claims()).split(".")
+    assert codec.decode(f"{header}.{segment(claims(sub='2'))}.{signature}") is None
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "a.b", "a.b.c.d", "!!.!!.!!"])
+def test_malformed_rejected(codec, token):
+    assert codec.decode(token) is None
+
+
+def test_alg_none_rejected(codec):
+    assert codec.decode(forge({"alg": "none", "typ": "JWT"}, claims())) is None
+
+
+def test_algorithm_mismatch_rejected(codec):
+    # Same secret, different algorithm in the header
+    token = forge({"alg": "HS512", "typ": "JWT"}, claims(), HMACSigner("HS512", SECRET))
+    assert codec.decode(token) is None
+
+
+def test_equivalent_header_accepted(codec):
+    # Not byte-identical to the codec's own header, but the same algorithm
+    token = forge({"typ": "JWT", "alg": "HS256"}, claims(), HMACSigner("HS256", SECRET))
+    assert codec.decode(token)["sub"] == "1"
+
+
+def test_wrong_secret_rejected(codec):
+    other = TokenCodec("HS256", HMACSigner("HS256", "other-secret"))
+    assert codec.decode(other.encode(claims())) is None
+
+
+def test_expired_rejected(codec):
+    assert codec.decode(codec.encode(claims(exp=int(time.time()) - 5))) is None
+
+
+def test_expired_within_leeway_accepted():
+    codec = TokenCodec("HS256", HMACSigner("HS256", SECRET), leeway=30)
+    assert codec.decode(codec.encode(claims(exp=int(time.time()) - 5))) is not None
+
+
+@pytest.mark.parametrize("exp", [None, "tomorrow"])
+def test_missing_or_invalid_exp_rejected(codec, exp):
+    token_claims = claims(exp=exp)
+    if exp is None:
+        del token_claims["exp"]
+    assert codec.decode(codec.encode(token_claims)) is None
+
+
+def test_not_yet_valid_rejected(codec):
+    assert codec.decode(codec.encode(claims(nbf=int(time.time()) + 60))) is None
+
+
+def test_past_nbf_accepted(codec):
+    assert codec.decode(codec.encode(claims(nbf=int(time.time()) - 60))) is not None
+
+
+def test_wrong_issuer_rejected():
+    ours = TokenCodec("HS256", HMACSigner("HS256", SECRET), issuer="https://api.example.com")
+    theirs = TokenCodec("HS256", HMACSigner("HS256", SECRET), issuer="https://other.example.com")
+    unset = TokenCodec("HS256", HMACSigner("HS256", SECRET))
+
+    assert ours.decode(ours.encode(claims()))["iss"] == "https://api.example.com"
+    assert ours.decode(theirs.encode(claims())) is None
+    assert ours.decode(unset.encode(claims())) is None
+
+
+def test_token_type_enforced(codec):
+    token = codec.encode(claims(type="refresh"))
+    assert codec.decode(token, "access") is None
+    assert codec.decode(token, "refresh") is not None
+
+
+def test_refresh_token_is_not_an_access_token():
+    refresh = create_refresh_token({"sub": "1", "sid": "s"})
+    access = create_access_token({"sub": "1", "sid": "s"})
+
+    assert decode_token(refresh, token_type="access") is None
+    assert decode_token(access, token_type="refresh") is None
+    assert decode_token(access, token_type="access")["sub"] == "1"
+
+
+def _rsa_keys():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return _pem(key)
+
+
+def _ed25519_keys():
+    return _pem(ed25519.Ed25519PrivateKey.generate())
+
+
+def _pem(key):
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem, public_pem
+
+
+@pytest.mark.parametrize("algorithm, keys", [("RS256", _rsa_keys), ("EdDSA", _ed25519_keys)])
+def test_asymmetric_round_trip_and_verify_only(algorithm, keys):
+    private_pem, public_pem = keys()
+    issuer = TokenCodec(algorithm, AsymmetricSigner(algorithm, private_pem, None))
+    verifier = TokenCodec(algorithm, AsymmetricSigner(algorithm, None, public_pem))
+
+    token = issuer.encode(claims())
+    assert verifier.decode(token)["sub"] == "1"
+
+    # A process holding only the public key cannot issue tokens
+    with pytest.raises(Exception):
+        verifier.encode(claims())
+
+    # Tokens signed by another key pair are rejected
+    other = TokenCodec(algorithm, AsymmetricSigner(algorithm, keys()[0], None))
+    assert verifier.decode(other.encode(claims())) is None
+
+    header, _, signature = token.split(".")
+    assert verifier.decode(f"{header}.{segment(claims(sub='2'))}.{signature}") is None
+
+
+def test_asymmetric_rejects_hmac_with_public_key_as_secret():
+    private_pem, public_pem = _rsa_keys()
+    verifier = TokenCodec("RS256", AsymmetricSigner("RS256", private_pem, None))
+    token = forge({"alg": "HS256", "typ": "JWT"}, claims(), HMACSigner("HS256", public_pem.decode()))
+    assert verifier.decode(token) is None
+
+
+def test_asymmetric_signer_needs_a_key():
+    with pytest.raises(Exception):
+        AsymmetricSigner("RS256", None, None)
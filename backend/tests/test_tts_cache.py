@@ -0,0 +1,62 @@
+"""
+Question audio URL lookups
+"""
+import pytest
+from app.core.config import settings
+from app.services.cache import CACHE_HITS, CACHE_MISSES
+from app.services import tts_cache as tts_cache_module
+from app.services.tts_cache import TTSCache
+
+
+@pytest.fixture
+def heads(monkeypatch):
+    """Storage HEAD requests made, by file key"""
+    made = []
+
+    async def exists(file_key):
+        made.append(file_key)
+        return False
+
+    monkeypatch.setattr(tts_cache_module.storage_service, "exists", exists)
+    monkeypatch.setattr(settings, "TTS_CACHE_MAX_BYTES", 0)
+    return made
+
+
+@pytest.mark.asyncio
+async def test_miss_is_remembered(heads):
+    cache = TTSCache()
+    assert await cache.lookup_url("What did you build last?") is None
+    assert await cache.lookup_url("What did you build last?") is None
+    assert len(heads) == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_expires(heads, monkeypatch):
+    monkeypatch.setattr(settings, "TTS_URL_MISS_TTL", 0)
+    cache = TTSCache()
+    await cache.lookup_url("What did you build last?")
+    await cache.lookup_url("What did you build last?")
+    assert len(heads) == 2
+
+
+@pytest.mark.asyncio
+async def test_store_replaces_remembered_miss(heads):
+    cache = TTSCache()
+    await cache.lookup_url("What did you build last?")
+
+    url = await cache.store("What did you build last?", b"audio")
+    assert await cache.lookup_url("What did you build last?") == url
+    assert len(heads) == 1
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_exported(heads):
+    misses = CACHE_MISSES._values.get(("tts_url",), 0)
+    hits = CACHE_HITS._values.get(("tts_url", "memory"), 0)
+    cache = TTSCache()
+    await cache.lookup_url("What did you build last?")
+    await cache.store("What did you build last?", b"audio")
+    await cache.lookup_url("What did you build last?")
+
+    assert CACHE_MISSES._values[("tts_url",)] == misses + 1
+    assert CACHE_HITS._values[("tts_url", "memory")] == hits + 1
@@ -0,0 +1,26 @@
+"""
+Background Job Worker
+
+Runs queued jobs in a separate process. Set JOB_WORKER_IN_PROCESS=False on
+the API servers when using this.
+"""
+import asyncio
+import logging
+from app.services.job_queue import JobWorker
+from app.services import interview_feedback, answer_uploads, question_audio  # noqa: F401  registers job handlers
+
+
+def main():
+    """
+    Run the job worker until interrupted
+    """
+    logging.basicConfig(level=logging.INFO)
+    print("Starting background job worker...")
+    try:
+        asyncio.run(JobWorker().run_forever())
+    except KeyboardInterrupt:
+        print("✅ Job worker stopped")
+
+
+if __name__ == "__main__":
+    main()